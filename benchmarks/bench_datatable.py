@@ -0,0 +1,114 @@
+"""
+DataTable → DataFrame 변환 벤치마크
+- decrypted_data.csv (DT6, 60행 × 96열)로 .NET DataTable을 만들어
+  셀 단위 변환(기존)과 테이블 단위 일괄 변환을 비교합니다.
+- 문자열이 아닌 컬럼(DateTime, Boolean)도 추가하여 두 방식의 결과가 같은지 확인합니다.
+- pythonnet(.NET 런타임)이 필요합니다. 로젠 DLL은 필요하지 않습니다.
+
+사용법:
+    python benchmarks/bench_datatable.py [--repeat 20] [--scale 1]
+"""
+
+import argparse
+import csv
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from logen_dataset import datatable_to_rows_bulk, datatable_to_rows_legacy  # noqa: E402
+
+
+def load_fixture(path: Path):
+    """decrypted_data.csv를 (컬럼, 행) 으로 읽습니다."""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        columns = next(reader)
+        rows = [row for row in reader if row]
+    return columns, rows
+
+
+def build_datatable(columns, rows, scale: int = 1):
+    """DT6 형태의 System.Data.DataTable을 생성합니다. (문자열이 아닌 확인용 컬럼 포함)"""
+    import clr  # noqa: F401
+    clr.AddReference('System.Data')
+    from System import Boolean, DateTime, String
+    from System.Data import DataTable
+
+    table = DataTable('DT6')
+    for name in columns:
+        table.Columns.Add(name, String)
+    # WriteXml이 문자열과 다르게 직렬화하는 형식
+    table.Columns.Add('CHECK_DT', DateTime)
+    table.Columns.Add('CHECK_YN', Boolean)
+
+    n = 0
+    for _ in range(scale):
+        for row in rows:
+            new_row = table.NewRow()
+            for name, value in zip(columns, row):
+                if value != '':
+                    new_row[name] = value
+            if n % 3:
+                # 셋 중 하나는 빈 값(DBNull)
+                new_row['CHECK_DT'] = DateTime(2024, 1, 2).AddMinutes(n)
+                new_row['CHECK_YN'] = n % 2 == 0
+            table.Rows.Add(new_row)
+            n += 1
+    return table
+
+
+def timeit(func, table, repeat: int):
+    """func(table)을 repeat회 실행하여 소요 시간(초) 목록을 반환합니다."""
+    func(table)  # 워밍업
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(table)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DataTable 변환 벤치마크")
+    parser.add_argument('--fixture', default=str(ROOT / 'decrypted_data.csv'))
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--scale', type=int, default=1, help="픽스처 행 반복 배수")
+    args = parser.parse_args()
+
+    try:
+        columns, rows = load_fixture(Path(args.fixture))
+        table = build_datatable(columns, rows, args.scale)
+    except ImportError as e:
+        print(f"✗ pythonnet(.NET 런타임)을 불러올 수 없습니다: {e}")
+        return 1
+
+    print(f"테이블: {table.TableName} ({table.Rows.Count} rows × {table.Columns.Count} columns)")
+
+    legacy = datatable_to_rows_legacy(table)
+    bulk = datatable_to_rows_bulk(table)
+    if legacy != bulk:
+        print("✗ 변환 결과가 일치하지 않습니다")
+        return 1
+    print("✓ 두 방식의 변환 결과 일치")
+
+    results = {
+        'legacy': timeit(datatable_to_rows_legacy, table, args.repeat),
+        'bulk': timeit(datatable_to_rows_bulk, table, args.repeat),
+    }
+
+    print()
+    print(f"{'방식':<10}{'median(ms)':>12}{'min(ms)':>12}")
+    for name, timings in results.items():
+        print(f"{name:<10}{statistics.median(timings) * 1000:>12.2f}{min(timings) * 1000:>12.2f}")
+
+    speedup = statistics.median(results['legacy']) / statistics.median(results['bulk'])
+    print(f"\n일괄 변환 속도 향상: {speedup:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
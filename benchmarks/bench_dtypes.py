@@ -0,0 +1,146 @@
+"""
+DT6 컬럼 형식(logen_schema) 메모리 벤치마크
+- decrypted_data.csv (DT6 60행)를 바탕으로 한 달치 합성 데이터를 만들어
+  문자열 DataFrame(TableData.to_frame())과 형식 변환 DataFrame(to_frame(typed=True))의
+  메모리 사용량(문자열 내용 포함)과 변환 시간을 비교합니다.
+- 합성 데이터: 날짜별 송장 수만큼 캡처 행을 복제하되, 운송장번호/주문번호/수하인 정보/
+  전화번호/물품가액/출력시간은 행마다 다르게 만들어 실제와 비슷한 고유값 비율을 유지합니다.
+
+사용법:
+    python benchmarks/bench_dtypes.py [--days 30] [--per-day 3000] [--top 15] [--output 결과.json]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from logen_decryptor import FixtureDecryptor, TableData  # noqa: E402
+from logen_schema import DT6_SCHEMA, TEXT, frame_memory  # noqa: E402
+
+# 행마다 다른 값으로 바꾸는 컬럼 (수하인 개인정보 등)
+UNIQUE_COLUMNS = ('RCV_CUST_CD', 'RCV_CUST_NM', 'RCV_CUST_ADDR2', 'RCV_NEW_ADDR3', 'REL_NO')
+PHONE_COLUMNS = ('RCV_TEL_NO', 'RCV_HAND_NO')
+
+
+def synthesize_month(base: TableData, days: int, per_day: int, seed: int = 0) -> TableData:
+    """
+    한 달치 DT6 합성 데이터를 만듭니다.
+
+    Args:
+        base: 캡처 DT6 테이블
+        days: 일수
+        per_day: 날짜별 송장 수
+        seed: 난수 시드
+    """
+    rng = random.Random(seed)
+    index = {name: i for i, name in enumerate(base.columns)}
+    start = date(2025, 10, 1)
+
+    rows = []
+    for day_offset in range(days):
+        day = start + timedelta(days=day_offset)
+        take_dt = f"{day:%Y%m%d}"
+        send_dt = f"{day + timedelta(days=1):%Y%m%d}"
+        # 하루에 출력 묶음 몇 번 (같은 묶음은 출력시간이 같음)
+        batches = sorted(f"{rng.randint(8, 19):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+                         for _ in range(12))
+        for i in range(per_day):
+            n = len(rows)
+            row = list(base.rows[n % len(base.rows)])
+            row[index['SLIP_NO']] = f"9{n:010d}"
+            row[index['FIX_TAKE_NO']] = f"39{n:014d}"
+            row[index['SEQ']] = str(i + 1)
+            row[index['ORD_SEQ']] = str(i // 500)
+            row[index['TAKE_DT']] = row[index['PICK_REQ_DT']] = take_dt
+            row[index['SND_EXP_DT']] = send_dt
+            row[index['SEARCH_TIME']] = f"{take_dt}200443"
+            row[index['PRINT_TIME']] = batches[i * len(batches) // per_day]
+            row[index['GOODS_AMT']] = str(rng.randrange(5000, 300000, 100))
+            for name in UNIQUE_COLUMNS:
+                if row[index[name]] is not None:
+                    row[index[name]] = f"{row[index[name]]} {n}"
+            for name in PHONE_COLUMNS:
+                if row[index[name]] is not None:
+                    row[index[name]] = f"010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+            rows.append(row)
+    return TableData(base.name, base.columns, rows)
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DT6 컬럼 형식 메모리 벤치마크")
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--per-day', type=int, default=3000, help="날짜별 송장 수")
+    parser.add_argument('--top', type=int, default=15, help="메모리를 많이 줄인 컬럼 표시 개수")
+    parser.add_argument('--output', help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    base = FixtureDecryptor.read_csv(ROOT / 'decrypted_data.csv', 'DT6')
+    table = synthesize_month(base, args.days, args.per_day)
+    print(f"합성 데이터: {args.days}일 × {args.per_day:,}건 = {len(table):,}행 × {len(table.columns)}열")
+
+    plain, plain_seconds = timed(table.to_frame)
+    typed, typed_seconds = timed(lambda: table.to_frame(typed=True))
+    before = plain.memory_usage(index=False, deep=True)
+    after = typed.memory_usage(index=False, deep=True)
+    before_total, after_total = frame_memory(plain), frame_memory(typed)
+
+    print()
+    print(f"{'':<16}{'메모리(MB)':>12}{'변환(초)':>10}")
+    print(f"{'문자열':<16}{before_total / 1e6:>12.1f}{plain_seconds:>10.2f}")
+    print(f"{'형식 변환':<16}{after_total / 1e6:>12.1f}{typed_seconds:>10.2f}")
+    print(f"→ {before_total / after_total:.1f}배 감소 ({(1 - after_total / before_total) * 100:.0f}%)")
+
+    kinds = {}
+    for name in table.columns:
+        kind = DT6_SCHEMA.get(name, TEXT)
+        entry = kinds.setdefault(kind, {'columns': 0, 'before': 0, 'after': 0})
+        entry['columns'] += 1
+        entry['before'] += int(before[name])
+        entry['after'] += int(after[name])
+
+    print()
+    print(f"{'형식':<10}{'컬럼':>6}{'이전(MB)':>11}{'이후(MB)':>11}")
+    for kind, entry in sorted(kinds.items(), key=lambda item: -item[1]['before']):
+        print(f"{kind:<10}{entry['columns']:>6}{entry['before'] / 1e6:>11.1f}{entry['after'] / 1e6:>11.1f}")
+
+    saved = (before - after).sort_values(ascending=False)
+    print()
+    print(f"{'컬럼':<18}{'형식':<18}{'이전(MB)':>11}{'이후(MB)':>11}")
+    for name in saved.index[:args.top]:
+        print(f"{name:<18}{str(typed[name].dtype)[:17]:<18}{before[name] / 1e6:>11.2f}{after[name] / 1e6:>11.2f}")
+
+    if args.output:
+        report = {
+            'rows': len(table),
+            'days': args.days,
+            'per_day': args.per_day,
+            'before_bytes': before_total,
+            'after_bytes': after_total,
+            'before_seconds': round(plain_seconds, 4),
+            'after_seconds': round(typed_seconds, 4),
+            'kinds': kinds,
+            'columns': {name: {'dtype': str(typed[name].dtype),
+                               'before': int(before[name]), 'after': int(after[name])}
+                        for name in table.columns},
+        }
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        print()
+        print(f"결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
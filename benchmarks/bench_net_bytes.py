@@ -0,0 +1,79 @@
+"""
+Python 버퍼 → System.Byte[] 변환 벤치마크
+- 요소 단위 복사(Array[Byte](bytes))와 블록 복사(Marshal.Copy)를
+  64 KB, 1 MB, 16 MB 크기에서 비교합니다.
+- pythonnet(.NET 런타임)이 필요합니다. 로젠 DLL은 필요하지 않습니다.
+
+사용법:
+    python benchmarks/bench_net_bytes.py [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from logen_clr import to_net_bytes_block, to_net_bytes_element  # noqa: E402
+
+SIZES = [
+    ('64 KB', 64 * 1024),
+    ('1 MB', 1024 * 1024),
+    ('16 MB', 16 * 1024 * 1024),
+]
+
+
+def timeit(func, data, repeat: int):
+    """func(data)를 repeat회 실행하여 소요 시간(초) 목록을 반환합니다."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def verify(data) -> bool:
+    """두 방식의 결과가 같은지 확인합니다."""
+    from System import Byte
+    from System.Linq import Enumerable
+
+    block = to_net_bytes_block(data)
+    element = to_net_bytes_element(data)
+    return block.Length == len(data) and Enumerable.SequenceEqual[Byte](block, element)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="System.Byte[] 변환 벤치마크")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    try:
+        import clr
+        clr.AddReference('System.Core')
+    except ImportError as e:
+        print(f"✗ pythonnet(.NET 런타임)을 불러올 수 없습니다: {e}")
+        return 1
+
+    if not verify(os.urandom(64 * 1024)):
+        print("✗ 블록 복사 결과가 요소 단위 복사 결과와 다릅니다")
+        return 1
+    print("✓ 두 방식의 변환 결과 일치")
+    print()
+
+    print(f"{'크기':<8}{'element(ms)':>14}{'block(ms)':>12}{'배수':>8}")
+    for label, size in SIZES:
+        data = bytearray(os.urandom(size))
+        element = statistics.median(timeit(to_net_bytes_element, data, args.repeat))
+        block = statistics.median(timeit(to_net_bytes_block, data, args.repeat))
+        print(f"{label:<8}{element * 1000:>14.2f}{block * 1000:>12.2f}{element / block:>7.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
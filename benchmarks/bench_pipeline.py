@@ -0,0 +1,256 @@
+"""
+다운로드 파이프라인 단계별 벤치마크
+- 저장소의 캡처(response.txt, decoded_data.bin, decrypted_data.csv)로 만든 입력으로
+  각 단계를 따로 실행하여 소요 시간과 최대 메모리(tracemalloc)를 측정합니다.
+- DT6 60행을 복제하여 10,000행 / 100,000행 규모로 늘립니다 (운송장번호/주문번호는 고유값).
+- 결과를 JSON으로 저장하고, 이전 결과와 비교할 수 있습니다.
+
+단계:
+    envelope_build   SELECT_ENC 요청 본문 생성
+    extract          응답에서 결과 요소(Base64 텍스트) 위치 찾기
+    b64decode        Base64 디코딩
+    stream_decode    스트리밍 추출 + 디코딩 (실제 다운로더 경로, 64 KB 청크)
+    decrypt          복호화 (FixtureDecryptor 대체 페이로드, .NET DLL 없이)
+    table_xml_parse  DataTable.WriteXml 결과 → 행 목록 (일괄 변환의 Python 쪽)
+    dataframe_build  행 목록 → DataFrame
+    write_csv        CSV 저장 (logen_writers.export_rows, 실제 다운로더 경로)
+    write_xlsx       엑셀 저장 (logen_writers.export_rows, openpyxl write-only 스트리밍)
+
+사용법:
+    python benchmarks/bench_pipeline.py [--rows 60,10000,100000] [--repeat 3]
+                                        [--output results.json] [--compare 이전결과.json]
+"""
+
+import argparse
+import base64
+import binascii
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from logen_dataset import parse_datatable_xml  # noqa: E402
+from logen_decryptor import FixtureDecryptor, TableData  # noqa: E402
+from logen_fake_server import scale_table, soap_response  # noqa: E402
+from logen_soap_codec import SELECT_ENC  # noqa: E402
+from logen_soap_stream import DEFAULT_CHUNK_SIZE  # noqa: E402
+from logen_writers import export_rows  # noqa: E402
+
+STAGES = [
+    'envelope_build', 'extract', 'b64decode', 'stream_decode', 'decrypt',
+    'table_xml_parse', 'dataframe_build', 'write_csv', 'write_xlsx',
+]
+
+RESULT_OPEN = b'<W_FC0073T_NTx_SelectEncResult>'
+RESULT_CLOSE = b'</W_FC0073T_NTx_SelectEncResult>'
+
+
+def load_table() -> TableData:
+    """decrypted_data.csv (DT6 캡처)"""
+    return FixtureDecryptor.read_csv(ROOT / 'decrypted_data.csv', 'DT6')
+
+
+def datatable_xml(table: TableData) -> str:
+    """DataTable.WriteXml과 같은 형식의 XML (빈 값은 요소 생략)"""
+    parts = ['<DocumentElement>']
+    for row in table.rows:
+        parts.append(f'<{table.name}>')
+        for column, value in zip(table.columns, row):
+            if value is not None:
+                parts.append(f'<{column}>{escape(value)}</{column}>')
+        parts.append(f'</{table.name}>')
+    parts.append('</DocumentElement>')
+    return ''.join(parts)
+
+
+def extract(body: bytes) -> bytes:
+    start = body.index(RESULT_OPEN) + len(RESULT_OPEN)
+    return body[start:body.index(RESULT_CLOSE, start)]
+
+
+def stream_decode(body: bytes) -> bytearray:
+    view = memoryview(body)
+    chunks = (view[i:i + DEFAULT_CHUNK_SIZE] for i in range(0, len(body), DEFAULT_CHUNK_SIZE))
+    return SELECT_ENC.decode_stream(chunks, len(body)).payload
+
+
+def build_stages(table: TableData, workdir: Path, param: str) -> dict:
+    """
+    규모별 단계 함수를 만듭니다. 각 단계의 입력은 미리 만들어 두므로
+    측정에는 그 단계의 작업만 포함됩니다.
+
+    Returns:
+        dict: 단계 이름 → (함수, 처리 바이트 수)
+    """
+    decryptor = FixtureDecryptor()
+    payload = FixtureDecryptor.encrypt([table])
+    body = soap_response(SELECT_ENC, base64.b64encode(payload))
+    encoded = extract(body)
+    xml_text = datatable_xml(table)
+    base_path = workdir / 'bench'
+
+    return {
+        'envelope_build': (lambda: SELECT_ENC.encode(param), len(param)),
+        'extract': (lambda: extract(body), len(body)),
+        'b64decode': (lambda: binascii.a2b_base64(encoded), len(encoded)),
+        'stream_decode': (lambda: stream_decode(body), len(body)),
+        'decrypt': (lambda: decryptor.decrypt(payload), len(payload)),
+        'table_xml_parse': (lambda: parse_datatable_xml(xml_text, table.columns, table.name),
+                            len(xml_text.encode('utf-8'))),
+        'dataframe_build': (table.to_frame, None),
+        'write_csv': (lambda: export_rows(base_path, table.columns, table.rows, ['csv']), None),
+        'write_xlsx': (lambda: export_rows(base_path, table.columns, table.rows, ['xlsx'],
+                                           sheet_name=table.name), None),
+    }
+
+
+def measure(func, repeat: int, max_seconds: float):
+    """
+    func를 최대 repeat회 실행하여 소요 시간(초) 목록을 반환합니다.
+    한 번 실행이 max_seconds를 넘으면 더 반복하지 않습니다.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+        if timings[-1] > max_seconds:
+            break
+    return timings
+
+
+def peak_memory(func) -> float:
+    """func 실행 중 최대 메모리 사용량(MB, tracemalloc)"""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1e6
+
+
+def verify_capture() -> bool:
+    """캡처 응답(response.txt)을 디코딩한 결과가 decoded_data.bin과 같은지 확인합니다."""
+    response = (ROOT / 'response.txt').read_bytes()
+    return SELECT_ENC.decode(response).payload == (ROOT / 'decoded_data.bin').read_bytes()
+
+
+def compare(results: list, previous_path: Path):
+    """이전 결과 JSON과 단계별 중앙값을 비교합니다."""
+    previous = json.loads(previous_path.read_text(encoding='utf-8'))
+    before = {(r['rows'], r['stage']): r for r in previous['results'] if r['seconds'] is not None}
+
+    print()
+    print(f"이전 결과와 비교: {previous_path} ({previous['meta']['timestamp']})")
+    print(f"{'행':>8}  {'단계':<17}{'이전(ms)':>11}{'현재(ms)':>11}{'배수':>8}")
+    for result in results:
+        old = before.get((result['rows'], result['stage']))
+        if old is None or result['seconds'] is None:
+            continue
+        ratio = old['seconds'] / result['seconds'] if result['seconds'] else float('inf')
+        print(f"{result['rows']:>8,}  {result['stage']:<17}{old['seconds'] * 1000:>11.2f}"
+              f"{result['seconds'] * 1000:>11.2f}{ratio:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="다운로드 파이프라인 단계별 벤치마크")
+    parser.add_argument('--rows', default='60,10000,100000', help="규모 (쉼표로 구분)")
+    parser.add_argument('--stages', default=','.join(STAGES), help="측정할 단계 (쉼표로 구분)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-stage-seconds', type=float, default=5.0,
+                        help="한 번 실행이 이 시간을 넘는 단계는 반복하지 않음")
+    parser.add_argument('--xlsx-max-rows', type=int, default=10000,
+                        help="이 행 수보다 큰 규모에서는 write_xlsx 생략 "
+                             "(스트리밍 기록도 행당 약 1.5ms - 100,000행이면 약 2분, 메모리 측정 시 몇 배)")
+    parser.add_argument('--no-memory', action='store_true', help="메모리 측정 생략")
+    parser.add_argument('--output', help="결과 JSON 경로 (기본값: benchmarks/results/pipeline_시각.json)")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    sizes = [int(value) for value in args.rows.split(',') if value]
+    stages = [stage for stage in args.stages.split(',') if stage]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        print(f"✗ 알 수 없는 단계: {', '.join(sorted(unknown))} (사용 가능: {', '.join(STAGES)})")
+        return 1
+
+    if not verify_capture():
+        print("✗ response.txt 디코딩 결과가 decoded_data.bin과 다릅니다")
+        return 1
+    print("✓ 캡처 응답 디코딩 결과 일치 (response.txt → decoded_data.bin)")
+
+    base = load_table()
+    param = (ROOT / 'test.txt').read_text(encoding='utf-8', errors='replace')
+    start = param.find('<bytDataParam>')
+    param = param[start + len('<bytDataParam>'):param.index('</bytDataParam>', start)] if start >= 0 else 'A' * 512
+
+    results = []
+    print()
+    print(f"{'행':>8}  {'단계':<17}{'중앙값(ms)':>12}{'MB/s':>9}{'최대 메모리(MB)':>16}{'반복':>6}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in sizes:
+            table = scale_table(base, rows)
+            functions = build_stages(table, Path(workdir), param)
+            for stage in stages:
+                func, size = functions[stage]
+                if stage == 'write_xlsx' and rows > args.xlsx_max_rows:
+                    results.append({'rows': rows, 'stage': stage, 'seconds': None,
+                                    'skipped': f"rows > {args.xlsx_max_rows}"})
+                    print(f"{rows:>8,}  {stage:<17}{'생략':>12}")
+                    continue
+
+                timings = measure(func, args.repeat, args.max_stage_seconds)
+                seconds = statistics.median(timings)
+                peak = None if args.no_memory else peak_memory(func)
+                throughput = size / seconds / 1e6 if size and seconds else None
+                results.append({
+                    'rows': rows,
+                    'stage': stage,
+                    'seconds': round(seconds, 6),
+                    'timings': [round(t, 6) for t in timings],
+                    'bytes': size,
+                    'mb_per_s': round(throughput, 2) if throughput else None,
+                    'peak_mb': round(peak, 2) if peak is not None else None,
+                })
+                mb_per_s = f"{throughput:.1f}" if throughput else "-"
+                peak_mb = f"{peak:.1f}" if peak is not None else "-"
+                print(f"{rows:>8,}  {stage:<17}{seconds * 1000:>12.2f}{mb_per_s:>9}"
+                      f"{peak_mb:>16}{len(timings):>6}")
+
+    import pandas as pd
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+
+    output = Path(args.output) if args.output else (
+        ROOT / 'benchmarks' / 'results' / f"pipeline_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print()
+    print(f"결과 저장: {output}")
+
+    if args.compare:
+        compare(results, Path(args.compare))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
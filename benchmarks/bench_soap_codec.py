@@ -0,0 +1,124 @@
+"""
+SOAP 코덱 벤치마크
+- 요청 생성: 문자열 템플릿(f-string + encode)과 미리 만든 바이트 조각 이어 붙이기 비교
+- 응답 변환: 정규식 + b64decode와 SELECT_ENC.decode(스트리밍 리더) 비교 (response.txt)
+- DataSet 응답: MESSAGE_SELECT.decode (test2.txt)
+- 결과는 초당 처리 건수(ops/s)와 MB/s로 표시합니다.
+
+사용법:
+    python benchmarks/bench_soap_codec.py [--repeat 2000]
+"""
+
+import argparse
+import base64
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from logen_soap_codec import LOGIN_ENCRYPT, MESSAGE_SELECT, NS_COMM, NS_FC, SELECT_ENC  # noqa: E402
+
+# 코덱 도입 전 요청 생성 방식
+OLD_ENVELOPE = '''<?xml version="1.0" encoding="utf-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"
+               xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+               xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <soap:Body>
+        {body}
+    </soap:Body>
+</soap:Envelope>'''
+
+OLD_RESULT = re.compile(r'<W_FC0073T_NTx_SelectEncResult>(.*?)</W_FC0073T_NTx_SelectEncResult>', re.S)
+
+LOGIN_ARGS = ['33722047', 'cGFzc3dvcmQ=', '192.168.0.10', '00-11-22-33-44-55']
+SELECT_PARAM = base64.b64encode(bytes(range(256)) * 2).decode('ascii')
+
+
+def old_login(user_id, password, ip, mac):
+    body = f'''<W_COMM_NTx_LoginEncrypt xmlns="{NS_COMM}">
+            <arrParam>
+                <string>{user_id}</string>
+                <string>{password}</string>
+                <string>{ip}</string>
+                <string>{mac}</string>
+            </arrParam>
+        </W_COMM_NTx_LoginEncrypt>'''
+    return OLD_ENVELOPE.format(body=body).encode('utf-8')
+
+
+def old_select(param):
+    body = f'''<W_FC0073T_NTx_SelectEnc xmlns="{NS_FC}">
+            <bytDataParam>{param}</bytDataParam>
+        </W_FC0073T_NTx_SelectEnc>'''
+    return OLD_ENVELOPE.format(body=body).encode('utf-8')
+
+
+def old_decode(body: bytes) -> bytes:
+    match = OLD_RESULT.search(body.decode('utf-8'))
+    return base64.b64decode(match.group(1))
+
+
+def measure(func, repeat: int, rounds: int = 5) -> float:
+    """func()를 repeat회 실행하는 것을 rounds번 반복하여 1회당 시간(초)의 중앙값을 반환합니다."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        timings.append((time.perf_counter() - start) / repeat)
+    return statistics.median(timings)
+
+
+def report(label: str, seconds: float, size: int):
+    print(f"{label:<32}{1 / seconds:>12,.0f}{size / seconds / 1e6:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SOAP 코덱 벤치마크")
+    parser.add_argument('--repeat', type=int, default=2000, help="측정 1회당 반복 수 (요청 생성 기준)")
+    args = parser.parse_args()
+
+    response = (ROOT / 'response.txt').read_bytes()
+    dataset = (ROOT / 'test2.txt').read_bytes()
+    dataset = dataset[dataset.index(b'<?xml', dataset.index(b'HTTP/1.1 200')):]
+
+    if SELECT_ENC.decode(response).payload != old_decode(response):
+        print("✗ SELECT_ENC.decode 결과가 기존 방식과 다릅니다")
+        return 1
+    print("✓ 응답 변환 결과 일치")
+    print()
+
+    print(f"{'항목':<32}{'ops/s':>12}{'MB/s':>10}")
+
+    login = LOGIN_ENCRYPT.encode(LOGIN_ARGS)
+    report("로그인 요청 (f-string)", measure(lambda: old_login(*LOGIN_ARGS), args.repeat),
+           len(old_login(*LOGIN_ARGS)))
+    report("로그인 요청 (codec)", measure(lambda: LOGIN_ENCRYPT.encode(LOGIN_ARGS), args.repeat),
+           len(login))
+
+    select = SELECT_ENC.encode(SELECT_PARAM)
+    report("송장 조회 요청 (f-string)", measure(lambda: old_select(SELECT_PARAM), args.repeat),
+           len(old_select(SELECT_PARAM)))
+    report("송장 조회 요청 (codec)", measure(lambda: SELECT_ENC.encode(SELECT_PARAM), args.repeat),
+           len(select))
+
+    # 응답은 크기가 크므로 반복 수를 줄임
+    repeat = max(1, args.repeat // 20)
+    report("송장 응답 (정규식 + b64decode)", measure(lambda: old_decode(response), repeat), len(response))
+    report("송장 응답 (SELECT_ENC.decode)", measure(lambda: SELECT_ENC.decode(response), repeat),
+           len(response))
+    report("DataSet 응답 (MESSAGE_SELECT)", measure(lambda: MESSAGE_SELECT.decode(dataset), repeat),
+           len(dataset))
+
+    print()
+    print(f"요청 크기: 로그인 {len(old_login(*LOGIN_ARGS))} → {len(login)} bytes, "
+          f"송장 조회 {len(old_select(SELECT_PARAM))} → {len(select)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
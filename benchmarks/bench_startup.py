@@ -0,0 +1,131 @@
+"""
+명령행 시작 시간 벤치마크 (python -X importtime)
+- 가벼운 명령(--help, check-config, password-status, lookup)을 실행하여
+  모듈 import 시간과 전체 실행 시간을 측정합니다.
+- 무거운 라이브러리(pandas, openpyxl, pythonnet, cryptography, requests 등)가
+  로드되면 실패로 표시합니다.
+- import 시간이 예산(--budget-ms)을 넘어도 실패로 표시하고 종료 코드 1을 반환합니다.
+
+import 시간은 빈 인터프리터(python -c pass)에서도 로드되는 모듈을 뺀 값입니다.
+
+사용법:
+    python benchmarks/bench_startup.py [--config config.json] [--repeat 5] [--budget-ms 150]
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / 'logen_invoice_downloader.py'
+
+# 가벼운 명령에서 로드되면 안 되는 모듈
+HEAVY_MODULES = (
+    'pandas', 'numpy', 'openpyxl', 'clr', 'pythonnet', 'cryptography',
+    'requests', 'urllib3', 'aiohttp', 'multiprocessing', 'schedule',
+)
+
+_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$')
+
+
+def light_commands(config: Path):
+    """측정할 가벼운 명령 목록"""
+    return [
+        ('--help', ['--help']),
+        ('check-config', ['--config', str(config), 'check-config']),
+        ('password-status', ['--config', str(config), 'password-status']),
+        ('lookup', ['--config', str(config), 'lookup', '--order', '0']),
+    ]
+
+
+def parse_importtime(stderr: str):
+    """
+    -X importtime 출력에서 (최상위 import별 누적 시간(µs), 로드된 모듈 이름 집합)을 구합니다.
+    """
+    top_level = {}
+    modules = set()
+    for line in stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        modules.add(name)
+        if len(indent) == 1:
+            top_level[name] = top_level.get(name, 0) + int(cumulative)
+    return top_level, modules
+
+
+def run(args, cwd: Path):
+    """명령을 실행하여 (전체 시간(초), -X importtime 출력)을 반환합니다."""
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args],
+        cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        text=True, encoding='utf-8', errors='replace',
+    )
+    return time.perf_counter() - started, completed.stderr
+
+
+def main():
+    parser = argparse.ArgumentParser(description="명령행 시작 시간 벤치마크")
+    parser.add_argument('--config', help="config.json 경로 (기본값: config.json, 없으면 config.example.json)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=150.0,
+                        help="명령별 import 시간 예산(ms, 빈 인터프리터 대비)")
+    parser.add_argument('--top', type=int, default=5, help="느린 최상위 import 표시 개수")
+    args = parser.parse_args()
+
+    config = Path(args.config) if args.config else ROOT / 'config.json'
+    if not config.exists():
+        config = ROOT / 'config.example.json'
+
+    _, baseline_stderr = run(['-c', 'pass'], ROOT)
+    baseline, _ = parse_importtime(baseline_stderr)
+    baseline_wall = statistics.median(run(['-c', 'pass'], ROOT)[0] for _ in range(args.repeat))
+
+    print(f"설정 파일: {config}")
+    print(f"빈 인터프리터 시작: {baseline_wall * 1000:.0f} ms")
+    print()
+    print(f"{'명령':<18}{'import(ms)':>12}{'전체(ms)':>10}{'예산':>8}  무거운 모듈")
+
+    failed = False
+    slowest = {}
+    for label, command in light_commands(config):
+        import_times = []
+        wall_times = []
+        heavy = set()
+        for _ in range(args.repeat):
+            wall, stderr = run([str(SCRIPT), *command], ROOT)
+            top_level, modules = parse_importtime(stderr)
+            own = {name: us for name, us in top_level.items() if name not in baseline}
+            import_times.append(sum(own.values()) / 1000)
+            wall_times.append(wall * 1000)
+            heavy |= {m for m in modules if m.split('.')[0] in HEAVY_MODULES}
+            slowest[label] = own
+
+        import_ms = statistics.median(import_times)
+        over = import_ms > args.budget_ms
+        failed |= over or bool(heavy)
+        heavy_roots = sorted({m.split('.')[0] for m in heavy})
+        print(f"{label:<18}{import_ms:>12.1f}{statistics.median(wall_times):>10.0f}"
+              f"{'✗' if over else '✓':>8}  {', '.join(heavy_roots) or '-'}")
+
+    print()
+    for label, own in slowest.items():
+        top = sorted(own.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        print(f"{label}: " + ", ".join(f"{name} {us / 1000:.1f}ms" for name, us in top))
+
+    print()
+    if failed:
+        print(f"✗ 시작 시간 예산({args.budget_ms:.0f} ms) 초과 또는 무거운 모듈 로드")
+        return 1
+    print("✓ 모든 가벼운 명령이 예산 안에서 시작됨")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
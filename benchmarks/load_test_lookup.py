@@ -0,0 +1,131 @@
+"""
+운송장번호 조회 서버 부하 테스트
+- 여러 연결(keep-alive)에서 POST /lookup 일괄 조회를 반복하고
+  요청 지연 시간의 p50 / p99 / 최대값과 초당 처리량을 출력합니다.
+- 조회 키는 송장 저장소(--db)에서 뽑습니다. 없으면 임의의 주문번호를 사용합니다.
+
+사용법:
+    python logen_invoice_downloader.py serve
+    python benchmarks/load_test_lookup.py --db downloads/invoices.db \\
+        [--url http://127.0.0.1:8765] [--concurrency 8] [--requests 2000] [--batch 200]
+"""
+
+import argparse
+import http.client
+import json
+import math
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from logen_store import InvoiceStore  # noqa: E402
+
+
+def load_keys(db_path, count: int):
+    """저장소에서 주문번호/전화번호 뒷자리 목록을 가져옵니다."""
+    if not db_path or not Path(db_path).exists():
+        return [str(random.randrange(10 ** 15, 10 ** 16)) for _ in range(count)], []
+
+    store = InvoiceStore(db_path)
+    try:
+        rows = list(store.iter_all(['FIX_TAKE_NO', 'RCV_HAND_NO']))
+    finally:
+        store.close()
+    orders = [r['FIX_TAKE_NO'] for r in rows if r['FIX_TAKE_NO']]
+    phones = [r['RCV_HAND_NO'][-4:] for r in rows if r['RCV_HAND_NO']]
+    return orders or ['0'], phones
+
+
+def percentile(values, pct: float) -> float:
+    """정렬된 목록의 백분위수 (nearest-rank)"""
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, math.ceil(pct / 100 * len(values)) - 1))
+    return values[rank]
+
+
+def worker(url, orders, phones, batch: int, requests_per_worker: int, latencies, errors, lock):
+    """연결 하나로 일괄 조회를 반복합니다."""
+    connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+    local = []
+    failed = 0
+    try:
+        for _ in range(requests_per_worker):
+            body = {'orders': random.choices(orders, k=batch)}
+            if phones:
+                body['phones'] = random.choices(phones, k=max(1, batch // 20))
+            data = json.dumps(body).encode('utf-8')
+
+            start = time.perf_counter()
+            connection.request('POST', '/lookup', body=data,
+                               headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            local.append(time.perf_counter() - start)
+            if response.status != 200:
+                failed += 1
+    finally:
+        connection.close()
+
+    with lock:
+        latencies.extend(local)
+        errors.append(failed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="운송장번호 조회 서버 부하 테스트")
+    parser.add_argument('--url', default='http://127.0.0.1:8765')
+    parser.add_argument('--db', help="송장 저장소 경로 (조회 키 추출용)")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=2000, help="전체 요청 수")
+    parser.add_argument('--batch', type=int, default=200, help="요청당 주문번호 수")
+    args = parser.parse_args()
+
+    url = urlparse(args.url)
+    orders, phones = load_keys(args.db, args.batch)
+    print(f"조회 키: 주문번호 {len(orders)}개, 전화번호 {len(phones)}개")
+
+    try:
+        connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=5)
+        connection.request('GET', '/health')
+        health = json.loads(connection.getresponse().read())
+        connection.close()
+    except OSError as e:
+        print(f"✗ 조회 서버에 연결할 수 없습니다: {e}")
+        return 1
+    print(f"서버: 송장 {health['invoices']}건 (적재 {health['loaded_at']})")
+
+    latencies, errors, lock = [], [], threading.Lock()
+    per_worker = max(1, args.requests // args.concurrency)
+    threads = [
+        threading.Thread(target=worker, args=(url, orders, phones, args.batch, per_worker,
+                                              latencies, errors, lock))
+        for _ in range(args.concurrency)
+    ]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    total = len(latencies)
+    print()
+    print(f"요청 {total}건 (연결 {args.concurrency}개, 요청당 {args.batch}건), 실패 {sum(errors)}건")
+    print(f"p50 {percentile(latencies, 50) * 1000:.2f} ms / "
+          f"p99 {percentile(latencies, 99) * 1000:.2f} ms / "
+          f"최대 {latencies[-1] * 1000:.2f} ms")
+    print(f"처리량 {total / elapsed:.0f} 요청/초 ({total * args.batch / elapsed:.0f} 조회/초)")
+    return 0 if not sum(errors) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
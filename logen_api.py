@@ -5,13 +5,15 @@ Fiddler로 분석한 API를 사용하여 송장 데이터를 자동으로 다운
 
 import os
 import json
-import logging
 import getpass
 from datetime import datetime
 from pathlib import Path
 import requests
 from typing import Optional, Dict, Any
 
+from logen_logging import setup_logging
+from logen_writers import parse_formats
+
 
 class LogenInvoiceDownloader:
     """로젠택배 송장 데이터를 자동으로 다운로드하는 클래스"""
@@ -53,19 +55,8 @@ class LogenInvoiceDownloader:
             raise ValueError(f"JSON 파싱 오류: {e}")
 
     def _setup_logging(self):
-        """로깅을 설정합니다."""
-        log_folder = Path(self.config['paths']['log_folder'])
-        log_file = log_folder / f"logen_{datetime.now():%Y%m%d}.log"
-
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s [%(levelname)s] %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
+        """로깅을 설정합니다. (파일/콘솔 쓰기는 백그라운드 스레드에서 처리)"""
+        self.logger = setup_logging(self.config, __name__)
 
     def login(self, password: str) -> bool:
         """
@@ -101,7 +92,7 @@ class LogenInvoiceDownloader:
                 return True
             else:
                 self.logger.error(f"✗ 로그인 실패: {response.status_code}")
-                self.logger.error(f"응답 내용: {response.text}")
+                self.logger.error("응답 내용: %.500s", response.text)
                 return False
 
         except requests.exceptions.RequestException as e:
@@ -170,7 +161,9 @@ class LogenInvoiceDownloader:
             if response.status_code == 200:
                 # 파일 저장
                 download_folder = Path(self.config['paths']['download_folder'])
-                filename = f"logen_invoices_{datetime.now():%Y%m%d_%H%M%S}.{self.config['settings']['download_format']}"
+                # 서버가 만든 파일을 그대로 받으므로 첫 번째 형식만 사용
+                extension = parse_formats(self.config['settings'].get('download_format'))[0]
+                filename = f"logen_invoices_{datetime.now():%Y%m%d_%H%M%S}.{extension}"
                 file_path = download_folder / filename
 
                 with open(file_path, 'wb') as f:
@@ -0,0 +1,357 @@
+"""
+로젠택배 비동기 SOAP 클라이언트 (asyncio + aiohttp)
+- 하나의 이벤트 루프에서 여러 계정 / 여러 날짜 조회를 동시에 실행
+- 모든 계정이 하나의 연결 풀(TCPConnector)을 공유, 쿠키는 계정별로 분리
+- 세마포어로 동시 요청 수 제한, 요청별 기한(deadline), 작업 취소 지원
+- 복호화는 실행기(executor)에서 수행하여 이벤트 루프를 막지 않음
+
+사용 예:
+    async with AsyncLogenClient(config) as client:
+        results = await client.fetch_many([
+            (account, day, param) for account in accounts for day, param in params
+        ])
+"""
+
+import asyncio
+import logging
+import time
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+
+from logen_decryptor import TableData, get_shared_decryptor
+from logen_session import DEFAULT_SESSION_TTL, is_rejection
+from logen_soap_codec import LOGIN_ENCRYPT, MESSAGE_SELECT, SELECT_ENC, USER_AGENT
+from logen_soap_stream import DEFAULT_CHUNK_SIZE, SoapFault
+from logen_transport import RETRY_STATUS, CircuitOpenError, get_circuit_breaker, transport_options
+
+# 기본 동시 요청 수
+DEFAULT_CONCURRENCY = 8
+
+
+class _Rejected(Exception):
+    """서버가 로그인 세션을 거부함 (HTTP 401/403)"""
+
+
+class AsyncLogenClient:
+    """
+    비동기 SOAP 클라이언트
+
+    계정 정보는 config의 logen_credentials / accounts 항목 형식의 딕셔너리입니다.
+    계정마다 로그인 상태를 따로 관리하며(settings.session_ttl), 서버가 세션을
+    거부하면 다시 로그인한 뒤 한 번 재시도합니다.
+
+    Args:
+        config: 로드된 config.json 내용
+        concurrency: 동시에 보내는 최대 요청 수 (기본값: async.concurrency 또는 8)
+        decryptor: 복호화 풀 (기본값: 프로세스 공유 풀)
+        logger: 로거
+    """
+
+    def __init__(self, config: dict, concurrency: Optional[int] = None, decryptor=None,
+                 logger: Optional[logging.Logger] = None):
+        self.config = config
+        self.logger = logger or logging.getLogger(__name__)
+        self.options = transport_options(config)
+        async_config = config.get('async', {})
+        self.concurrency = concurrency or async_config.get('concurrency', DEFAULT_CONCURRENCY)
+        self.timeout = config['settings']['timeout']
+        self.session_ttl = config['settings'].get('session_ttl', DEFAULT_SESSION_TTL)
+        self.chunk_size = config['settings'].get('stream_chunk_size', DEFAULT_CHUNK_SIZE)
+        self._decryptor = decryptor
+
+        self._connector = None
+        self._semaphore = None
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._login_locks: Dict[str, asyncio.Lock] = {}
+        self._expires: Dict[str, float] = {}
+        self._passwords: Dict[str, str] = {}
+        self.stats = {'requests': 0, 'logins': 0, 'timeouts': 0, 'failed': 0}
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        """연결 풀 생성 (이벤트 루프 안에서 호출)"""
+        if self._connector is None:
+            self._connector = aiohttp.TCPConnector(
+                limit=self.options['pool_maxsize'],
+                limit_per_host=self.options['pool_maxsize'],
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def close(self):
+        """계정별 세션과 연결 풀을 닫습니다."""
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions.clear()
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+
+    @property
+    def decryptor(self):
+        if self._decryptor is None:
+            self._decryptor = get_shared_decryptor(self.config)
+        return self._decryptor
+
+    def _session(self, user_id: str) -> aiohttp.ClientSession:
+        """계정별 세션 (쿠키 분리, 연결 풀은 공유)"""
+        session = self._sessions.get(user_id)
+        if session is None:
+            session = self._sessions[user_id] = aiohttp.ClientSession(
+                connector=self._connector,
+                connector_owner=False,
+                cookie_jar=aiohttp.CookieJar(unsafe=True),
+                headers={'User-Agent': USER_AGENT},
+            )
+        return session
+
+    async def _post(self, user_id: str, operation, args: tuple, handle,
+                    timeout: Optional[float] = None):
+        """
+        SOAP 요청을 보내고 handle(response)의 결과를 반환합니다.
+
+        세마포어 대기 시간을 포함한 전체 시간이 timeout(초)을 넘으면
+        asyncio.TimeoutError가 발생합니다. 작업이 취소되면 연결도 정리됩니다.
+        """
+        url = operation.url(self.config)
+        data = operation.encode(*args)
+        headers = operation.headers
+        breaker = get_circuit_breaker(urlparse(url).netloc, self.options, self.logger)
+
+        async def send():
+            async with self._semaphore:
+                breaker.allow()
+                self.stats['requests'] += 1
+                # SoapTransport.post와 같은 기준: 응답을 받았으면(500 SOAP Fault 포함) 성공,
+                # 연결 오류/타임아웃/취소/502·503·504는 실패
+                # (어떤 경우에도 결과를 기록해야 half-open 시험 요청이 끝남)
+                status = None
+                transport_error = False
+                try:
+                    async with self._session(user_id).post(url, data=data, headers=headers) as response:
+                        status = response.status
+                        return await handle(response)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError, asyncio.CancelledError):
+                    transport_error = True
+                    raise
+                finally:
+                    if transport_error or status is None or status in RETRY_STATUS:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+
+        return await asyncio.wait_for(send(), timeout or self.timeout)
+
+    async def _load_password(self, user_id: str) -> Optional[str]:
+        """저장된 비밀번호 (Fernet 복호화는 실행기에서 한 번만)"""
+        if user_id not in self._passwords:
+            from password_manager import PasswordManager
+
+            account = None if user_id == str(self.config['logen_credentials']['user_id']) else user_id
+            loop = asyncio.get_running_loop()
+            password = await loop.run_in_executor(
+                None, lambda: PasswordManager(account=account).load_password()
+            )
+            if not password:
+                return None
+            self._passwords[user_id] = password
+        return self._passwords[user_id]
+
+    async def login(self, credentials: dict, timeout: Optional[float] = None) -> bool:
+        """
+        로그인 (계정별로 세션이 유효하면 생략)
+
+        Args:
+            credentials: 계정 정보 (user_id, ip_address, mac_address)
+            timeout: 요청 기한(초)
+
+        Returns:
+            bool: 로그인 성공 여부
+        """
+        user_id = str(credentials['user_id'])
+        lock = self._login_locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            if self._expires.get(user_id, 0) > time.monotonic():
+                return True
+
+            password = await self._load_password(user_id)
+            if not password:
+                self.logger.error(f"[{user_id}] 저장된 비밀번호가 없습니다.")
+                return False
+
+            args = ([user_id, password, credentials['ip_address'], credentials['mac_address']],)
+
+            async def handle(response):
+                await response.read()
+                return response.status
+
+            try:
+                status = await self._post(user_id, LOGIN_ENCRYPT, args, handle, timeout)
+            except CircuitOpenError as e:
+                self.logger.error(f"[{user_id}] ✗ 로그인 요청 차단: {e}")
+                return False
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                self.logger.error(f"[{user_id}] ✗ 로그인 중 네트워크 오류: {e!r}")
+                return False
+
+            if status != 200:
+                self.logger.error(f"[{user_id}] ✗ 로그인 실패: {status}")
+                self._passwords.pop(user_id, None)
+                return False
+
+            self.stats['logins'] += 1
+            self._expires[user_id] = time.monotonic() + self.session_ttl if self.session_ttl else 0.0
+            self.logger.info(f"[{user_id}] ✓ 로그인 성공")
+            return True
+
+    async def _call(self, credentials: dict, operation, args: tuple, handle,
+                    timeout: Optional[float] = None):
+        """로그인 후 호출, 서버가 세션을 거부하면 다시 로그인하여 한 번 재시도"""
+        user_id = str(credentials['user_id'])
+        for attempt in range(2):
+            if not await self.login(credentials, timeout):
+                return None
+            try:
+                return await self._post(user_id, operation, args, handle, timeout)
+            except (SoapFault, _Rejected) as e:
+                rejected = isinstance(e, _Rejected) or is_rejection(fault=e)
+                if attempt == 0 and rejected:
+                    self.logger.warning(f"[{user_id}] 서버가 로그인 세션을 거부했습니다 - 다시 로그인 후 재시도")
+                    self._expires.pop(user_id, None)
+                    continue
+                if isinstance(e, SoapFault):
+                    self.logger.error(f"[{user_id}] SOAP Fault: {e.faultcode} - {e.faultstring}")
+                else:
+                    self.logger.error(f"[{user_id}] ✗ 로그인 세션 거부")
+            except asyncio.TimeoutError:
+                self.stats['timeouts'] += 1
+                self.logger.error(f"[{user_id}] ✗ 요청 기한 초과 ({timeout or self.timeout}초)")
+            except CircuitOpenError as e:
+                self.logger.error(f"[{user_id}] ✗ 요청 차단: {e}")
+            except (aiohttp.ClientError, ValueError) as e:
+                self.logger.error(f"[{user_id}] ✗ 요청 실패: {e!r}")
+            self.stats['failed'] += 1
+            return None
+
+    async def get_invoice_payload(self, credentials: dict, encrypted_param: str,
+                                  timeout: Optional[float] = None) -> Optional[bytearray]:
+        """
+        송장 데이터 조회 (응답을 청크 단위로 읽으며 Base64 디코딩)
+
+        Returns:
+            bytearray: 암호화된 송장 데이터 또는 None
+        """
+        async def handle(response):
+            if is_rejection(response.status):
+                raise _Rejected()
+            if response.status not in (200, 500):
+                raise aiohttp.ClientResponseError(
+                    response.request_info, response.history, status=response.status
+                )
+            reader = SELECT_ENC.reader(response.content_length)
+            async for chunk in response.content.iter_chunked(self.chunk_size):
+                reader.feed(chunk)
+            payload = reader.close()
+            if response.status != 200:
+                raise aiohttp.ClientResponseError(
+                    response.request_info, response.history, status=response.status
+                )
+            return payload
+
+        return await self._call(credentials, SELECT_ENC, (encrypted_param,), handle, timeout)
+
+    async def get_invoice_data(self, credentials: dict, encrypted_param: str,
+                               timeout: Optional[float] = None,
+                               tables: Optional[List[str]] = None) -> Optional[List[TableData]]:
+        """
+        송장 데이터 조회 + 복호화
+
+        복호화는 실행기 스레드에서 복호화 풀에 넘기므로 이벤트 루프를 막지 않습니다.
+
+        Returns:
+            list: TableData 목록 또는 None
+        """
+        payload = await self.get_invoice_payload(credentials, encrypted_param, timeout)
+        if payload is None:
+            return None
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, self.decryptor.decrypt, payload, tables)
+        except Exception as e:
+            self.stats['failed'] += 1
+            self.logger.error(f"[{credentials['user_id']}] ✗ 복호화 실패: {e!r}")
+            return None
+
+    async def message_select(self, credentials: dict,
+                             timeout: Optional[float] = None) -> Optional[List[TableData]]:
+        """
+        W_COMM_NTx_Message_Select 호출 (공지/메시지, 서버 시각, 클라이언트 모듈 버전)
+
+        Returns:
+            list: TableData 목록 (DT1~DT5) 또는 None
+        """
+        async def handle(response):
+            body = await response.read()
+            if is_rejection(response.status):
+                raise _Rejected()
+            if response.status == 500:
+                # SOAP Fault면 SoapFault 발생
+                MESSAGE_SELECT.reader().feed(body)
+            if response.status != 200:
+                raise aiohttp.ClientResponseError(
+                    response.request_info, response.history, status=response.status
+                )
+            return MESSAGE_SELECT.decode(body).tables
+
+        args = ([str(credentials['user_id'])],)
+        return await self._call(credentials, MESSAGE_SELECT, args, handle, timeout)
+
+    async def fetch_many(self, jobs: List[Tuple[dict, date, str]], timeout: Optional[float] = None,
+                         tables: Optional[List[str]] = None) -> List[dict]:
+        """
+        여러 계정 / 날짜를 동시에 조회 + 복호화합니다.
+
+        하나가 실패해도 나머지는 계속 진행하며, 이 코루틴이 취소되면
+        진행 중인 모든 조회가 함께 취소됩니다.
+
+        Args:
+            jobs: (계정 정보, 날짜, 조회 파라미터) 목록
+            timeout: 요청별 기한(초)
+            tables: 가져올 테이블 이름 목록
+
+        Returns:
+            list: jobs 순서대로 {'user_id', 'day', 'tables', 'elapsed'} (실패 시 tables는 None)
+        """
+        async def run(credentials, day, param):
+            started = time.perf_counter()
+            try:
+                result = await self.get_invoice_data(credentials, param, timeout, tables)
+            except Exception as e:
+                # 한 작업의 예상치 못한 오류로 나머지 작업이 취소되지 않도록 실패로 처리
+                self.stats['failed'] += 1
+                self.logger.error(f"[{credentials['user_id']}] ✗ {day} 조회 실패: {e!r}")
+                result = None
+            return {
+                'user_id': str(credentials['user_id']),
+                'day': day,
+                'tables': result,
+                'elapsed': round(time.perf_counter() - started, 3),
+            }
+
+        tasks = [asyncio.ensure_future(run(*job)) for job in jobs]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
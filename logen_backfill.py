@@ -0,0 +1,291 @@
+"""
+로젠택배 기간 조회(백필) 모듈
+- 날짜별 조회 파라미터 생성/캐시
+- 제한된 동시 요청 수로 날짜별 병렬 조회
+- 날짜별 체크포인트 (중단 후 재실행 시 이어서 진행)
+- 결과를 하나의 파일로 병합
+"""
+
+import csv
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from logen_decryptor import find_data_table
+from logen_writers import CsvWriter, export_rows, parse_formats
+
+
+def parse_date(value: str, date_format: str = "%Y-%m-%d") -> date:
+    """날짜 문자열(설정의 date_format 또는 YYYYMMDD)을 date로 변환합니다."""
+    for fmt in (date_format, "%Y%m%d"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"날짜 형식이 올바르지 않습니다: {value}")
+
+
+def date_range(start: date, end: date) -> List[date]:
+    """start부터 end까지(포함) 날짜 목록을 반환합니다."""
+    if end < start:
+        raise ValueError(f"종료일이 시작일보다 빠릅니다: {start} ~ {end}")
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+class QueryParamStore:
+    """
+    날짜별 조회 파라미터(bytDataParam) 저장소
+
+    조회 파라미터는 로젠 클라이언트가 암호화해서 만들며 생성 방식은 아직
+    분석되지 않았습니다. 그래서 Fiddler로 캡처한 값을 날짜별로 파일에 모아 두고,
+    생성 함수(builder)가 주어지면 파일에 없는 날짜만 생성하여 저장합니다.
+    한 번 얻은 값은 메모리와 파일에 캐시됩니다.
+
+    파일 형식 (query_params.json):
+        {"<업체아이디>": {"20251031": "Z/nY+cZ3...", ...}}
+
+    Args:
+        path: 파라미터 파일 경로
+        builder: builder(day, user_id) -> str, 파일에 없는 날짜의 파라미터 생성
+    """
+
+    def __init__(self, path, builder: Optional[Callable[[date, str], str]] = None):
+        self.path = Path(path)
+        self.builder = builder
+        self._lock = threading.Lock()
+        self._params: Dict[str, Dict[str, str]] = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._params = json.load(f)
+
+    def _save(self):
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._params, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(self.path)
+
+    def get(self, day: date, user_id: str) -> Optional[str]:
+        """날짜의 조회 파라미터를 반환합니다. 없으면 None"""
+        key = day.strftime("%Y%m%d")
+        with self._lock:
+            param = self._params.get(str(user_id), {}).get(key)
+        if param or self.builder is None:
+            return param
+
+        param = self.builder(day, user_id)
+        if param:
+            self.put(day, user_id, param)
+        return param
+
+    def put(self, day: date, user_id: str, param: str):
+        """날짜의 조회 파라미터를 저장합니다."""
+        with self._lock:
+            self._params.setdefault(str(user_id), {})[day.strftime("%Y%m%d")] = param
+            self._save()
+
+
+class RateLimiter:
+    """초당 요청 수 제한 (요청 간 최소 간격 보장)"""
+
+    def __init__(self, per_second: Optional[float]):
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class BackfillCheckpoint:
+    """
+    백필 체크포인트
+
+    날짜별 완료 상태와 중간 결과 파일을 기록합니다.
+    같은 기간으로 다시 실행하면 완료된 날짜는 건너뜁니다.
+    """
+
+    def __init__(self, folder):
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.path = self.folder / "checkpoint.json"
+        self._lock = threading.Lock()
+        self.days: Dict[str, dict] = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.days = json.load(f).get('days', {})
+
+    def is_done(self, day: date) -> bool:
+        entry = self.days.get(day.strftime("%Y%m%d"))
+        if not entry or entry.get('status') != 'done':
+            return False
+        return not entry.get('file') or (self.folder / entry['file']).exists()
+
+    def mark(self, day: date, **entry):
+        with self._lock:
+            self.days[day.strftime("%Y%m%d")] = entry
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'days': self.days}, f, ensure_ascii=False, indent=2)
+            tmp_path.replace(self.path)
+
+    def part_path(self, day: date) -> Path:
+        return self.folder / f"{day:%Y%m%d}.csv"
+
+
+class BackfillEngine:
+    """
+    기간 조회(백필) 엔진
+
+    Args:
+        downloader: 로그인된 LogenInvoiceDownloader
+        param_store: QueryParamStore
+        max_in_flight: 동시에 진행하는 최대 조회 요청 수
+        requests_per_second: 초당 최대 조회 요청 수 (None이면 제한 없음)
+    """
+
+    def __init__(self, downloader, param_store: QueryParamStore,
+                 max_in_flight: int = 4, requests_per_second: Optional[float] = None):
+        self.downloader = downloader
+        self.param_store = param_store
+        self.max_in_flight = max(1, max_in_flight)
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.logger = downloader.logger
+
+    def _fetch_day(self, day: date, checkpoint: BackfillCheckpoint) -> dict:
+        """하루치 조회 → 복호화 → 중간 파일 저장"""
+        user_id = self.downloader.config['logen_credentials']['user_id']
+        param = self.param_store.get(day, user_id)
+        if not param:
+            raise LookupError(f"{day} 조회 파라미터가 없습니다")
+
+        self.rate_limiter.wait()
+        payload = self.downloader.get_invoice_payload(param)
+        if payload is None:
+            raise RuntimeError(f"{day} 송장 데이터 조회 실패")
+
+        tables = self.downloader.decrypt_data(payload)
+        if tables is None:
+            raise RuntimeError(f"{day} 복호화 실패")
+
+        main_table = find_data_table(tables)
+        if main_table is None:
+            return {'status': 'done', 'rows': 0, 'file': None}
+
+        self.downloader.store_invoices(tables)
+
+        part_path = checkpoint.part_path(day)
+        tmp_path = part_path.with_suffix('.tmp')
+        writer = CsvWriter(tmp_path, main_table.columns)
+        try:
+            writer.write(main_table.rows)
+        finally:
+            writer.close()
+        tmp_path.replace(part_path)
+        return {'status': 'done', 'rows': len(main_table), 'file': part_path.name}
+
+    def run(self, start: date, end: date, checkpoint_folder, output_path,
+            formats: Optional[List[str]] = None) -> dict:
+        """
+        기간 조회를 실행합니다.
+
+        Args:
+            output_path: 병합 파일 경로
+            formats: 병합 파일 저장 형식 목록 (기본값: output_path의 확장자)
+
+        Returns:
+            dict: 요약 (전체/완료/건너뜀/실패 일수, 행 수, 출력 파일)
+        """
+        days = date_range(start, end)
+        checkpoint = BackfillCheckpoint(checkpoint_folder)
+        pending = [day for day in days if not checkpoint.is_done(day)]
+
+        self.logger.info(
+            f"기간 조회: {start} ~ {end} ({len(days)}일, 남은 날짜 {len(pending)}일, "
+            f"동시 요청 {self.max_in_flight}개)"
+        )
+
+        failed = {}
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            futures = {executor.submit(self._fetch_day, day, checkpoint): day for day in pending}
+            for future in as_completed(futures):
+                day = futures[future]
+                try:
+                    entry = future.result()
+                    checkpoint.mark(day, **entry)
+                    self.logger.info(f"✓ {day}: {entry['rows']}건")
+                except Exception as e:
+                    failed[day.strftime("%Y%m%d")] = str(e)
+                    checkpoint.mark(day, status='failed', error=str(e))
+                    self.logger.error(f"✗ {day}: {e}")
+
+        summary = {
+            'days': len(days),
+            'fetched': len(pending) - len(failed),
+            'skipped': len(days) - len(pending),
+            'failed': failed,
+            'rows': 0,
+            'output': None,
+        }
+
+        if failed:
+            self.logger.warning(f"실패한 날짜 {len(failed)}일 - 다시 실행하면 실패한 날짜만 조회합니다")
+            return summary
+
+        summary['rows'], summary['output'] = self.merge(days, checkpoint, output_path, formats)
+        return summary
+
+    def merge(self, days: List[date], checkpoint: BackfillCheckpoint, output_path,
+              formats: Optional[List[str]] = None):
+        """
+        날짜별 중간 파일을 날짜 순서대로 읽으면서 하나의 파일로 병합합니다.
+        (전체를 메모리에 올리지 않고 행을 바로 기록)
+
+        Args:
+            output_path: 병합 파일 경로 (확장자가 저장 형식)
+            formats: 함께 저장할 형식 목록 (기본값: output_path의 확장자)
+
+        Returns:
+            tuple: (행 수, 병합 파일 경로)
+        """
+        output_path = Path(output_path)
+        parts = []
+        for day in days:
+            entry = checkpoint.days.get(day.strftime("%Y%m%d"), {})
+            if entry.get('file'):
+                parts.append(checkpoint.folder / entry['file'])
+
+        if not parts:
+            self.logger.warning("기간 내 데이터가 없습니다")
+            return 0, None
+
+        with open(parts[0], encoding='utf-8-sig', newline='') as f:
+            columns = next(csv.reader(f))
+
+        def rows():
+            for part in parts:
+                with open(part, encoding='utf-8-sig', newline='') as f:
+                    reader = csv.reader(f)
+                    header = next(reader)
+                    if header != columns:
+                        raise ValueError(f"{part.name}의 컬럼 구성이 다른 날짜와 다릅니다")
+                    for row in reader:
+                        yield [value if value != '' else None for value in row]
+
+        formats = formats or parse_formats(output_path.suffix)
+        count, files = export_rows(output_path.with_suffix(''), columns, rows(), formats,
+                                   sheet_name='logen_backfill')
+        paths = [path for fmt in formats for path in files[fmt]]
+        for path in paths:
+            self.logger.info(f"✓ 병합 파일 저장 완료: {path} ({count}건)")
+        return count, paths[0]
@@ -0,0 +1,122 @@
+"""
+로젠택배 .NET(CLR) 연동 유틸리티
+- 로젠 복호화 DLL 로드
+- Python 버퍼 → System.Byte[] 변환 (블록 복사 / 요소 단위 복사)
+"""
+
+import ctypes
+import os
+import sys
+
+# 로젠 클라이언트 DLL 경로
+ILOGEN_DLL_PATH = r'C:\iLOGEN\BIN'
+
+
+def load_encrypt_seed(dll_path: str = ILOGEN_DLL_PATH):
+    """
+    Logen.Framework.BaseUtil.dll을 로드하고 EncryptSeed 인스턴스를 생성합니다.
+
+    DLL이 같은 폴더의 다른 어셈블리를 참조하므로 작업 폴더를 DLL 폴더로
+    변경합니다. 프로세스마다 한 번만 호출하면 됩니다.
+
+    Args:
+        dll_path: 로젠 클라이언트 BIN 폴더
+
+    Returns:
+        Logen.Framework.BaseUtil.EncryptSeed 인스턴스
+    """
+    if dll_path not in sys.path:
+        sys.path.append(dll_path)
+
+    import clr  # noqa: F401
+    from System import Activator
+    from System.Reflection import Assembly
+
+    os.chdir(dll_path)
+    asm = Assembly.LoadFrom(os.path.join(dll_path, 'Logen.Framework.BaseUtil.dll'))
+    encrypt_seed_type = asm.GetType('Logen.Framework.BaseUtil.EncryptSeed')
+    return Activator.CreateInstance(encrypt_seed_type)
+
+
+def _buffer_address(data):
+    """
+    Python 버퍼의 메모리 주소와 주소를 유지하는 참조 객체를 반환합니다.
+
+    bytearray/쓰기 가능한 memoryview는 ctypes 배열로 버퍼를 export하여
+    복사하는 동안 크기가 바뀌지 않도록 고정합니다. bytes는 내부 버퍼를
+    그대로 가리킵니다.
+    """
+    if isinstance(data, bytes):
+        ref = ctypes.c_char_p(data)
+        return ctypes.cast(ref, ctypes.c_void_p).value, ref
+
+    view = memoryview(data)
+    if view.readonly:
+        # 읽기 전용 버퍼(bytes의 memoryview 등)는 주소를 얻을 수 없어 한 번 복사
+        ref = ctypes.c_char_p(view.tobytes())
+        return ctypes.cast(ref, ctypes.c_void_p).value, ref
+
+    if not view.contiguous or view.itemsize != 1:
+        view = view.cast('B')
+    ref = (ctypes.c_char * view.nbytes).from_buffer(view)
+    return ctypes.addressof(ref), ref
+
+
+def to_net_bytes_block(data):
+    """
+    Python 버퍼를 System.Byte[]로 블록 복사합니다.
+
+    `Marshal.Copy(IntPtr, byte[], int, int)`로 한 번에 복사하므로
+    pythonnet이 요소를 하나씩 채우는 것보다 훨씬 빠릅니다.
+
+    Args:
+        data: bytes, bytearray 또는 memoryview
+
+    Returns:
+        System.Byte[]
+    """
+    from System import Array, Byte, IntPtr
+    from System.Runtime.InteropServices import Marshal
+
+    size = memoryview(data).nbytes
+    net_bytes = Array.CreateInstance(Byte, size)
+    if size == 0:
+        return net_bytes
+
+    address, ref = _buffer_address(data)
+    try:
+        Marshal.Copy(IntPtr(address), net_bytes, 0, size)
+    finally:
+        del ref
+    return net_bytes
+
+
+def to_net_bytes_element(data):
+    """Python 버퍼를 System.Byte[]로 요소 단위 복사합니다. (기존 방식)"""
+    from System import Array, Byte
+
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    return Array[Byte](data)
+
+
+def to_net_bytes(data, method: str = "block"):
+    """
+    Python 버퍼를 System.Byte[]로 변환합니다.
+
+    Args:
+        data: bytes, bytearray 또는 memoryview
+        method: "block" (블록 복사, 실패 시 요소 단위로 재시도) 또는 "element"
+
+    Returns:
+        System.Byte[]
+    """
+    if method == "element":
+        return to_net_bytes_element(data)
+    if method != "block":
+        raise ValueError(f"알 수 없는 복사 방식: {method}")
+
+    try:
+        return to_net_bytes_block(data)
+    except Exception:
+        return to_net_bytes_element(data)
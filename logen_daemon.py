@@ -0,0 +1,260 @@
+"""
+로젠택배 송장 상주 실행(데몬) 모듈
+- 프로세스를 띄워 둔 채 정해진 간격으로 조회 (배치 파일 실행마다 반복되던
+  pandas import, CLR/DLL 로드, 로그인을 한 번만 수행)
+- 출고 시간대/요일에만 실행, 실행이 겹치지 않도록 잠금 파일 사용
+- 실행마다 소요 시간과 내보낸 건수를 기록
+"""
+
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_DAEMON = {
+    'interval_minutes': 15,
+    'start': '08:00',
+    'end': '20:00',
+    'weekdays': [0, 1, 2, 3, 4, 5],     # 월~토 (월=0)
+    'incremental': True,
+    'watch': True,
+    'lock_timeout': 1800,
+}
+
+LOCK_FILE_NAME = '.logen_run.lock'
+
+# 통계에 보관하는 최근 실행 수
+_LATENCY_HISTORY = 100
+
+
+def daemon_options(config: dict) -> dict:
+    """config의 daemon 항목에 기본값을 채웁니다."""
+    return {**DEFAULT_DAEMON, **config.get('daemon', {})}
+
+
+class RunLock:
+    """
+    실행 잠금 파일
+
+    상주 실행과 배치 파일 실행(또는 상주 실행 두 개)이 같은 폴더에 동시에
+    내보내지 않도록 합니다. 비정상 종료로 남은 잠금은 timeout초가 지나면 무시합니다.
+
+    Args:
+        path: 잠금 파일 경로
+        timeout: 이 시간(초)보다 오래된 잠금은 남은 잠금으로 보고 해제
+    """
+
+    def __init__(self, path, timeout: float = 1800):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._held = False
+
+    def acquire(self) -> bool:
+        """잠금을 얻으면 True, 다른 실행이 잠금을 가지고 있으면 False"""
+        for _ in range(2):
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._stale():
+                    return False
+                try:
+                    self.path.unlink()
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(fd, 'w') as f:
+                f.write(f"{os.getpid()} {datetime.now():%Y-%m-%d %H:%M:%S}\n")
+            self._held = True
+            return True
+        return False
+
+    def _stale(self) -> bool:
+        try:
+            return time.time() - self.path.stat().st_mtime > self.timeout
+        except FileNotFoundError:
+            return True
+
+    def release(self):
+        if self._held:
+            self._held = False
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def run_lock(config: dict, timeout: Optional[float] = None) -> RunLock:
+    """다운로드 폴더의 실행 잠금"""
+    path = Path(config['paths']['download_folder']) / LOCK_FILE_NAME
+    return RunLock(path, timeout or daemon_options(config)['lock_timeout'])
+
+
+class DownloadDaemon:
+    """
+    상주 실행
+
+    다운로더 인스턴스(복호화 풀, 로그인 세션 포함)를 계속 사용하므로 두 번째
+    실행부터는 조회 요청과 변경분 내보내기 비용만 듭니다.
+
+    조회 파라미터는 실행마다 오늘 날짜로 param_store(query_params.json)에서 찾습니다.
+
+    Args:
+        downloader: LogenInvoiceDownloader
+        param_store: 날짜별 조회 파라미터 저장소 (QueryParamStore)
+        options: daemon 설정 (기본값: config의 daemon 항목)
+        logger: 로거
+        fallback_param: 오늘 날짜의 파라미터가 없을 때 대신 사용할 파라미터 (None이면 조회하지 않음)
+    """
+
+    def __init__(self, downloader, param_store, options: Optional[dict] = None,
+                 logger=None, fallback_param: Optional[str] = None):
+        self.downloader = downloader
+        self.param_store = param_store
+        self.fallback_param = fallback_param
+        self.options = options or daemon_options(downloader.config)
+        self.logger = logger or downloader.logger
+        self.lock = run_lock(downloader.config, self.options['lock_timeout'])
+
+        self.start = datetime.strptime(self.options['start'], '%H:%M').time()
+        self.end = datetime.strptime(self.options['end'], '%H:%M').time()
+        self.weekdays = set(self.options['weekdays'])
+
+        self._stop = threading.Event()
+        self._latencies = deque(maxlen=_LATENCY_HISTORY)
+        self.counters = {'runs': 0, 'succeeded': 0, 'failed': 0,
+                         'outside_hours': 0, 'locked': 0, 'rows': 0}
+
+    def in_window(self, now: Optional[datetime] = None) -> bool:
+        """출고 시간대/요일인지 확인합니다."""
+        now = now or datetime.now()
+        return now.weekday() in self.weekdays and self.start <= now.time() <= self.end
+
+    def warm_up(self):
+        """복호화 백엔드를 로드하고 미리 로그인합니다."""
+        started = time.perf_counter()
+        try:
+            self.downloader.decryptor.warm_up()
+        except Exception as e:
+            self.logger.error(f"✗ 복호화 백엔드 로드 실패: {e}")
+        if self.in_window():
+            self.downloader.login()
+        self.logger.info(f"✓ 상주 실행 준비 완료 ({time.perf_counter() - started:.2f}초)")
+
+    def query_param(self, day: Optional[date] = None) -> Optional[str]:
+        """날짜(기본값: 오늘)의 조회 파라미터, 없으면 fallback_param"""
+        day = day or date.today()
+        user_id = str(self.downloader.config['logen_credentials']['user_id'])
+        param = self.param_store.get(day, user_id)
+        if param:
+            return param
+        if self.fallback_param:
+            self.logger.warning(f"⚠️ {day} 조회 파라미터가 없어 기본 파라미터(test.txt 캡처)로 조회합니다")
+            return self.fallback_param
+        self.logger.error(f"✗ {day} 조회 파라미터가 없습니다 (query_params.json 확인)")
+        return None
+
+    def run_once(self, force: bool = False) -> Optional[bool]:
+        """
+        한 번 조회합니다.
+
+        Args:
+            force: True면 시간대와 관계없이 실행
+
+        Returns:
+            bool: 성공 여부, 실행하지 않았으면 None
+        """
+        if not force and not self.in_window():
+            self.counters['outside_hours'] += 1
+            return None
+        if not self.lock.acquire():
+            self.counters['locked'] += 1
+            self.logger.warning(f"다른 실행이 진행 중이므로 이번 조회를 건너뜁니다 ({self.lock.path})")
+            return None
+
+        started = time.perf_counter()
+        try:
+            encrypted_param = self.query_param()
+            success = encrypted_param is not None and self.downloader.run(
+                encrypted_param,
+                incremental=self.options['incremental'],
+                watch=self.options['watch'],
+            )
+        except Exception as e:
+            self.logger.error(f"✗ 조회 중 오류 발생: {e}")
+            success = False
+        finally:
+            self.lock.release()
+        elapsed = time.perf_counter() - started
+
+        rows = (self.downloader.last_result or {}).get('rows', 0) if success else 0
+        self.counters['runs'] += 1
+        self.counters['succeeded' if success else 'failed'] += 1
+        self.counters['rows'] += rows
+        self._latencies.append(elapsed)
+        self.logger.info(
+            f"{'✓' if success else '✗'} 조회 {self.counters['runs']}회차: "
+            f"{elapsed:.2f}초, 내보낸 송장 {rows}건"
+        )
+        return success
+
+    def stats(self) -> dict:
+        """실행 횟수와 최근 실행 소요 시간(초)"""
+        latencies = list(self._latencies)
+        return {
+            **self.counters,
+            'latency_p50': round(statistics.median(latencies), 3) if latencies else None,
+            'latency_max': round(max(latencies), 3) if latencies else None,
+        }
+
+    def stop(self):
+        """run_forever를 멈춥니다. (다른 스레드에서 호출 가능)"""
+        self._stop.set()
+
+    def run_forever(self):
+        """
+        interval_minutes 간격으로 조회를 반복합니다. stop() 또는 Ctrl+C로 종료합니다.
+
+        조회는 이 스레드에서 실행되므로 조회가 간격보다 오래 걸려도 겹치지 않고,
+        다음 조회는 이전 조회가 끝난 시점부터 간격을 셉니다.
+        """
+        import schedule
+
+        interval = self.options['interval_minutes']
+        scheduler = schedule.Scheduler()
+        scheduler.every(interval).minutes.do(self.run_once)
+
+        self.logger.info(
+            f"상주 실행 시작: {interval}분 간격, {self.options['start']}~{self.options['end']}"
+        )
+        self.warm_up()
+        self.run_once()
+
+        try:
+            while not self._stop.is_set():
+                scheduler.run_pending()
+                idle = scheduler.idle_seconds
+                self._stop.wait(min(max(idle or 0, 0.1), 1.0))
+        finally:
+            self.logger.info(f"상주 실행 종료: {format_daemon_stats(self.stats())}")
+
+
+def format_daemon_stats(stats: dict) -> str:
+    """상주 실행 통계를 한 줄로 표시합니다."""
+    latency = ""
+    if stats['latency_p50'] is not None:
+        latency = f", 소요 시간 중앙값 {stats['latency_p50']:.2f}초 / 최대 {stats['latency_max']:.2f}초"
+    return (
+        f"조회 {stats['runs']}회 (성공 {stats['succeeded']} / 실패 {stats['failed']}), "
+        f"내보낸 송장 {stats['rows']}건, 시간대 외 {stats['outside_hours']}회, "
+        f"잠금으로 건너뜀 {stats['locked']}회{latency}"
+    )
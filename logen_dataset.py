@@ -0,0 +1,199 @@
+"""
+로젠택배 DataSet 변환 모듈
+- 복호화된 .NET DataTable을 행 목록으로 변환
+- 셀 단위(.NET 호출 행×열 회)가 아닌 테이블 단위로 한 번에 추출
+- 암호화되지 않은 SOAP 결과(DataSet XML: 스키마 + diffgram) 파싱
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from typing import List, Optional
+
+
+_XS = '{http://www.w3.org/2001/XMLSchema}'
+_DIFFGR = '{urn:schemas-microsoft-com:xml-diffgram-v1}'
+
+# XmlConvert.EncodeLocalName 으로 인코딩된 컬럼명 (예: "_x0020_")
+_ENCODED_NAME = re.compile(r'_x([0-9A-Fa-f]{4}|[0-9A-Fa-f]{8})_')
+
+
+def _decode_name(name: str) -> str:
+    """XML 요소 이름을 원래 컬럼명으로 복원합니다."""
+    if '_x' not in name:
+        return name
+    return _ENCODED_NAME.sub(lambda m: chr(int(m.group(1), 16)), name)
+
+
+def get_column_names(table) -> List[str]:
+    """DataTable의 컬럼명 목록을 반환합니다."""
+    return [col.ColumnName for col in table.Columns]
+
+
+def _cell_text(value) -> Optional[str]:
+    """셀 값을 문자열로 변환합니다. (빈 값/DBNull은 None)"""
+    if value is None:
+        return None
+    text = str(value)
+    return text if text != '' else None
+
+
+def datatable_to_rows_legacy(table) -> List[list]:
+    """
+    셀 단위로 DataTable을 읽습니다. (기존 방식)
+
+    행마다 모든 컬럼을 `row[컬럼명]`으로 조회하므로
+    .NET 경계를 행×열 만큼 넘나듭니다. 호환성 확인 및 예비 경로용입니다.
+
+    Args:
+        table: System.Data.DataTable
+
+    Returns:
+        list: 행 목록 (빈 값은 None, 나머지는 문자열)
+    """
+    data = []
+    for row in table.Rows:
+        data.append([_cell_text(row[col.ColumnName]) for col in table.Columns])
+    return data
+
+
+def datatable_to_xml(table) -> str:
+    """
+    DataTable 전체를 XML 문자열 하나로 직렬화합니다.
+
+    .NET 쪽에서 `DataTable.WriteXml`로 한 번에 직렬화한 뒤
+    결과 문자열만 Python으로 넘겨받습니다.
+    """
+    import clr  # noqa: F401  (System 네임스페이스 사용 전 CLR 로드)
+    from System.IO import StringWriter
+
+    writer = StringWriter()
+    try:
+        table.WriteXml(writer)
+        return writer.ToString()
+    finally:
+        writer.Dispose()
+
+
+def parse_datatable_xml(xml_text: str, columns: List[str],
+                        table_name: Optional[str] = None) -> List[list]:
+    """
+    `DataTable.WriteXml` 결과를 행 목록으로 파싱합니다.
+
+    Args:
+        xml_text: WriteXml 출력 문자열
+        columns: 컬럼명 목록 (결과 행의 열 순서)
+        table_name: 행 요소 이름 (기본값: 첫 번째 자식 요소 이름)
+
+    Returns:
+        list: 행 목록 (빈 값/DBNull은 None, 나머지는 문자열)
+    """
+    root = ET.fromstring(xml_text)
+    width = len(columns)
+    index = {name: i for i, name in enumerate(columns)}
+    tag_index = {}
+
+    rows = []
+    for row_el in root:
+        if table_name is None:
+            table_name = row_el.tag
+        elif row_el.tag != table_name:
+            continue
+
+        values = [None] * width
+        for cell in row_el:
+            text = cell.text
+            if not text:
+                continue
+            pos = tag_index.get(cell.tag)
+            if pos is None:
+                pos = index.get(_decode_name(cell.tag), -1)
+                tag_index[cell.tag] = pos
+            if pos >= 0:
+                values[pos] = text
+        rows.append(values)
+
+    return rows
+
+
+def datatable_to_rows_bulk(table) -> List[list]:
+    """
+    DataTable을 테이블 단위로 한 번에 읽습니다.
+
+    WriteXml은 DateTime/Boolean 등을 XML 형식(2024-01-02T00:00:00+09:00, true)으로
+    쓰므로, 문자열(System.String)이 아닌 컬럼만 셀 단위로 다시 읽어
+    기존 방식(datatable_to_rows_legacy)과 같은 값을 반환합니다.
+
+    Args:
+        table: System.Data.DataTable
+
+    Returns:
+        list: 행 목록 (빈 값은 None, 나머지는 문자열)
+    """
+    columns = get_column_names(table)
+    if table.Rows.Count == 0:
+        return []
+    rows = parse_datatable_xml(datatable_to_xml(table), columns, table.TableName)
+
+    others = [(i, col.ColumnName) for i, col in enumerate(table.Columns)
+              if col.DataType.FullName != 'System.String']
+    if others:
+        for row, values in zip(table.Rows, rows):
+            for i, name in others:
+                values[i] = _cell_text(row[name])
+    return rows
+
+
+def parse_dataset_xml(result) -> List[tuple]:
+    """
+    SOAP 결과 요소 안의 DataSet(xs:schema + diffgr:diffgram)을 테이블 목록으로 파싱합니다.
+
+    W_COMM_NTx_Message_Select처럼 암호화하지 않은 DataSet을 반환하는
+    메서드의 결과에 사용합니다. (test2.txt 참고)
+
+    Args:
+        result: 결과 요소 (ElementTree Element, 예: <W_COMM_NTx_Message_SelectResult>)
+
+    Returns:
+        list: (테이블 이름, 컬럼명 목록, 행 목록) 튜플 목록 (스키마 순서)
+    """
+    tables = {}
+    schema = result.find(f'{_XS}schema')
+    if schema is not None:
+        for element in schema.iter(f'{_XS}element'):
+            sequence = element.find(f'{_XS}complexType/{_XS}sequence')
+            if sequence is not None:
+                columns = [_decode_name(c.get('name')) for c in sequence.findall(f'{_XS}element')]
+                tables[element.get('name')] = (columns, [])
+
+    diffgram = result.find(f'{_DIFFGR}diffgram')
+    dataset = diffgram[0] if diffgram is not None and len(diffgram) else []
+    for row_el in dataset:
+        if row_el.tag not in tables:
+            # 스키마에 없는 테이블은 첫 행의 요소 순서로 컬럼 구성
+            tables[row_el.tag] = ([_decode_name(cell.tag) for cell in row_el], [])
+        columns, rows = tables[row_el.tag]
+        values = dict.fromkeys(columns)
+        for cell in row_el:
+            if cell.text:
+                values[_decode_name(cell.tag)] = cell.text
+        rows.append([values[name] for name in columns])
+
+    return [(name, columns, rows) for name, (columns, rows) in tables.items()]
+
+
+def parse_dataset_result(xml_data, result_tag: str) -> List[tuple]:
+    """
+    SOAP 응답 전체에서 result_tag 요소를 찾아 DataSet을 파싱합니다.
+
+    Args:
+        xml_data: SOAP 응답 (bytes 또는 str)
+        result_tag: 결과 요소 이름 (네임스페이스 제외)
+
+    Returns:
+        list: (테이블 이름, 컬럼명 목록, 행 목록) 튜플 목록
+    """
+    root = ET.fromstring(xml_data)
+    for element in root.iter():
+        if element.tag == result_tag or element.tag.endswith('}' + result_tag):
+            return parse_dataset_xml(element)
+    raise ValueError(f"응답에서 <{result_tag}> 요소를 찾을 수 없습니다")
@@ -0,0 +1,476 @@
+"""
+로젠택배 복호화 모듈
+- 복호화 백엔드 인터페이스 (.NET DLL / 순수 Python 대체 백엔드)
+- 장기 실행 워커 프로세스 풀 (워커마다 DLL을 한 번만 로드)
+"""
+
+import atexit
+import csv
+import hashlib
+import json
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from logen_clr import ILOGEN_DLL_PATH
+
+# 송장 데이터 테이블 이름 (SetDecrypt 결과 DataSet의 Table 2)
+DATA_TABLE = 'DT6'
+
+# 설정이 없을 때의 복호화 워커 프로세스 수 (0이면 호출한 스레드에서 직접 복호화)
+DEFAULT_DECRYPTOR_WORKERS = 1
+
+
+class TableData:
+    """
+    복호화된 테이블 하나 (프로세스 간 전달 가능한 순수 Python 객체)
+
+    Attributes:
+        name: 테이블 이름 (예: "DT6")
+        columns: 컬럼명 목록
+        rows: 행 목록 (빈 값은 None, 나머지는 문자열)
+    """
+
+    __slots__ = ('name', 'columns', 'rows')
+
+    def __init__(self, name: str, columns: List[str], rows: List[list]):
+        self.name = name
+        self.columns = columns
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __repr__(self):
+        return f"TableData({self.name!r}, {len(self.rows)} rows × {len(self.columns)} columns)"
+
+    def __getstate__(self):
+        return self.name, self.columns, self.rows
+
+    def __setstate__(self, state):
+        self.name, self.columns, self.rows = state
+
+    def batches(self, size: int) -> Iterator[List[list]]:
+        """행을 size개씩 나누어 반환합니다."""
+        for start in range(0, len(self.rows), size):
+            yield self.rows[start:start + size]
+
+    def to_frame(self, typed: bool = False):
+        """
+        pandas DataFrame으로 변환합니다.
+
+        Args:
+            typed: True면 컬럼 형식(logen_schema)에 맞게 숫자/날짜/범주형으로 변환
+        """
+        if typed:
+            from logen_schema import typed_frame
+            return typed_frame(self)
+        import pandas as pd
+        return pd.DataFrame(self.rows, columns=self.columns)
+
+
+def find_data_table(tables: List[TableData], name: str = DATA_TABLE) -> Optional[TableData]:
+    """
+    송장 데이터 테이블을 찾습니다.
+
+    이름이 name인 테이블에 행이 있으면 그 테이블을, 없으면 행이 있는 첫 번째 테이블을 반환합니다.
+    (헤더/요약 테이블에 행이 있어도 송장 테이블을 고르도록)
+    """
+    for table in tables:
+        if table.name == name and len(table) > 0:
+            return table
+    return next((t for t in tables if len(t) > 0), None)
+
+
+class DecryptorBackend:
+    """
+    복호화 백엔드 기본 클래스
+
+    `load()`는 프로세스(워커)마다 한 번 호출되고, 이후 `decrypt()`가
+    반복 호출됩니다. 결과는 프로세스 간 전달이 가능한 TableData 목록입니다.
+    """
+
+    name = None
+
+    def load(self):
+        """백엔드 초기화 (DLL 로드 등)"""
+
+    def decrypt(self, payload, tables: Optional[List[str]] = None) -> List[TableData]:
+        """
+        암호화된 바이트를 복호화합니다.
+
+        Args:
+            payload: 암호화된 바이트 (Base64 디코딩 후)
+            tables: 가져올 테이블 이름 목록 (None이면 전체)
+
+        Returns:
+            list: TableData 목록
+        """
+        raise NotImplementedError
+
+
+class DotNetDecryptor(DecryptorBackend):
+    """로젠 DLL(EncryptSeed.SetDecrypt)을 사용하는 복호화 백엔드"""
+
+    name = 'dotnet'
+
+    def __init__(self, dll_path: str = ILOGEN_DLL_PATH, table_conversion: str = 'bulk',
+                 net_bytes_copy: str = 'block', convert_workers: int = 4):
+        self.dll_path = dll_path
+        self.table_conversion = table_conversion
+        self.net_bytes_copy = net_bytes_copy
+        self.convert_workers = convert_workers
+        self._encrypt_seed = None
+
+    def load(self):
+        from logen_clr import load_encrypt_seed
+        self._encrypt_seed = load_encrypt_seed(self.dll_path)
+
+    def decrypt_dataset(self, payload):
+        """암호화된 바이트를 .NET DataSet으로 복호화합니다."""
+        from logen_clr import to_net_bytes
+
+        if self._encrypt_seed is None:
+            self.load()
+        net_bytes = to_net_bytes(payload, method=self.net_bytes_copy)
+        return self._encrypt_seed.SetDecrypt(net_bytes)
+
+    def convert_table(self, table) -> TableData:
+        """DataTable을 TableData로 변환합니다. (일괄 변환 실패 시 셀 단위로 재시도)"""
+        from logen_dataset import datatable_to_rows_bulk, datatable_to_rows_legacy, get_column_names
+
+        if self.table_conversion == 'legacy':
+            rows = datatable_to_rows_legacy(table)
+        else:
+            try:
+                rows = datatable_to_rows_bulk(table)
+            except Exception:
+                rows = datatable_to_rows_legacy(table)
+        return TableData(table.TableName, get_column_names(table), rows)
+
+    def decrypt(self, payload, tables: Optional[List[str]] = None) -> List[TableData]:
+        dataset = self.decrypt_dataset(payload)
+        selected = []
+        for i in range(dataset.Tables.Count):
+            table = dataset.Tables[i]
+            # 선택하지 않은 테이블은 .NET 경계를 넘겨 변환하지 않음
+            if tables is not None and table.TableName not in tables:
+                continue
+            selected.append(table)
+
+        if self.convert_workers <= 1 or len(selected) <= 1:
+            return [self.convert_table(table) for table in selected]
+
+        # DataTable.WriteXml(.NET, GIL 해제)과 XML 파싱이 테이블 간에 겹치도록 스레드로 변환
+        # (DataTable은 읽기 전용 동시 접근에 안전)
+        with ThreadPoolExecutor(max_workers=min(self.convert_workers, len(selected)),
+                                thread_name_prefix='logen-convert') as executor:
+            return list(executor.map(self.convert_table, selected))
+
+
+class FixtureDecryptor(DecryptorBackend):
+    """
+    순수 Python 대체 복호화 백엔드 (DLL 없이 테스트/벤치마크용)
+
+    - 저장소의 캡처 픽스처(decoded_data.bin → decrypted_data.csv)를
+      SHA-256으로 식별하여 복호화 결과를 돌려줍니다.
+    - `encrypt()`로 만든 대체 페이로드(zlib + JSON)는 그대로 복원합니다.
+
+    Args:
+        fixtures: [(암호화 바이트 파일, 복호화 CSV 파일, 테이블 이름), ...]
+        delay: 복호화 1회당 추가 지연 (초). 워커 풀 스케줄링 확인용
+    """
+
+    name = 'fixture'
+    MAGIC = b'LGNFX1'
+
+    def __init__(self, fixtures: Optional[List[tuple]] = None, delay: float = 0.0):
+        if fixtures is None:
+            root = Path(__file__).parent.absolute()
+            fixtures = [(root / 'decoded_data.bin', root / 'decrypted_data.csv', 'DT6')]
+        self.fixtures = [(Path(p), Path(c), name) for p, c, name in fixtures]
+        self.delay = delay
+        self._by_digest: Dict[str, tuple] = {}
+
+    def load(self):
+        for payload_path, csv_path, table_name in self.fixtures:
+            if payload_path.exists() and csv_path.exists():
+                digest = hashlib.sha256(payload_path.read_bytes()).hexdigest()
+                self._by_digest[digest] = (csv_path, table_name)
+
+    @classmethod
+    def encrypt(cls, tables: List[TableData]) -> bytes:
+        """TableData 목록을 대체 페이로드로 만듭니다. (decrypt의 역연산)"""
+        body = json.dumps(
+            [[t.name, t.columns, t.rows] for t in tables],
+            ensure_ascii=False, separators=(',', ':')
+        ).encode('utf-8')
+        return cls.MAGIC + zlib.compress(body, 1)
+
+    @staticmethod
+    def read_csv(csv_path: Path, table_name: str) -> TableData:
+        """복호화 CSV 픽스처를 TableData로 읽습니다."""
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            columns = next(reader)
+            rows = [[value if value != '' else None for value in row] for row in reader if row]
+        return TableData(table_name, columns, rows)
+
+    def decrypt(self, payload, tables: Optional[List[str]] = None) -> List[TableData]:
+        if self.delay:
+            time.sleep(self.delay)
+
+        payload = bytes(payload)
+        if payload.startswith(self.MAGIC):
+            decoded = json.loads(zlib.decompress(payload[len(self.MAGIC):]).decode('utf-8'))
+            result = [TableData(name, columns, rows) for name, columns, rows in decoded]
+        else:
+            if not self._by_digest:
+                self.load()
+            fixture = self._by_digest.get(hashlib.sha256(payload).hexdigest())
+            if fixture is None:
+                raise ValueError("등록된 픽스처와 일치하지 않는 페이로드입니다")
+            result = [self.read_csv(*fixture)]
+
+        if tables is not None:
+            result = [t for t in result if t.name in tables]
+        return result
+
+
+BACKENDS = {
+    DotNetDecryptor.name: DotNetDecryptor,
+    FixtureDecryptor.name: FixtureDecryptor,
+}
+
+
+def create_backend(name: str, **options) -> DecryptorBackend:
+    """이름으로 복호화 백엔드를 생성합니다."""
+    try:
+        return BACKENDS[name](**options)
+    except KeyError:
+        raise ValueError(f"알 수 없는 복호화 백엔드: {name}")
+
+
+# ---------------------------------------------------------------------------
+# 워커 프로세스
+# ---------------------------------------------------------------------------
+
+_worker_backend: Optional[DecryptorBackend] = None
+
+
+def _init_worker(backend_name: str, backend_options: dict):
+    """워커 프로세스 초기화: 백엔드(DLL)를 한 번만 로드"""
+    global _worker_backend
+    _worker_backend = create_backend(backend_name, **backend_options)
+    _worker_backend.load()
+
+
+def _worker_ready() -> bool:
+    """워커 프로세스가 시작되어 백엔드를 로드했는지 확인 (warm_up용)"""
+    return _worker_backend is not None
+
+
+def _worker_decrypt(payload, tables):
+    return _worker_backend.decrypt(payload, tables)
+
+
+class DecryptorPool:
+    """
+    복호화 워커 풀
+
+    워커 프로세스는 풀이 닫힐 때까지 유지되며, 각 워커는 시작할 때
+    백엔드를 한 번만 로드합니다. 처리 중인 요청이 max_pending 개에
+    도달하면 `submit()`이 자리가 날 때까지 대기합니다(백프레셔).
+
+    Args:
+        backend: 백엔드 이름 ("dotnet" / "fixture")
+        workers: 워커 프로세스 수 (0이면 호출한 스레드에서 직접 복호화)
+        max_pending: 동시에 대기/처리 중인 최대 요청 수 (기본값: workers × 2)
+        backend_options: 백엔드 생성 인자
+    """
+
+    def __init__(self, backend: str = 'dotnet', workers: int = 2,
+                 max_pending: Optional[int] = None, backend_options: Optional[dict] = None):
+        self.backend_name = backend
+        self.workers = workers
+        self.backend_options = backend_options or {}
+        self.max_pending = max_pending or max(workers * 2, 1)
+
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._inline_backend = None
+        self._inline_lock = threading.Lock()
+        self._executor = None
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_time = 0.0
+
+        if workers > 0:
+            # multiprocessing은 워커 풀을 만들 때만 로드
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(backend, self.backend_options)
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _release(self, future: Future):
+        with self._lock:
+            if future.exception() is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+        self._slots.release()
+
+    def submit(self, payload, tables: Optional[List[str]] = None) -> Future:
+        """
+        복호화 요청을 제출합니다.
+
+        Args:
+            payload: 암호화된 바이트
+            tables: 가져올 테이블 이름 목록 (None이면 전체)
+
+        Returns:
+            Future: 결과는 TableData 목록
+        """
+        started = time.perf_counter()
+        self._slots.acquire()
+        with self._lock:
+            self.submitted += 1
+            self.wait_time += time.perf_counter() - started
+
+        if self._executor is None:
+            future = Future()
+            try:
+                # 인라인 백엔드(.NET 객체)는 스레드 간에 순차적으로 사용
+                with self._inline_lock:
+                    result = self._inline().decrypt(payload, tables)
+                future.set_result(result)
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            try:
+                future = self._executor.submit(_worker_decrypt, payload, tables)
+            except Exception:
+                self._slots.release()
+                raise
+
+        future.add_done_callback(self._release)
+        return future
+
+    def _inline(self) -> DecryptorBackend:
+        """인라인 백엔드 (처음 사용할 때 생성/로드, _inline_lock 안에서 호출)"""
+        if self._inline_backend is None:
+            self._inline_backend = create_backend(self.backend_name, **self.backend_options)
+            self._inline_backend.load()
+        return self._inline_backend
+
+    def warm_up(self):
+        """
+        백엔드를 미리 로드합니다. (CLR 초기화 / DLL 로드를 첫 조회 전에 끝냄)
+
+        워커 프로세스는 시작할 때 백엔드를 로드하므로 워커 수만큼 빈 작업을 보내
+        프로세스를 띄웁니다.
+        """
+        if self._executor is None:
+            with self._inline_lock:
+                self._inline()
+            return
+        futures = [self._executor.submit(_worker_ready) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def decrypt(self, payload, tables: Optional[List[str]] = None) -> List[TableData]:
+        """복호화 요청을 제출하고 결과를 기다립니다."""
+        return self.submit(payload, tables).result()
+
+    def map(self, payloads, tables: Optional[List[str]] = None) -> Iterator[List[TableData]]:
+        """
+        여러 페이로드를 순서대로 제출하고, 제출 순서대로 결과를 반환합니다.
+        처리 중인 요청 수는 max_pending을 넘지 않습니다.
+        """
+        pending = []
+        for payload in payloads:
+            while len(pending) >= self.max_pending:
+                yield pending.pop(0).result()
+            pending.append(self.submit(payload, tables))
+        for future in pending:
+            yield future.result()
+
+    def stats(self) -> dict:
+        """풀 상태를 반환합니다."""
+        with self._lock:
+            return {
+                'backend': self.backend_name,
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'in_flight': self.submitted - self.completed - self.failed,
+                'wait_time': round(self.wait_time, 3),
+            }
+
+    def close(self):
+        """워커 프로세스를 종료합니다."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+_shared_pools: Dict[str, DecryptorPool] = {}
+_shared_lock = threading.Lock()
+
+
+def decryptor_options(config: dict) -> dict:
+    """config.json에서 DecryptorPool 생성 인자를 만듭니다."""
+    section = config.get('decryptor', {})
+    settings = config.get('settings', {})
+    backend = section.get('backend', 'dotnet')
+
+    backend_options = dict(section.get('backend_options', {}))
+    if backend == 'dotnet':
+        backend_options.setdefault('dll_path', section.get('dll_path', ILOGEN_DLL_PATH))
+        backend_options.setdefault('table_conversion', settings.get('table_conversion', 'bulk'))
+        backend_options.setdefault('net_bytes_copy', settings.get('net_bytes_copy', 'block'))
+        backend_options.setdefault('convert_workers', section.get('convert_workers', 4))
+
+    return {
+        'backend': backend,
+        'workers': section.get('workers', DEFAULT_DECRYPTOR_WORKERS),
+        'max_pending': section.get('max_pending'),
+        'backend_options': backend_options,
+    }
+
+
+def get_shared_decryptor(config: dict) -> DecryptorPool:
+    """
+    프로세스 전체에서 공유하는 복호화 풀을 반환합니다.
+    같은 설정이면 같은 풀(같은 워커/로드된 DLL)을 재사용합니다.
+    """
+    options = decryptor_options(config)
+    key = json.dumps(options, sort_keys=True, default=str)
+    with _shared_lock:
+        pool = _shared_pools.get(key)
+        if pool is None:
+            pool = DecryptorPool(**options)
+            _shared_pools[key] = pool
+        return pool
+
+
+@atexit.register
+def _close_shared_pools():
+    for pool in _shared_pools.values():
+        pool.close()
+    _shared_pools.clear()
@@ -0,0 +1,352 @@
+"""
+로젠택배 SOAP 대체 서버 (부하 테스트용)
+- W_COMM.asmx / W_FC.asmx(W_FC0073T.asmx) 요청에 Fiddler 캡처 응답을 그대로 돌려줌
+  (W_COMM_NTx_Message_Select: test2.txt, W_FC0073T_NTx_SelectEnc: response.txt)
+- 응답 지연 분포(고정/균등/정규/로그정규), HTTP 오류율, SOAP Fault 비율, 연결 끊김 비율 설정
+- 송장 행 수를 지정하면 캡처 행을 복제한 대체 페이로드(fixture 복호화 백엔드용)로 응답 크기 조절
+- 대역폭 제한으로 큰 응답을 천천히 보내 스트리밍 처리 확인
+
+W_COMM_NTx_LoginEncrypt 응답은 캡처가 없어 형식만 맞춘 응답을 돌려줍니다.
+행 수를 바꾼 응답은 DLL로 복호화할 수 없으므로 config의 decryptor.backend를
+"fixture"로 설정하여 사용합니다. (캡처 그대로 응답할 때도 fixture로 복호화 가능)
+
+사용법:
+    python logen_fake_server.py [--port 8099] [--latency lognormal --latency-ms 300]
+                                [--error-rate 0.02] [--fault-rate 0.01] [--rows 5000]
+
+    config.json의 api_endpoints.base_url을 "http://127.0.0.1:8099"로 바꾸고 다운로더 실행
+    GET /stats 로 메서드별 요청/오류 건수 확인
+"""
+
+import argparse
+import base64
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+from logen_decryptor import FixtureDecryptor, TableData
+from logen_soap_codec import LOGIN_ENCRYPT, MESSAGE_SELECT, NS_COMM, NS_FC, SELECT_ENC
+
+ROOT = Path(__file__).parent.absolute()
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8099
+
+# 로젠 서비스 주소 (config.example.json의 api_endpoints와 캡처의 실제 주소)
+SERVICE_PATHS = {
+    '/iLOGEN.COMM.WebService/W_COMM.asmx': NS_COMM,
+    '/iLOGEN.FC.WebService/W_FC.asmx': NS_FC,
+    '/iLOGEN.FC.WebService/W_FC0073T.asmx': NS_FC,
+}
+
+LATENCY_DISTRIBUTIONS = ('none', 'fixed', 'uniform', 'normal', 'lognormal')
+
+DEFAULT_FAKE_SERVER = {
+    'latency': 'none',          # 응답 지연 분포
+    'latency_ms': 0.0,          # 고정값 / 평균 / 중앙값(로그정규)
+    'latency_jitter_ms': 0.0,   # 균등: ±범위, 정규: 표준편차
+    'latency_sigma': 0.5,       # 로그정규 분포의 sigma
+    'error_rate': 0.0,          # HTTP 오류 응답 비율 (error_status 중 무작위)
+    'error_status': [503],
+    'fault_rate': 0.0,          # SOAP Fault(500) 응답 비율
+    'drop_rate': 0.0,           # 응답 없이 연결을 끊는 비율
+    'rows': None,               # 송장 행 수 (None이면 캡처 그대로)
+    'bandwidth_kbps': 0,        # 응답 전송 속도 제한 (0이면 제한 없음)
+    'seed': None,
+}
+
+# 대역폭 제한 시 한 번에 보내는 크기
+_SEND_CHUNK = 16 * 1024
+
+_ENVELOPE_HEAD = (
+    b'<?xml version="1.0" encoding="utf-8"?>'
+    b'<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/" '
+    b'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+    b'xmlns:xsd="http://www.w3.org/2001/XMLSchema"><soap:Body>'
+)
+_ENVELOPE_TAIL = b'</soap:Body></soap:Envelope>'
+
+
+def soap_response(operation, result: bytes) -> bytes:
+    """operation의 응답 본문 (결과 요소 안에 result를 그대로 넣음)"""
+    name = operation.name.encode('ascii')
+    return (
+        _ENVELOPE_HEAD
+        + b'<' + name + b'Response xmlns="' + operation.namespace.encode('ascii') + b'">'
+        + b'<' + name + b'Result>' + result + b'</' + name + b'Result>'
+        + b'</' + name + b'Response>' + _ENVELOPE_TAIL
+    )
+
+
+def soap_fault(message: str, code: str = 'soap:Server') -> bytes:
+    """ASMX 서비스가 돌려주는 형식의 SOAP Fault"""
+    return (
+        _ENVELOPE_HEAD + b'<soap:Fault>'
+        + f'<faultcode>{code}</faultcode><faultstring>{message}</faultstring>'.encode('utf-8')
+        + b'<detail /></soap:Fault>' + _ENVELOPE_TAIL
+    )
+
+
+def scale_table(table: TableData, rows: int) -> TableData:
+    """캡처 행을 복제하여 rows행으로 늘립니다. 운송장번호/주문번호/순번/차수는 고유하게 바꿉니다."""
+    slip = table.columns.index('SLIP_NO')
+    order = table.columns.index('FIX_TAKE_NO')
+    seq = table.columns.index('SEQ')
+    ord_seq = table.columns.index('ORD_SEQ')
+
+    scaled = []
+    for i in range(rows):
+        row = list(table.rows[i % len(table.rows)])
+        if i >= len(table.rows):
+            row[slip] = f"9{i:010d}"
+            row[order] = f"B{i:015d}"
+            row[seq] = str(i + 1)
+            row[ord_seq] = str(i // 500)
+        scaled.append(row)
+    return TableData(table.name, table.columns, scaled)
+
+
+def _capture_body(path: Path) -> bytes:
+    """Fiddler 캡처 파일에서 응답 본문(XML)만 꺼냅니다."""
+    data = path.read_bytes()
+    response = data.find(b'HTTP/1.1 200')
+    return data[data.index(b'<?xml', max(response, 0)):].rstrip()
+
+
+class FakeLogenService:
+    """
+    응답 생성과 지연/오류 주입
+
+    응답 본문은 시작할 때 한 번 만들어 두고 모든 요청에 같은 바이트를 보냅니다.
+
+    Args:
+        options: DEFAULT_FAKE_SERVER 형식의 설정
+        logger: 로거
+    """
+
+    def __init__(self, options: Optional[dict] = None, logger: Optional[logging.Logger] = None):
+        self.options = {**DEFAULT_FAKE_SERVER, **(options or {})}
+        self.logger = logger or logging.getLogger(__name__)
+        if self.options['latency'] not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"알 수 없는 지연 분포: {self.options['latency']}")
+
+        self.random = random.Random(self.options['seed'])
+        self._random_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.counters = Counter()
+        self.started_at = time.time()
+
+        self.responses = {
+            LOGIN_ENCRYPT.action: soap_response(LOGIN_ENCRYPT, b'Y'),
+            MESSAGE_SELECT.action: _capture_body(ROOT / 'test2.txt'),
+            SELECT_ENC.action: self._select_enc_response(),
+        }
+
+    def _select_enc_response(self) -> bytes:
+        rows = self.options['rows']
+        if rows is None:
+            return _capture_body(ROOT / 'response.txt')
+        table = FixtureDecryptor.read_csv(ROOT / 'decrypted_data.csv', 'DT6')
+        payload = FixtureDecryptor.encrypt([scale_table(table, int(rows))])
+        return soap_response(SELECT_ENC, base64.b64encode(payload))
+
+    def latency(self) -> float:
+        """이번 응답의 지연 시간(초)"""
+        options = self.options
+        kind = options['latency']
+        mean = options['latency_ms']
+        with self._random_lock:
+            if kind == 'none':
+                delay = 0.0
+            elif kind == 'fixed':
+                delay = mean
+            elif kind == 'uniform':
+                delay = self.random.uniform(mean - options['latency_jitter_ms'],
+                                            mean + options['latency_jitter_ms'])
+            elif kind == 'normal':
+                delay = self.random.gauss(mean, options['latency_jitter_ms'])
+            else:
+                delay = mean * self.random.lognormvariate(0.0, options['latency_sigma'])
+        return max(delay, 0.0) / 1000
+
+    def outcome(self) -> str:
+        """이번 응답의 결과: 'drop' / 'error' / 'fault' / 'ok'"""
+        options = self.options
+        with self._random_lock:
+            roll = self.random.random()
+        for outcome in ('drop', 'error', 'fault'):
+            rate = options[f'{outcome}_rate']
+            if roll < rate:
+                return outcome
+            roll -= rate
+        return 'ok'
+
+    def error_status(self) -> int:
+        with self._random_lock:
+            return self.random.choice(self.options['error_status'])
+
+    def count(self, action: str, outcome: str, sent: int = 0):
+        method = action.rsplit('/', 1)[-1] or 'unknown'
+        with self._stats_lock:
+            self.counters[(method, outcome)] += 1
+            self.counters[('bytes', 'sent')] += sent
+
+    def stats(self) -> dict:
+        """메서드별 결과 건수와 보낸 바이트 수"""
+        with self._stats_lock:
+            counters = dict(self.counters)
+        methods = {}
+        for (method, outcome), value in counters.items():
+            if method != 'bytes':
+                methods.setdefault(method, {})[outcome] = value
+        return {
+            'uptime': round(time.time() - self.started_at, 1),
+            'requests': sum(v for (m, _), v in counters.items() if m != 'bytes'),
+            'bytes_sent': counters.get(('bytes', 'sent'), 0),
+            'methods': methods,
+            'options': self.options,
+        }
+
+
+class FakeLogenRequestHandler(BaseHTTPRequestHandler):
+    """로젠 SOAP 대체 서버 HTTP 핸들러 (keep-alive 지원)"""
+
+    protocol_version = 'HTTP/1.1'
+    # 실제 서버는 Server 헤더를 비워서 보냄 (test2.txt)
+    server_version = ''
+    sys_version = ''
+
+    disable_nagle_algorithm = True
+
+    @property
+    def service(self) -> FakeLogenService:
+        return self.server.service
+
+    def _send(self, status: int, body: bytes, content_type: str = 'text/xml; charset=utf-8'):
+        self.send_response(status)
+        self.send_header('Cache-Control', 'private, max-age=0')
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        bandwidth = self.service.options['bandwidth_kbps']
+        if not bandwidth:
+            self.wfile.write(body)
+            return
+        view = memoryview(body)
+        for start in range(0, len(view), _SEND_CHUNK):
+            chunk = view[start:start + _SEND_CHUNK]
+            self.wfile.write(chunk)
+            self.wfile.flush()
+            time.sleep(len(chunk) / (bandwidth * 1024))
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/stats':
+            body = json.dumps(self.service.stats(), ensure_ascii=False).encode('utf-8')
+            self._send(200, body, 'application/json; charset=utf-8')
+        else:
+            self._send(404, b'')
+
+    def do_POST(self):
+        service = self.service
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+
+        action = (self.headers.get('SOAPAction') or '').strip('"')
+        namespace = SERVICE_PATHS.get(urlparse(self.path).path)
+        if namespace is None:
+            service.count(action, 'not_found')
+            self._send(404, b'')
+            return
+        body = service.responses.get(action)
+        if body is None or not action.startswith(namespace):
+            service.count(action, 'unknown_action')
+            self._send(500, soap_fault(
+                f"Server did not recognize the value of HTTP Header SOAPAction: {action}.",
+                'soap:Client',
+            ))
+            return
+
+        time.sleep(service.latency())
+        outcome = service.outcome()
+        if outcome == 'drop':
+            service.count(action, outcome)
+            self.close_connection = True
+            return
+        if outcome == 'error':
+            service.count(action, outcome)
+            self._send(service.error_status(), b'Service Unavailable', 'text/html')
+            return
+        if outcome == 'fault':
+            body = soap_fault("System.Web.Services.Protocols.SoapException: 서버에서 요청을 처리할 수 없습니다.")
+            self._send(500, body)
+        else:
+            self._send(200, body)
+        service.count(action, outcome, len(body))
+
+    def log_message(self, format, *args):
+        self.service.logger.debug("%s - " + format, self.address_string(), *args)
+
+
+def create_server(service: FakeLogenService, host: str = DEFAULT_HOST,
+                  port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """대체 서버를 생성합니다. (serve_forever()로 실행)"""
+    server = ThreadingHTTPServer((host, port), FakeLogenRequestHandler)
+    server.daemon_threads = True
+    server.request_queue_size = 128
+    server.service = service
+    return server
+
+
+def serve(options: Optional[dict] = None, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+          logger: Optional[logging.Logger] = None):
+    """대체 서버를 실행합니다. (Ctrl+C로 종료)"""
+    service = FakeLogenService(options, logger)
+    server = create_server(service, host, port)
+    sizes = ", ".join(f"{action.rsplit('/', 1)[-1]} {len(body):,} bytes"
+                      for action, body in service.responses.items())
+    service.logger.info(f"✓ 로젠 SOAP 대체 서버 시작: http://{host}:{server.server_port} ({sizes})")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        service.logger.info(f"대체 서버 종료: {json.dumps(service.stats()['methods'], ensure_ascii=False)}")
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로젠택배 SOAP 대체 서버 (부하 테스트용)")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--latency', choices=LATENCY_DISTRIBUTIONS, default='none', help="응답 지연 분포")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="고정값 / 평균 / 중앙값(로그정규)")
+    parser.add_argument('--latency-jitter-ms', type=float, default=0.0, help="균등: ±범위, 정규: 표준편차")
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help="로그정규 분포의 sigma")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="HTTP 오류 응답 비율 (0~1)")
+    parser.add_argument('--error-status', type=int, nargs='+', default=[503], help="HTTP 오류 상태 코드")
+    parser.add_argument('--fault-rate', type=float, default=0.0, help="SOAP Fault 응답 비율 (0~1)")
+    parser.add_argument('--drop-rate', type=float, default=0.0, help="연결 끊김 비율 (0~1)")
+    parser.add_argument('--rows', type=int, help="송장 행 수 (지정하지 않으면 캡처 그대로)")
+    parser.add_argument('--bandwidth-kbps', type=int, default=0, help="응답 전송 속도 제한 (KB/s)")
+    parser.add_argument('--seed', type=int, help="난수 시드 (재현용)")
+    parser.add_argument('--verbose', action='store_true', help="요청마다 로그 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+    )
+    options = {key: getattr(args, key) for key in DEFAULT_FAKE_SERVER}
+    serve(options, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,41 +5,85 @@
 - 엑셀 파일로 저장
 """
 
-import os
+import argparse
 import json
 import logging
 import base64
-import re
+import threading
 from datetime import datetime
 from pathlib import Path
-import requests
-import pandas as pd
-import clr
-import sys
-
-# .NET DLL 경로 추가
-ILOGEN_DLL_PATH = r'C:\iLOGEN\BIN'
-sys.path.append(ILOGEN_DLL_PATH)
-
-from System.Reflection import Assembly
-from System import Array, Byte, Activator
-from password_manager import PasswordManager
+from logen_backfill import BackfillEngine, QueryParamStore, parse_date
+from logen_clr import ILOGEN_DLL_PATH  # noqa: F401  (기존 import 호환)
+from logen_daemon import run_lock
+from logen_decryptor import TableData, find_data_table, get_shared_decryptor
+from logen_layouts import get_layout
+from logen_logging import setup_logging
+from logen_metrics import NULL_SPAN, RunMetrics, format_run_metrics, get_metrics_recorder
+from logen_multi_account import MultiAccountRunner, format_summary
+from logen_stage_cache import StageCache, describe_checkpoint, stage_cache_options
+from logen_session import DEFAULT_SESSION_TTL, format_session_stats, get_session_cache, is_rejection
+from logen_store import InvoiceStore, SUMMARY_COLUMNS
+from logen_sync import IncrementalSync, SyncStateStore
+from logen_soap_codec import LOGIN_ENCRYPT, SELECT_ENC
+from logen_soap_stream import DEFAULT_CHUNK_SIZE, SoapFault
+from logen_watch import ChangeDetector, format_watch_stats
+from logen_writers import (
+    EXCEL_MAX_ROWS, available_formats, export_options, export_tables, frame_rows, parse_formats
+)
+
+
+class AccountLogAdapter(logging.LoggerAdapter):
+    """여러 계정 동시 실행 시 로그에 업체 아이디 표시"""
+
+    def process(self, msg, kwargs):
+        return f"[{self.extra['account']}] {msg}", kwargs
 
 
 class LogenInvoiceDownloader:
     """로젠택배 송장 다운로더"""
 
-    def __init__(self, config_path: str = None):
-        """초기화"""
+    def __init__(self, config_path: str = None, decryptor=None, credentials: dict = None):
+        """
+        초기화
+
+        Args:
+            config_path: config.json 파일 경로 (기본값: 스크립트와 같은 폴더)
+            decryptor: 복호화 풀 (기본값: 프로세스 공유 풀)
+            credentials: 계정 정보 (여러 계정 동시 실행 시 logen_credentials 대신 사용,
+                비밀번호도 계정별 파일에서 읽음)
+        """
         if config_path is None:
-            script_dir = Path(__file__).parent.absolute()
-            config_path = script_dir / "config.json"
+            config_path = default_config_path()
 
         self.config_path = Path(config_path)
         self.config = self._load_config()
-        self.session = requests.Session()
+        self.account = None
+        # 기본 계정(logen_credentials)의 비밀번호는 .password에 저장됨
+        self._primary_user_id = str(self.config.get('logen_credentials', {}).get('user_id', ''))
+        if credentials:
+            self.config['logen_credentials'] = {**self.config.get('logen_credentials', {}), **credentials}
+            self.account = str(credentials['user_id'])
+
+        # 로그인 세션은 같은 계정의 다운로더끼리 프로세스 안에서 공유
+        self.sessions = get_session_cache()
+        self.session_key = (self.config['api_endpoints']['base_url'],
+                            str(self.config['logen_credentials']['user_id']))
+        self.session_ttl = self.config['settings'].get('session_ttl', DEFAULT_SESSION_TTL)
+        self.session = self.sessions.session(self.session_key)
+        self.last_result = None
+        self.last_metrics = None
+        self.metrics_recorder = get_metrics_recorder(self.config)
+        self._metrics = None
+        self._sync = None
+        self._detectors = {}
+        self._cache = None
+        self._cache_lock = threading.Lock()
+        self._store = None
+        self._store_lock = threading.Lock()
         self._setup_logging()
-        self._setup_decryptor()
+        from logen_transport import SoapTransport
+        self.transport = SoapTransport(self.session, self.config, self.logger)
+        self._setup_decryptor(decryptor)
 
     def _load_config(self):
         """설정 파일 로드"""
@@ -59,98 +103,193 @@ class LogenInvoiceDownloader:
             )
 
     def _setup_logging(self):
-        """로깅 설정"""
-        log_folder = Path(self.config['paths']['log_folder'])
-        log_file = log_folder / f"logen_{datetime.now():%Y%m%d}.log"
-
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s [%(levelname)s] %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
-
-    def _setup_decryptor(self):
-        """복호화 DLL 로드"""
+        """로깅 설정 (파일/콘솔 쓰기는 백그라운드 스레드에서 처리)"""
+        self.logger = setup_logging(self.config, __name__)
+        if self.account:
+            self.logger = AccountLogAdapter(self.logger, {'account': self.account})
+
+    def _setup_decryptor(self, decryptor=None):
+        """
+        복호화 풀 준비
+
+        DLL은 풀의 워커 프로세스(workers=0이면 이 프로세스)에서
+        한 번만 로드되며, 같은 설정의 다운로더끼리 풀을 공유합니다.
+        """
         try:
-            os.chdir(ILOGEN_DLL_PATH)
-            asm = Assembly.LoadFrom(os.path.join(ILOGEN_DLL_PATH, 'Logen.Framework.BaseUtil.dll'))
-            encrypt_seed_type = asm.GetType('Logen.Framework.BaseUtil.EncryptSeed')
-            self.decryptor = Activator.CreateInstance(encrypt_seed_type)
-            self.logger.info("복호화 DLL 로드 성공")
+            self.decryptor = decryptor or get_shared_decryptor(self.config)
+            self.logger.info(
+                f"복호화 풀 준비: {self.decryptor.backend_name} "
+                f"(workers={self.decryptor.workers})"
+            )
         except Exception as e:
-            self.logger.error(f"복호화 DLL 로드 실패: {e}")
+            self.logger.error(f"복호화 풀 생성 실패: {e}")
             raise
 
-    def _soap_request(self, url: str, soap_action: str, soap_body: str):
-        """SOAP 요청"""
-        soap_envelope = f'''<?xml version="1.0" encoding="utf-8"?>
-<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"
-               xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-               xmlns:xsd="http://www.w3.org/2001/XMLSchema">
-    <soap:Body>
-        {soap_body}
-    </soap:Body>
-</soap:Envelope>'''
-
-        headers = {
-            'Content-Type': 'text/xml; charset=utf-8',
-            'SOAPAction': f'"{soap_action}"',
-            'User-Agent': 'Mozilla/4.0 (compatible; MSIE 6.0; MS Web Services Client Protocol 2.0.50727.9179)'
-        }
+    def _soap_request(self, operation, *args):
+        """
+        SOAP 요청
+
+        Args:
+            operation: logen_soap_codec의 SOAP 메서드 선언
+            *args: 메서드 파라미터 값
+
+        Returns:
+            str: 응답 XML 또는 None
+        """
+        import requests
 
         try:
-            response = self.session.post(
-                url,
-                data=soap_envelope.encode('utf-8'),
-                headers=headers,
-                timeout=self.config['settings']['timeout']
+            data = operation.encode(*args)
+            response = self.transport.post(
+                operation.url(self.config),
+                data=data,
+                headers=operation.headers,
+                idempotent=operation.idempotent
             )
+            self._span().add(bytes_in=len(response.content), bytes_out=len(data))
 
             if response.status_code == 200:
                 return response.text
             else:
                 self.logger.error(f"SOAP 요청 실패: {response.status_code}")
-                self.logger.error(f"응답 내용: {response.text}")
+                self.logger.error("응답 내용: %.500s", response.text)
+                if is_rejection(response.status_code):
+                    self.sessions.invalidate(self.session_key)
                 return None
 
         except requests.exceptions.RequestException as e:
             self.logger.error(f"네트워크 오류: {e}")
             return None
 
+    def _soap_request_stream(self, operation, *args):
+        """
+        SOAP 요청 (스트리밍 응답)
+
+        응답 본문을 청크 단위로 읽으며 결과 요소의 Base64 값을
+        바로 디코딩합니다. 응답 전체를 문자열로 만들지 않습니다.
+
+        Args:
+            operation: 결과가 Base64인 SOAP 메서드 선언
+            *args: 메서드 파라미터 값
+
+        Returns:
+            bytearray: 디코딩된 결과 또는 None
+        """
+        import requests
+
+        chunk_size = self.config['settings'].get('stream_chunk_size', DEFAULT_CHUNK_SIZE)
+
+        try:
+            data = operation.encode(*args)
+            response = self.transport.post(
+                operation.url(self.config),
+                data=data,
+                headers=operation.headers,
+                idempotent=operation.idempotent,
+                stream=True
+            )
+            span = self._span()
+            span.add(bytes_out=len(data))
+
+            with response:
+                # SOAP Fault는 HTTP 500으로 전달되므로 본문을 파싱해 본다
+                if response.status_code not in (200, 500):
+                    self.logger.error(f"SOAP 요청 실패: {response.status_code}")
+                    if is_rejection(response.status_code):
+                        self.sessions.invalidate(self.session_key)
+                    return None
+
+                content_length = response.headers.get('Content-Length')
+                size_hint = int(content_length) if content_length and content_length.isdigit() else None
+
+                payload = operation.decode_stream(
+                    self._count_bytes(response.iter_content(chunk_size=chunk_size), span),
+                    size_hint
+                ).payload
+
+                if response.status_code != 200:
+                    self.logger.error(f"SOAP 요청 실패: {response.status_code}")
+                    return None
+
+                return payload
+
+        except SoapFault as e:
+            self.logger.error(f"SOAP Fault: {e.faultcode} - {e.faultstring}")
+            if e.detail:
+                self.logger.error(f"Fault 상세: {e.detail}")
+            if is_rejection(fault=e):
+                self.sessions.invalidate(self.session_key)
+            return None
+        except ValueError as e:
+            self.logger.error(f"응답 파싱 실패: {e}")
+            return None
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"네트워크 오류: {e}")
+            return None
+
+    @staticmethod
+    def _count_bytes(chunks, span):
+        """응답 본문 청크를 그대로 넘기며 받은 바이트 수를 단계에 더합니다."""
+        for chunk in chunks:
+            span.add(bytes_in=len(chunk))
+            yield chunk
+
+    def _span(self, name: str = None):
+        """
+        실행(run) 중이면 단계 측정, 아니면 기록하지 않는 단계
+
+        Args:
+            name: 새 단계 이름 (None이면 진행 중인 단계)
+        """
+        if self._metrics is None:
+            return NULL_SPAN
+        if name is None:
+            return self._metrics.current
+        return self._metrics.span(name)
+
     def login(self):
-        """로그인"""
+        """
+        로그인 (세션 캐시 사용)
+
+        같은 계정의 로그인 세션이 유효하면 다시 로그인하지 않습니다.
+        세션 유효 시간은 settings.session_ttl(초, 0이면 매번 로그인)입니다.
+        """
+        reused = self.sessions.is_valid(self.session_key)
+        success = self.sessions.ensure(self.session_key, self._login, self.session_ttl)
+        if success and reused:
+            self.logger.info("✓ 로그인 세션 재사용")
+        self._span().add(session_reused=reused)
+        return success
+
+    def _load_password(self):
+        """저장된 비밀번호 복호화 (cryptography는 이때 로드)"""
+        from password_manager import PasswordManager
+        account = None if self.account == self._primary_user_id else self.account
+        return PasswordManager(account=account).load_password()
+
+    def _login(self):
+        """로그인 요청"""
         try:
             credentials = self.config['logen_credentials']
-            api_config = self.config['api_endpoints']
 
-            # 저장된 비밀번호 로드
-            pm = PasswordManager()
-            password = pm.load_password()
+            # 저장된 비밀번호 로드 (프로세스에서 한 번만 복호화)
+            password = self.sessions.password(
+                self.session_key, self._load_password
+            )
 
             if not password:
                 self.logger.error("저장된 비밀번호가 없습니다.")
                 self.logger.error("먼저 'run_logen.bat'을 실행하여 비밀번호를 설정하세요.")
                 return False
 
-            login_url = f"{api_config['base_url']}{api_config['login_soap']}"
-            soap_action = "http://ilogen.ilogen.com/iLOGEN.COMM.WebService/W_COMM_NTx_LoginEncrypt"
-
-            self.logger.info(f"로그인 시도: {login_url}")
-
-            soap_body = f'''<W_COMM_NTx_LoginEncrypt xmlns="http://ilogen.ilogen.com/iLOGEN.COMM.WebService/">
-            <arrParam>
-                <string>{credentials['user_id']}</string>
-                <string>{password}</string>
-                <string>{credentials['ip_address']}</string>
-                <string>{credentials['mac_address']}</string>
-            </arrParam>
-        </W_COMM_NTx_LoginEncrypt>'''
+            self.logger.info(f"로그인 시도: {LOGIN_ENCRYPT.url(self.config)}")
 
-            response_xml = self._soap_request(login_url, soap_action, soap_body)
+            response_xml = self._soap_request(LOGIN_ENCRYPT, [
+                credentials['user_id'],
+                password,
+                credentials['ip_address'],
+                credentials['mac_address'],
+            ])
 
             if response_xml:
                 self.logger.info("✓ 로그인 성공")
@@ -163,20 +302,27 @@ class LogenInvoiceDownloader:
             self.logger.error(f"✗ 로그인 중 오류 발생: {e}")
             return False
 
+    def _with_relogin(self, fetch, *args):
+        """
+        세션이 유효한 상태에서 서버가 호출을 거부하면 다시 로그인한 뒤 한 번 더 호출합니다.
+        """
+        was_valid = self.sessions.is_valid(self.session_key)
+        result = fetch(*args)
+        if result is None and was_valid and not self.sessions.is_valid(self.session_key):
+            self.logger.warning("서버가 로그인 세션을 거부했습니다 - 다시 로그인 후 재시도")
+            if self.login():
+                result = fetch(*args)
+        return result
+
     def get_invoice_data(self, encrypted_param: str):
         """송장 데이터 조회"""
-        try:
-            api_config = self.config['api_endpoints']
-            data_url = f"{api_config['base_url']}{api_config['data_soap']}"
-            soap_action = "http://ilogen.ilogen.com/iLOGEN.FC.WebService/W_FC0073T_NTx_SelectEnc"
+        return self._with_relogin(self._get_invoice_data, encrypted_param)
 
+    def _get_invoice_data(self, encrypted_param: str):
+        try:
             self.logger.info("송장 데이터 조회 중...")
 
-            soap_body = f'''<W_FC0073T_NTx_SelectEnc xmlns="http://ilogen.ilogen.com/iLOGEN.FC.WebService/">
-            <bytDataParam>{encrypted_param}</bytDataParam>
-        </W_FC0073T_NTx_SelectEnc>'''
-
-            response_xml = self._soap_request(data_url, soap_action, soap_body)
+            response_xml = self._soap_request(SELECT_ENC, encrypted_param)
 
             if response_xml:
                 self.logger.info("✓ 송장 데이터 조회 성공")
@@ -189,142 +335,879 @@ class LogenInvoiceDownloader:
             self.logger.error(f"✗ 데이터 조회 중 오류 발생: {e}")
             return None
 
-    def decrypt_data(self, encrypted_base64: str):
+    def get_invoice_payload(self, encrypted_param: str):
+        """송장 데이터 조회 (스트리밍, 디코딩된 암호화 바이트 반환)"""
+        return self._with_relogin(self._get_invoice_payload, encrypted_param)
+
+    def _get_invoice_payload(self, encrypted_param: str):
+        try:
+            self.logger.info("송장 데이터 조회 중 (스트리밍)...")
+
+            payload = self._soap_request_stream(SELECT_ENC, encrypted_param)
+
+            if payload is not None:
+                self.logger.info(f"✓ 송장 데이터 조회 성공: {len(payload)} bytes")
+                return payload
+            else:
+                self.logger.error("✗ 송장 데이터 조회 실패")
+                return None
+
+        except Exception as e:
+            self.logger.error(f"✗ 데이터 조회 중 오류 발생: {e}")
+            return None
+
+    def decrypt_data(self, encrypted_data):
         """데이터 복호화"""
         try:
             self.logger.info("데이터 복호화 중...")
 
-            # Base64 디코딩
-            encrypted_bytes = base64.b64decode(encrypted_base64)
-            self.logger.info(f"Base64 디코딩 완료: {len(encrypted_bytes)} bytes")
-
-            # .NET byte array로 변환
-            net_bytes = Array[Byte](encrypted_bytes)
+            # Base64 디코딩 (스트리밍 조회 결과는 이미 디코딩된 바이트)
+            if isinstance(encrypted_data, str):
+                encrypted_bytes = base64.b64decode(encrypted_data)
+                self.logger.info(f"Base64 디코딩 완료: {len(encrypted_bytes)} bytes")
+            else:
+                encrypted_bytes = encrypted_data
 
-            # 복호화
-            dataset = self.decryptor.SetDecrypt(net_bytes)
+            # 복호화 (워커에서 DataSet → 테이블 변환까지 수행, export.tables에 없는 테이블은 변환하지 않음)
+            tables = self.decryptor.decrypt(encrypted_bytes, export_options(self.config)['tables'])
 
-            self.logger.info(f"✓ 복호화 완료: {dataset.Tables.Count}개 테이블")
+            self.logger.info(
+                f"✓ 복호화 완료: {len(tables)}개 테이블 "
+                f"({', '.join(f'{t.name} {len(t)}행' for t in tables)})"
+            )
 
-            return dataset
+            return tables
 
         except Exception as e:
             self.logger.error(f"✗ 복호화 실패: {e}")
             return None
 
-    def save_to_excel(self, dataset, filename: str = None):
-        """DataSet을 엑셀로 저장"""
+    def find_main_table(self, tables):
+        """송장 데이터 테이블 찾기 (DT6, 없으면 데이터가 있는 첫 번째 테이블)"""
+        table = find_data_table(tables)
+        if table is not None:
+            self.logger.info(f"데이터 테이블 발견: {table.name} ({len(table)} rows)")
+            return table
+
+        self.logger.error("데이터가 없습니다")
+        return None
+
+    def output_formats(self):
+        """저장 형식 목록 (settings.download_format, 설치되지 않은 라이브러리가 필요한 형식은 제외)"""
+        formats = parse_formats(self.config['settings'].get('download_format'))
+        return available_formats(formats, self.logger) or ['xlsx']
+
+    def save_to_excel(self, tables, filename: str = None):
+        """
+        복호화된 테이블을 모두 설정된 형식(settings.download_format)으로 저장
+
+        데이터 테이블(DT6)을 첫 번째 시트/파일로, 나머지 테이블(헤더, 요약 등)은
+        export.layout에 따라 같은 엑셀 파일의 시트 또는 별도 파일로 저장합니다.
+        """
+        try:
+            main_table = self.find_main_table(tables)
+            if not main_table:
+                return None
+
+            options = export_options(self.config)
+            others = [t for t in tables if t is not main_table and (len(t) or options['include_empty'])]
+            skipped = [t.name for t in tables if t is not main_table and t not in others]
+            if skipped:
+                self.logger.info(f"행이 없는 테이블은 저장하지 않습니다: {', '.join(skipped)}")
+
+            # 레이아웃(export.column_layout)이 있으면 필요한 컬럼만 골라 머리글/마스킹 적용
+            layout = self._export_layout(main_table.columns)
+            if layout is None:
+                # DataFrame으로 바꾸지 않고 행을 바로 기록
+                return self.save_tables([main_table] + others, filename, options=options)
+
+            return self.save_tables([layout.convert(main_table)] + others, filename, options=options,
+                                    totals_rows=layout.totals_rows)
+
+        except Exception as e:
+            self.logger.error(f"✗ 엑셀 저장 실패: {e}")
+            return None
+
+    def _export_layout(self, columns):
+        """내보내기 레이아웃 (export.column_layout, "raw"면 None)"""
+        layout = get_layout(self.config)
+        if layout is not None:
+            missing = layout.missing_columns(columns)
+            if missing:
+                self.logger.warning(
+                    f"{layout.name} 레이아웃에 필요한 컬럼이 없어 빈 값으로 저장합니다: {', '.join(missing)}"
+                )
+        return layout
+
+    def save_frame(self, df, filename: str = None, prefix: str = "logen_invoices"):
+        """DataFrame을 설정된 형식으로 저장"""
+        return self.save_rows(list(df.columns), frame_rows(df), filename, prefix)
+
+    def save_rows(self, columns, rows, filename: str = None, prefix: str = "logen_invoices"):
+        """
+        행을 설정된 형식으로 저장 (한 번 순회하면서 모든 형식을 바로 기록)
+
+        Args:
+            columns: 컬럼명 목록
+            rows: 행 목록 또는 제너레이터 (빈 값은 None)
+            filename: 파일 이름 (확장자를 붙이면 그 형식으로만 저장)
+            prefix: 파일 이름 앞부분 (filename이 없을 때)
+
+        Returns:
+            str: 저장된 파일 경로 (여러 형식이면 첫 번째 형식), 실패 시 None
+        """
+        return self.save_tables([TableData(prefix, list(columns), rows)], filename, prefix)
+
+    def save_tables(self, tables, filename: str = None, prefix: str = "logen_invoices",
+                    options: dict = None, totals_rows: int = 0):
+        """
+        테이블 목록을 설정된 형식으로 저장 (테이블별 파일은 동시에 기록)
+
+        Args:
+            tables: TableData 목록 (첫 번째 테이블이 기본 파일 이름을 사용)
+            filename: 파일 이름 (확장자를 붙이면 그 형식으로만 저장)
+            prefix: 파일 이름 앞부분 (filename이 없을 때)
+            options: export 설정 (기본값: config의 export 항목)
+            totals_rows: 첫 번째 테이블 끝의 합계 행 수 (송장 수/성능 기록에서 제외)
+
+        Returns:
+            str: 첫 번째 테이블의 저장 파일 경로 (여러 형식이면 첫 번째 형식), 실패 시 None
+        """
         try:
+            options = options or export_options(self.config)
+            formats = self.output_formats()
             if filename is None:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"logen_invoices_{timestamp}.xlsx"
+                if self.account:
+                    filename = f"{prefix}_{self.account}_{timestamp}"
+                else:
+                    filename = f"{prefix}_{timestamp}"
+            elif Path(filename).suffix:
+                formats = parse_formats(Path(filename).suffix)
+                filename = Path(filename).stem
 
             download_folder = Path(self.config['paths']['download_folder'])
-            file_path = download_folder / filename
+            max_rows = self.config['settings'].get('excel_max_rows', EXCEL_MAX_ROWS)
+
+            with self._span('write') as span:
+                counts, files = export_tables(
+                    download_folder / filename, tables, formats,
+                    layout=options['layout'], max_rows=max_rows, workers=options['workers']
+                )
+                paths = list(dict.fromkeys(
+                    path for table in tables for fmt in formats for path in files[table.name][fmt]
+                ))
+                main_table = tables[0]
+                # 레이아웃 합계 행은 송장 수에서 제외
+                counts[main_table.name] -= totals_rows
+                span.shape(counts[main_table.name], len(main_table.columns))
+                span.add(bytes_out=sum(Path(path).stat().st_size for path in paths),
+                         tables=len(tables))
+            first = files[main_table.name][formats[0]][0]
+            self.last_result = {
+                'file': first,
+                'rows': counts[main_table.name],
+                'files': paths,
+                'tables': counts,
+            }
+
+            for path in paths:
+                self.logger.info(f"✓ 파일 저장 완료: {path}")
+            if len(files[main_table.name].get('xlsx', [])) > 1:
+                self.logger.info(
+                    f"엑셀 행 수 제한({max_rows:,}행)을 넘어 "
+                    f"{len(files[main_table.name]['xlsx'])}개 파일로 나누어 저장했습니다"
+                )
+            return first
+
+        except Exception as e:
+            self.logger.error(f"✗ 파일 저장 실패: {e}")
+            return None
 
-            # 데이터가 있는 테이블 찾기 (보통 Table 2 - DT6)
-            main_table = None
-            for i in range(dataset.Tables.Count):
-                table = dataset.Tables[i]
-                if table.Rows.Count > 0:
-                    main_table = table
-                    self.logger.info(f"데이터 테이블 발견: {table.TableName} ({table.Rows.Count} rows)")
-                    break
+    def store_invoices(self, tables):
+        """복호화된 DT6 데이터를 송장 저장소(SQLite)에 누적 저장"""
+        if not self.config['settings'].get('store_invoices', True):
+            return 0
 
-            if not main_table:
-                self.logger.error("데이터가 없습니다")
-                return None
+        try:
+            main_table = find_data_table(tables)
+            if main_table is None:
+                return 0
 
-            # DataFrame으로 변환
-            data = []
-            columns = [col.ColumnName for col in main_table.Columns]
+            with self._store_lock:
+                if self._store is None:
+                    self._store = InvoiceStore(invoice_db_path(self.config))
+            count = self._store.upsert_table(main_table, account=self.config['logen_credentials']['user_id'])
+            self.logger.info(f"✓ 송장 저장소 반영: {count}건")
+            return count
 
-            for row in main_table.Rows:
-                row_data = []
-                for col in main_table.Columns:
-                    value = row[col.ColumnName]
-                    if value is None or str(value) == '':
-                        row_data.append(None)
-                    else:
-                        row_data.append(str(value))
-                data.append(row_data)
+        except Exception as e:
+            # 저장소 반영 실패는 다운로드 결과에 영향 없음
+            self.logger.warning(f"송장 저장소 반영 실패: {e}")
+            return 0
 
-            df = pd.DataFrame(data, columns=columns)
+    def _sync_state(self):
+        """증분 동기화 상태 저장소 (계정별 파일)"""
+        if self._sync is None:
+            default = Path(self.config['paths']['download_folder']) / "sync_state.db"
+            path = Path(self.config['paths'].get('sync_state_db', default))
+            if self.account:
+                path = path.with_name(f"{path.stem}_{self.account}{path.suffix}")
+            self._sync = IncrementalSync(SyncStateStore(path))
+        return self._sync
+
+    def export_incremental(self, tables):
+        """
+        새 송장/재출력 송장만 엑셀로 저장
+
+        Returns:
+            str: 저장된 파일 경로, 변경분이 없으면 "" , 실패 시 None
+        """
+        main_table = self.find_main_table(tables)
+        if not main_table:
+            return None
 
-            # 엑셀로 저장
-            df.to_excel(file_path, index=False, engine='openpyxl')
+        sync = self._sync_state()
+        with self._span('frame') as span:
+            # typed_frames: 숫자/날짜/범주형 컬럼으로 변환 (메모리 절약, 엑셀에는 숫자/날짜로 저장)
+            df = main_table.to_frame(typed=export_options(self.config)['typed_frames'])
+            span.shape(len(df), len(df.columns))
+        with self._span('delta') as span:
+            delta, stats = sync.delta(df)
+            span.shape(len(delta), len(delta.columns))
+        self.logger.info(
+            f"증분 동기화: 전체 {stats['total']}건 / 신규 {stats['new']}건 / "
+            f"재출력 {stats['reprinted']}건 / 변경 없음 {stats['unchanged']}건"
+        )
 
-            self.logger.info(f"✓ 엑셀 파일 저장 완료: {file_path}")
-            return str(file_path)
+        if delta.empty:
+            self.last_result = {'file': None, 'rows': 0}
+            self.logger.info("새로 내보낼 송장이 없습니다")
+            return ""
 
-        except Exception as e:
-            self.logger.error(f"✗ 엑셀 저장 실패: {e}")
+        layout = self._export_layout(list(delta.columns))
+        if layout is not None:
+            file_path = self.save_tables([layout.convert_frame(delta, "logen_delta")], prefix="logen_delta",
+                                         totals_rows=layout.totals_rows)
+        else:
+            file_path = self.save_frame(delta, prefix="logen_delta")
+        if file_path:
+            # 내보내기에 성공한 뒤에만 상태 기록 (실패 시 다음 실행에서 다시 내보냄)
+            sync.commit(delta)
+        return file_path
+
+    def _stage_cache(self):
+        """단계 체크포인트 캐시 (stage_cache.enabled가 false면 None)"""
+        options = stage_cache_options(self.config)
+        if not options['enabled']:
             return None
+        with self._cache_lock:
+            if self._cache is None:
+                self._cache = StageCache(
+                    options['folder'], options['ttl_seconds'], options['max_bytes'], self.logger
+                )
+        return self._cache
+
+    def _resume(self, cache, cache_key: str, from_cache: bool):
+        """
+        캐시된 단계부터 재개
+
+        Returns:
+            tuple: (조회 결과, 복호화 결과) - 캐시에 없는 단계는 None
+        """
+        checkpoint = cache.checkpoint(cache_key, include_exported=from_cache)
+        if checkpoint is None:
+            return None, None
+        payload = cache.load_payload(checkpoint)
+        tables = cache.load_tables(checkpoint)
+        if payload is None and tables is None:
+            return None, None
+        self.logger.info(f"✓ 캐시된 {describe_checkpoint(checkpoint)}에서 재개 - 로그인/조회 생략")
+        if self._metrics is not None:
+            self._metrics.labels['resumed_from'] = checkpoint.stage
+        return payload, tables
+
+    def _change_detector(self, encrypted_param: str) -> ChangeDetector:
+        """조회별 변경 감지기 (감지 값은 증분 동기화 상태 DB에 저장)"""
+        detector = self._detectors.get(encrypted_param)
+        if detector is None:
+            detector = self._detectors[encrypted_param] = ChangeDetector(
+                self._sync_state().store, encrypted_param, self.logger
+            )
+        return detector
+
+    def _log_connection_stats(self):
+        """세션 캐시 / 서킷 브레이커 / 재시도 예산 통계 기록"""
+        from logen_transport import format_transport_stats, transport_stats
+
+        self.logger.info(format_session_stats(self.sessions.stats()))
+        self.logger.info(format_transport_stats(transport_stats()))
+
+    def _finish_unchanged(self, detector: ChangeDetector):
+        """변경이 없어 내보내기를 생략한 실행 마무리"""
+        self.last_result = {'file': None, 'rows': 0, 'unchanged': True}
+        self.logger.info("=" * 60)
+        self.logger.info("✓ 변경 없음 - 내보내기 생략")
+        self.logger.info(format_watch_stats(detector.stats()))
+        self._log_connection_stats()
+        self.logger.info("=" * 60)
+        return True
 
-    def run(self, encrypted_param: str):
-        """전체 프로세스 실행"""
+    def run(self, encrypted_param: str, incremental: bool = False, watch: bool = False,
+            from_cache: bool = False):
+        """
+        전체 프로세스 실행
+
+        단계별 소요 시간/바이트 수/행 수는 metrics 설정의 파일(JSON lines,
+        Prometheus textfile)에 기록되고 last_metrics로도 확인할 수 있습니다.
+
+        Args:
+            encrypted_param: 암호화된 조회 파라미터
+            incremental: True면 이전 실행 이후 새로 출력/재출력된 송장만 저장
+            watch: True면 조회 결과나 차수(ORD_SEQ)가 지난번과 같을 때 복호화/내보내기 생략
+            from_cache: True면 이미 내보낸 조회라도 캐시된 결과로 다시 내보냄 (네트워크 사용 안 함)
+        """
+        account = str(self.config['logen_credentials']['user_id'])
+        metrics = self._metrics = RunMetrics(account, {'incremental': incremental, 'watch': watch})
+        success = False
+        try:
+            success = self._run(encrypted_param, incremental, watch, from_cache)
+            return success
+        finally:
+            self._metrics = None
+            self._record_metrics(metrics, success)
+
+    def _record_metrics(self, metrics: RunMetrics, success: bool):
+        """실행 결과를 측정 값에 반영하고 기록합니다."""
+        result = self.last_result or {}
+        if not success:
+            outcome = 'failed'
+        elif result.get('unchanged'):
+            outcome = 'unchanged'
+        elif not result.get('file'):
+            outcome = 'no_delta'
+        else:
+            outcome = 'exported'
+        metrics.finish(success, outcome, result.get('rows', 0) if success else 0, result.get('file'))
+        self.last_metrics = metrics
+        self.logger.info(format_run_metrics(metrics))
+
+        if self.metrics_recorder:
+            try:
+                self.metrics_recorder.record(metrics)
+            except Exception as e:
+                # 기록 실패는 다운로드 결과에 영향 없음
+                self.logger.warning(f"성능 기록 저장 실패: {e}")
+
+    def _run(self, encrypted_param: str, incremental: bool, watch: bool, from_cache: bool):
         self.logger.info("=" * 60)
         self.logger.info("로젠택배 송장 자동 다운로드 시작")
         self.logger.info("=" * 60)
+        self.last_result = None
+        detector = self._change_detector(encrypted_param) if watch else None
+
+        # 이전 실행이 내보내기 전에 실패했으면 캐시된 단계부터 재개
+        cache = self._stage_cache()
+        cache_key = StageCache.key(self.config['logen_credentials']['user_id'], encrypted_param)
+        encrypted_data, tables = self._resume(cache, cache_key, from_cache) if cache else (None, None)
+        if encrypted_data is None and tables is None:
+            if from_cache:
+                self.logger.error("✗ 다시 내보낼 캐시된 조회 결과가 없습니다 (만료되었거나 조회한 적 없음)")
+                return False
+            encrypted_data = self._fetch(encrypted_param)
+            if encrypted_data is None:
+                return False
+            if cache:
+                cache.save_payload(cache_key, encrypted_data)
+
+        # 변경 감지: 조회 결과가 지난번과 같으면 복호화부터 생략
+        if detector and encrypted_data is not None and not detector.payload_changed(encrypted_data):
+            if cache:
+                cache.mark_exported(cache_key)
+            return self._finish_unchanged(detector)
+
+        # 4. 복호화
+        if tables is None:
+            with self._span('decrypt') as span:
+                span.add(bytes_in=len(encrypted_data))
+                tables = self.decrypt_data(encrypted_data)
+                if tables is None:
+                    span.fail()
+                    return False
+                span.add(tables=len(tables))
+                main_table = find_data_table(tables)
+                if main_table is not None:
+                    span.shape(len(main_table), len(main_table.columns))
+            if cache:
+                cache.save_tables(cache_key, tables)
+        main_table = find_data_table(tables)
+
+        if detector and not detector.batches_changed(main_table):
+            if cache:
+                cache.mark_exported(cache_key)
+            return self._finish_unchanged(detector)
+
+        # 5. 송장 저장소 반영 및 엑셀로 저장
+        with self._span('store') as span:
+            span.shape(self.store_invoices(tables))
+        if incremental:
+            excel_file = self.export_incremental(tables)
+            if excel_file is None:
+                return False
+            excel_file = excel_file or "(변경 없음)"
+        else:
+            excel_file = self.save_to_excel(tables)
+            if not excel_file:
+                return False
+        if detector:
+            detector.commit()
+        if cache:
+            cache.mark_exported(cache_key)
+
+        self.logger.info("=" * 60)
+        self.logger.info("✓ 모든 작업 완료!")
+        self.logger.info(f"다운로드 파일: {excel_file}")
+        if detector:
+            self.logger.info(format_watch_stats(detector.stats()))
+        self._log_connection_stats()
+        self.logger.info("=" * 60)
 
+        return True
+
+    def _fetch(self, encrypted_param: str):
+        """
+        로그인 후 송장 데이터를 조회하여 암호화된 바이트를 반환합니다.
+
+        Returns:
+            bytes: 암호화된 데이터, 실패 시 None
+        """
         # 1. 로그인
+        with self._span('login') as span:
+            if not self.login():
+                span.fail()
+                self.logger.error("로그인 실패로 프로세스 중단")
+                return None
+
+        # 2~3. 송장 데이터 조회 및 암호화된 데이터 추출
+        if self.config['settings'].get('stream_response', True):
+            # 스트리밍 조회는 응답을 받으면서 Base64를 디코딩하므로 추출이 조회에 포함됨
+            with self._span('query') as span:
+                encrypted_data = self.get_invoice_payload(encrypted_param)
+                if encrypted_data is None:
+                    span.fail()
+                    return None
+                span.add(payload_bytes=len(encrypted_data))
+        else:
+            with self._span('query') as span:
+                response_xml = self.get_invoice_data(encrypted_param)
+                if not response_xml:
+                    span.fail()
+                    return None
+
+            with self._span('extract') as span:
+                try:
+                    encrypted_data = SELECT_ENC.decode(response_xml).payload
+                except (SoapFault, ValueError) as e:
+                    span.fail()
+                    self.logger.error(f"응답에서 데이터를 찾을 수 없습니다: {e}")
+                    return None
+                span.add(bytes_in=len(response_xml), bytes_out=len(encrypted_data))
+
+        return encrypted_data
+
+    def query_param_store(self) -> QueryParamStore:
+        """날짜별 조회 파라미터 저장소 (paths.query_params_file, 기본값: query_params.json)"""
+        params_file = self.config['paths'].get(
+            'query_params_file', str(self.config_path.parent / 'query_params.json')
+        )
+        return QueryParamStore(params_file)
+
+    def run_backfill(self, start, end, max_in_flight: int = None,
+                     requests_per_second: float = None, output: str = None):
+        """
+        기간 조회(백필) 실행
+
+        Args:
+            start: 시작일 (date)
+            end: 종료일 (date, 포함)
+            max_in_flight: 동시 조회 요청 수 (기본값: config backfill.max_in_flight)
+            requests_per_second: 초당 최대 조회 요청 수 (기본값: config backfill.requests_per_second)
+            output: 병합 파일 경로 (기본값: downloads/logen_backfill_시작일_종료일 + download_format 형식)
+
+        Returns:
+            dict: 요약 또는 None (로그인 실패)
+        """
+        backfill_config = self.config.get('backfill', {})
+        download_folder = Path(self.config['paths']['download_folder'])
+        user_id = self.config['logen_credentials']['user_id']
+
+        self.logger.info("=" * 60)
+        self.logger.info(f"로젠택배 기간 조회 시작: {start} ~ {end}")
+        self.logger.info("=" * 60)
+
         if not self.login():
             self.logger.error("로그인 실패로 프로세스 중단")
-            return False
+            return None
 
-        # 2. 송장 데이터 조회
-        response_xml = self.get_invoice_data(encrypted_param)
-        if not response_xml:
-            return False
+        engine = BackfillEngine(
+            self,
+            self.query_param_store(),
+            max_in_flight=max_in_flight or backfill_config.get('max_in_flight', 4),
+            requests_per_second=requests_per_second or backfill_config.get('requests_per_second'),
+        )
 
-        # 3. 응답에서 암호화된 데이터 추출
-        match = re.search(
-            r'<W_FC0073T_NTx_SelectEncResult>(.*?)</W_FC0073T_NTx_SelectEncResult>',
-            response_xml,
-            re.DOTALL
+        span = f"{start:%Y%m%d}_{end:%Y%m%d}"
+        checkpoint_folder = download_folder / 'backfill' / f"{user_id}_{span}"
+        if output:
+            output_path, formats = Path(output), None
+        else:
+            formats = self.output_formats()
+            output_path = download_folder / f"logen_backfill_{span}.{formats[0]}"
+
+        summary = engine.run(start, end, checkpoint_folder, output_path, formats)
+
+        self.logger.info("=" * 60)
+        self.logger.info(
+            f"기간 조회 완료: 조회 {summary['fetched']}일, 건너뜀 {summary['skipped']}일, "
+            f"실패 {len(summary['failed'])}일, {summary['rows']}건"
         )
+        if summary['output']:
+            self.logger.info(f"병합 파일: {summary['output']}")
+        self._log_connection_stats()
+        self.logger.info("=" * 60)
 
-        if not match:
-            self.logger.error("응답에서 데이터를 찾을 수 없습니다")
-            return False
+        return summary
 
-        encrypted_base64 = match.group(1).strip()
+# TODO: 실제 조회 파라미터를 생성하는 로직 필요
+# 현재는 test.txt에서 가져온 샘플 파라미터 사용
+SAMPLE_QUERY_PARAM = "Z/nY+cZ3l4Da0g3Y7trY5OolaKE/unqq/ClhGzkCGqfbli7a47CoTIDU3uTjpJkojBR+Cw1ZjxrWWjHkVzF45+2X6ZAuNdnq+MgDCaHfjVNp1POQdKnB7JbO0YRoUBPFnMEmnWqXGebWGGiLKFskkblegkHsO78eG8ZpVlg6s/pApj/T7B7+8hycXPX8IiviP8yHVY65D/ZOfzMv/m+oXWzROpe6Tg08K2yNX2jJvaxB6cuMexm/ZBgfEzPJzxw6ioR4ybWHA9OkFXr5QTfyQuOgEZFl94NdrnaiFygQ+HQJBFoXwydthJNc0ezIMfcKdD7SxkxDPYbwKodQE3Ysv/UPSjV9oqYN4/Uo9HffeFSEi6rJddkXzFWELfo+tAfVypbkV8iJZdDt/07/203krH+tEEtaivtn/OlnzoV9XXAg4TBGVXbzpSfjFCjOIYL8"
 
-        # 4. 복호화
-        dataset = self.decrypt_data(encrypted_base64)
-        if not dataset:
-            return False
 
-        # 5. 엑셀로 저장
-        excel_file = self.save_to_excel(dataset)
-        if not excel_file:
-            return False
+def default_config_path() -> Path:
+    """기본 config.json 경로 (스크립트와 같은 폴더)"""
+    return Path(__file__).parent.absolute() / "config.json"
 
-        self.logger.info("=" * 60)
-        self.logger.info("✓ 모든 작업 완료!")
-        self.logger.info(f"다운로드 파일: {excel_file}")
-        self.logger.info("=" * 60)
 
+def invoice_db_path(config: dict) -> Path:
+    """송장 저장소 DB 경로"""
+    default = Path(config['paths']['download_folder']) / "invoices.db"
+    return Path(config['paths'].get('invoice_db', default))
+
+
+def build_parser():
+    """명령행 인자 정의"""
+    parser = argparse.ArgumentParser(description="로젠택배 송장 자동 다운로드 프로그램")
+    parser.add_argument('--config', help="config.json 경로 (기본값: 스크립트와 같은 폴더)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="이전 실행 이후 새로 출력/재출력된 송장만 저장")
+    parser.add_argument('--watch', action='store_true',
+                        help="조회 결과나 차수가 지난번과 같으면 복호화/내보내기 생략")
+    parser.add_argument('--from-cache', action='store_true',
+                        help="로그인/조회 없이 캐시된 마지막 조회 결과로 다시 내보내기")
+
+    subparsers = parser.add_subparsers(dest='command')
+
+    backfill = subparsers.add_parser('backfill', help="기간 조회 (날짜별 병렬 조회 후 병합)")
+    backfill.add_argument('--from', dest='date_from', required=True, help="시작일 (예: 2025-10-01)")
+    backfill.add_argument('--to', dest='date_to', required=True, help="종료일 (포함)")
+    backfill.add_argument('--max-in-flight', type=int, help="동시 조회 요청 수")
+    backfill.add_argument('--rate', type=float, help="초당 최대 조회 요청 수")
+    backfill.add_argument('--output', help="병합 파일 경로")
+
+    multi = subparsers.add_parser('multi', help="여러 계정 동시 다운로드 (config의 accounts)")
+    multi.add_argument('--accounts', help="실행할 업체 아이디 (쉼표로 구분, 기본값: 전체)")
+    multi.add_argument('--date', help="조회 날짜 (기본값: 오늘)")
+    multi.add_argument('--max-workers', type=int, help="동시에 실행할 계정 수")
+
+    lookup = subparsers.add_parser('lookup', help="송장 저장소에서 운송장번호 조회")
+    group = lookup.add_mutually_exclusive_group()
+    group.add_argument('--order', help="주문번호 (FIX_TAKE_NO)")
+    group.add_argument('--slip', help="운송장번호 (SLIP_NO)")
+    group.add_argument('--phone', help="수하인 전화번호 (전체 또는 뒷자리)")
+    group.add_argument('--name', help="수하인명")
+    lookup.add_argument('--date', help="접수일자 (단독으로 쓰면 그날 전체, 수하인명과 함께 쓰면 좁혀서 조회, 예: 2025-10-31)")
+    lookup.add_argument('--limit', type=int, default=20)
+
+    serve = subparsers.add_parser('serve', help="운송장번호 조회 HTTP 서버 실행")
+    serve.add_argument('--host', help="바인딩 주소 (기본값: 127.0.0.1)")
+    serve.add_argument('--port', type=int, help="포트 (기본값: 8765)")
+
+    subparsers.add_parser('check-config', help="설정 파일 점검 (로그인/복호화 없이)")
+
+    password_status = subparsers.add_parser('password-status', help="계정별 비밀번호 저장 여부 확인")
+    password_status.add_argument('--account', help="확인할 업체 아이디 (기본값: 전체)")
+
+    daemon = subparsers.add_parser('daemon', help="상주 실행 (출고 시간대에 정해진 간격으로 조회)")
+    daemon.add_argument('--interval', type=int, help="조회 간격(분, 기본값: daemon.interval_minutes)")
+
+    return parser
+
+
+def read_config(args) -> dict:
+    """가벼운 명령용 설정 로드 (폴더 생성/로깅 설정 없이 읽기만)"""
+    config_path = Path(args.config) if args.config else default_config_path()
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# check-config에서 확인하는 필수 항목
+REQUIRED_CONFIG = {
+    'logen_credentials': ('user_id', 'ip_address', 'mac_address'),
+    'api_endpoints': ('base_url', 'login_soap', 'data_soap'),
+    'paths': ('download_folder', 'log_folder'),
+    'settings': ('timeout',),
+}
+
+# config.example.json의 안내 문구가 그대로 남아 있는지 확인할 때 쓰는 표시
+PLACEHOLDER_MARKERS = ('여기에', 'Fiddler에서', '업체아이디_')
+
+
+def run_check_config(args):
+    """check-config 명령 실행 (네트워크/DLL/비밀번호 복호화 없이 설정만 점검)"""
+    from logen_decryptor import BACKENDS, decryptor_options
+
+    config_path = Path(args.config) if args.config else default_config_path()
+    print(f"설정 파일: {config_path}")
+    try:
+        config = read_config(args)
+    except FileNotFoundError:
+        print("✗ 설정 파일이 없습니다. config.example.json을 복사하여 config.json을 만드세요.")
+        return False
+    except json.JSONDecodeError as e:
+        print(f"✗ JSON 형식 오류: {e}")
+        return False
+
+    errors = []
+    warnings = []
+
+    def check_section(label, section, keys):
+        for key in keys:
+            value = section.get(key)
+            if value in (None, ''):
+                errors.append(f"{label}.{key} 항목이 없습니다")
+            elif isinstance(value, str) and any(marker in value for marker in PLACEHOLDER_MARKERS):
+                errors.append(f"{label}.{key}에 예시 값이 그대로 있습니다: {value}")
+
+    for name, keys in REQUIRED_CONFIG.items():
+        if not isinstance(config.get(name), dict):
+            errors.append(f"{name} 항목이 없습니다")
+            continue
+        check_section(name, config[name], keys)
+
+    for index, account in enumerate(config.get('accounts', [])):
+        check_section(f"accounts[{index}]", account, REQUIRED_CONFIG['logen_credentials'])
+
+    options = decryptor_options(config)
+    if options['backend'] not in BACKENDS:
+        errors.append(f"decryptor.backend가 올바르지 않습니다: {options['backend']} "
+                      f"(사용 가능: {', '.join(BACKENDS)})")
+    elif options['backend'] == 'dotnet':
+        dll_path = Path(options['backend_options']['dll_path'])
+        if not (dll_path / 'Logen.Framework.BaseUtil.dll').exists():
+            warnings.append(f"복호화 DLL을 찾을 수 없습니다: {dll_path / 'Logen.Framework.BaseUtil.dll'}")
+
+    for key in ('download_folder', 'log_folder'):
+        folder = config.get('paths', {}).get(key)
+        if folder and not Path(folder).exists():
+            warnings.append(f"paths.{key} 폴더가 아직 없습니다 (실행 시 생성): {folder}")
+
+    for message in warnings:
+        print(f"⚠️  {message}")
+    for message in errors:
+        print(f"✗ {message}")
+    if errors:
+        print(f"\n✗ 설정 오류 {len(errors)}개")
+        return False
+    print("✓ 설정 확인 완료")
+    return True
+
+
+def run_password_status(args):
+    """password-status 명령 실행 (비밀번호를 복호화하지 않고 저장 여부만 확인)"""
+    from password_manager import PasswordManager
+
+    config = read_config(args)
+    main_id = str(config['logen_credentials']['user_id'])
+    account_ids = [main_id] + [str(a['user_id']) for a in config.get('accounts', [])
+                               if str(a['user_id']) != main_id]
+    if args.account:
+        account_ids = [a for a in account_ids if a == args.account] or [args.account]
+
+    missing = 0
+    for user_id in account_ids:
+        manager = PasswordManager(account=None if user_id == main_id else user_id)
+        if manager.is_password_saved():
+            saved_at = datetime.fromtimestamp(manager.password_file.stat().st_mtime)
+            print(f"✓ {user_id}: 저장됨 ({saved_at:%Y-%m-%d %H:%M})")
+        else:
+            missing += 1
+            command = "run_logen.bat" if user_id == main_id else f"python update_password.py {user_id}"
+            print(f"✗ {user_id}: 저장된 비밀번호 없음 → {command}")
+    return missing == 0
+
+
+def run_lookup(args):
+    """lookup 명령 실행 (로그인/복호화 없이 저장소만 조회)"""
+    if not (args.order or args.slip or args.phone or args.name or args.date):
+        print("✗ --order, --slip, --phone, --name, --date 중 하나를 지정하세요")
+        return False
+
+    config = read_config(args)
+
+    db_path = invoice_db_path(config)
+    if not db_path.exists():
+        print(f"✗ 송장 저장소가 없습니다: {db_path}")
+        return False
+
+    store = InvoiceStore(db_path)
+    try:
+        if args.order:
+            rows = store.by_order(args.order, args.limit)
+        elif args.slip:
+            rows = store.by_slip(args.slip, args.limit)
+        elif args.phone:
+            rows = store.by_phone(args.phone, args.limit)
+        else:
+            take_dt = None
+            if args.date:
+                take_dt = parse_date(args.date, config['settings'].get('date_format', '%Y-%m-%d')).strftime("%Y%m%d")
+            if args.name:
+                rows = store.by_name(args.name, take_dt, args.limit)
+            else:
+                rows = store.by_date(take_dt, args.limit)
+    finally:
+        store.close()
+
+    if not rows:
+        print("조회 결과가 없습니다.")
         return True
 
+    for row in rows:
+        print(" | ".join(f"{column}={row.get(column) or ''}" for column in SUMMARY_COLUMNS))
+    print(f"\n{len(rows)}건")
+    return True
+
+
+def run_serve(args):
+    """serve 명령 실행 (로그인/복호화 없이 저장소만 사용)"""
+    from logen_lookup_server import (
+        DEFAULT_HOST, DEFAULT_MAX_BATCH, DEFAULT_PORT, DEFAULT_RELOAD_INTERVAL, serve
+    )
+
+    config = read_config(args)
+
+    server_config = config.get('lookup_server', {})
+    setup_logging(config)
+    serve(
+        invoice_db_path(config),
+        host=args.host or server_config.get('host', DEFAULT_HOST),
+        port=args.port or server_config.get('port', DEFAULT_PORT),
+        reload_interval=server_config.get('reload_interval', DEFAULT_RELOAD_INTERVAL),
+        max_batch=server_config.get('max_batch', DEFAULT_MAX_BATCH),
+        logger=logging.getLogger('logen_lookup_server'),
+    )
+    return True
+
+
+def run_multi(config_path, args):
+    """multi 명령 실행 (계정마다 다운로더를 따로 생성)"""
+    downloader = LogenInvoiceDownloader(config_path)
+    config = downloader.config
+
+    accounts = config.get('accounts') or [config['logen_credentials']]
+    if args.accounts:
+        selected = {a.strip() for a in args.accounts.split(',')}
+        accounts = [a for a in accounts if str(a['user_id']) in selected]
+    if not accounts:
+        downloader.logger.error("실행할 계정이 없습니다")
+        return False
+
+    day = None
+    if args.date:
+        day = parse_date(args.date, config['settings'].get('date_format', '%Y-%m-%d'))
+
+    runner = MultiAccountRunner(
+        config, downloader.config_path, accounts, args.max_workers, incremental=args.incremental
+    )
+    summary = runner.run(day)
+
+    print()
+    print(format_summary(summary))
+    return summary['failed'] == 0
+
+
+def run_backfill(downloader, args):
+    """backfill 명령 실행"""
+    date_format = downloader.config['settings'].get('date_format', '%Y-%m-%d')
+    summary = downloader.run_backfill(
+        parse_date(args.date_from, date_format),
+        parse_date(args.date_to, date_format),
+        max_in_flight=args.max_in_flight,
+        requests_per_second=args.rate,
+        output=args.output,
+    )
+    return bool(summary) and not summary['failed']
+
+
+def run_daemon(downloader, args):
+    """daemon 명령 실행 (Ctrl+C로 종료)"""
+    from logen_daemon import DownloadDaemon, daemon_options
+
+    options = daemon_options(downloader.config)
+    if args.interval:
+        options['interval_minutes'] = args.interval
+    if args.incremental:
+        options['incremental'] = True
+    if args.watch:
+        options['watch'] = True
+
+    # 오늘 날짜의 파라미터가 query_params.json에 없으면 test.txt 캡처 파라미터로 조회 (경고 로그)
+    daemon = DownloadDaemon(downloader, downloader.query_param_store(), options,
+                            fallback_param=SAMPLE_QUERY_PARAM)
+    try:
+        daemon.run_forever()
+    except KeyboardInterrupt:
+        pass
+    return daemon.stats()['failed'] == 0
+
 
-def main():
+def main(argv=None):
     """메인 함수"""
+    args = build_parser().parse_args(argv)
+
+    if args.command == 'lookup':
+        return 0 if run_lookup(args) else 1
+    if args.command == 'serve':
+        return 0 if run_serve(args) else 1
+    if args.command == 'check-config':
+        return 0 if run_check_config(args) else 1
+    if args.command == 'password-status':
+        return 0 if run_password_status(args) else 1
+
     try:
         print("=" * 60)
         print("로젠택배 송장 자동 다운로드 프로그램")
         print("=" * 60)
         print()
 
-        # 다운로더 인스턴스 생성
-        downloader = LogenInvoiceDownloader()
+        if args.command == 'multi':
+            return 0 if run_multi(args.config, args) else 1
 
-        # TODO: 실제 조회 파라미터를 생성하는 로직 필요
-        # 현재는 test.txt에서 가져온 샘플 파라미터 사용
-        encrypted_param = "Z/nY+cZ3l4Da0g3Y7trY5OolaKE/unqq/ClhGzkCGqfbli7a47CoTIDU3uTjpJkojBR+Cw1ZjxrWWjHkVzF45+2X6ZAuNdnq+MgDCaHfjVNp1POQdKnB7JbO0YRoUBPFnMEmnWqXGebWGGiLKFskkblegkHsO78eG8ZpVlg6s/pApj/T7B7+8hycXPX8IiviP8yHVY65D/ZOfzMv/m+oXWzROpe6Tg08K2yNX2jJvaxB6cuMexm/ZBgfEzPJzxw6ioR4ybWHA9OkFXr5QTfyQuOgEZFl94NdrnaiFygQ+HQJBFoXwydthJNc0ezIMfcKdD7SxkxDPYbwKodQE3Ysv/UPSjV9oqYN4/Uo9HffeFSEi6rJddkXzFWELfo+tAfVypbkV8iJZdDt/07/203krH+tEEtaivtn/OlnzoV9XXAg4TBGVXbzpSfjFCjOIYL8"
+        # 다운로더 인스턴스 생성
+        downloader = LogenInvoiceDownloader(args.config)
 
-        # 실행
-        success = downloader.run(encrypted_param)
+        if args.command == 'backfill':
+            success = run_backfill(downloader, args)
+        elif args.command == 'daemon':
+            return 0 if run_daemon(downloader, args) else 1
+        else:
+            # 다른 실행(상주 실행 등)이 내보내는 중이면 겹치지 않도록 대기하지 않고 종료
+            with run_lock(downloader.config) as acquired:
+                if not acquired:
+                    print("✗ 다른 실행이 진행 중입니다. 잠시 후 다시 실행하세요.")
+                    return 1
+                success = downloader.run(SAMPLE_QUERY_PARAM, incremental=args.incremental,
+                                         watch=args.watch, from_cache=args.from_cache)
 
         if success:
             print("\n✓ 프로그램이 정상적으로 완료되었습니다.")
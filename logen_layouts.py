@@ -0,0 +1,278 @@
+"""
+로젠택배 내보내기 레이아웃 모듈
+- DT6 원본 코드 컬럼(SLIP_NO, RCV_CUST_NM ...)을 이름 있는 레이아웃(머리글, 순서, 마스킹)으로 변환
+- "client": 고객용 송장 파일 (sample_output.csv와 같은 46개 한글 머리글, 개인정보 마스킹, 합계 행)
+- 레이아웃에 필요한 컬럼만 먼저 골라낸 뒤(투영) DataFrame으로 변환하므로 나머지 컬럼은 만들지 않음
+- 마스킹/변환은 행 단위 Python 반복이 아닌 pandas 문자열 연산으로 컬럼 전체에 적용
+
+config.json의 export.column_layout에 레이아웃 이름을 지정합니다. ("raw"면 DT6 96개 컬럼 그대로)
+export.layouts에 레이아웃을 추가할 수 있습니다:
+    "layouts": {
+        "pickup": {
+            "columns": [["운송장번호", "SLIP_NO"], ["수하인명", "RCV_CUST_NM"],
+                        ["수하인휴대폰", "RCV_HAND_NO", "phone"]],
+            "totals": []
+        }
+    }
+"""
+
+from operator import itemgetter
+from typing import Dict, List, Optional
+
+RAW_LAYOUT = 'raw'
+
+
+def mask_phone(series):
+    """전화번호 끝 3자리를 가립니다. (예: "010-7187-8325" → "010-7187-8***")"""
+    return series.str.slice_replace(start=-3, repl='***')
+
+
+def redact(series):
+    """값이 있으면 전부 가립니다. (상세 주소 등)"""
+    return series.mask(series.notna(), '****')
+
+
+def trim_decimal(series):
+    """소수점 아래가 0뿐이면 정수로 표시합니다. (예: "0.0" → "0")"""
+    return series.str.replace(r'\.0+$', '', regex=True)
+
+
+TRANSFORMS = {
+    'phone': mask_phone,
+    'redact': redact,
+    'trim_decimal': trim_decimal,
+}
+
+
+class LayoutColumn:
+    """
+    레이아웃 컬럼 하나
+
+    Args:
+        header: 내보낼 머리글
+        source: DT6 컬럼명 (None이면 빈 컬럼)
+        transform: 변환 이름 (TRANSFORMS, None이면 그대로)
+    """
+
+    __slots__ = ('header', 'source', 'transform')
+
+    def __init__(self, header: str, source: Optional[str] = None, transform: Optional[str] = None):
+        if transform is not None and transform not in TRANSFORMS:
+            raise ValueError(f"알 수 없는 변환: {transform} (가능: {', '.join(TRANSFORMS)})")
+        self.header = header
+        self.source = source
+        self.transform = transform
+
+
+class ExportLayout:
+    """
+    내보내기 레이아웃 (DT6 컬럼 → 머리글/순서/마스킹)
+
+    Args:
+        name: 레이아웃 이름
+        columns: [(머리글, DT6 컬럼명[, 변환]), ...]
+        totals: 합계 행에 합계를 표시할 머리글 목록 (비어 있으면 합계 행 없음)
+    """
+
+    def __init__(self, name: str, columns: List[tuple], totals: Optional[List[str]] = None):
+        self.name = name
+        self.columns = [LayoutColumn(*column) for column in columns]
+        self.headers = [column.header for column in self.columns]
+        self.totals = list(totals or [])
+
+        unknown = [header for header in self.totals if header not in self.headers]
+        if unknown:
+            raise ValueError(f"{name} 레이아웃에 없는 합계 머리글: {', '.join(unknown)}")
+
+    @property
+    def totals_rows(self) -> int:
+        """to_table()이 데이터 행 뒤에 붙이는 행 수 (합계 행)"""
+        return 1 if self.totals else 0
+
+    @property
+    def source_columns(self) -> List[str]:
+        """레이아웃에 필요한 DT6 컬럼 목록 (중복 제외, 순서 유지)"""
+        return list(dict.fromkeys(c.source for c in self.columns if c.source is not None))
+
+    def missing_columns(self, columns: List[str]) -> List[str]:
+        """레이아웃에 필요하지만 테이블에 없는 컬럼 목록"""
+        present = set(columns)
+        return [name for name in self.source_columns if name not in present]
+
+    def project(self, table):
+        """
+        테이블에서 레이아웃에 필요한 컬럼만 골라 DataFrame으로 만듭니다.
+
+        Args:
+            table: TableData
+
+        Returns:
+            pandas.DataFrame (레이아웃에 필요한 DT6 컬럼만)
+        """
+        import pandas as pd
+
+        index = {name: i for i, name in enumerate(table.columns)}
+        sources = [name for name in self.source_columns if name in index]
+        if not sources:
+            return pd.DataFrame(index=range(len(table.rows)))
+        getter = itemgetter(*(index[name] for name in sources))
+        if len(sources) == 1:
+            rows = [(getter(row),) for row in table.rows]
+        else:
+            rows = list(map(getter, table.rows))
+        return pd.DataFrame.from_records(rows, columns=sources)
+
+    def apply(self, frame):
+        """
+        DT6 컬럼 DataFrame을 레이아웃 머리글/순서로 바꾸고 마스킹을 적용합니다.
+
+        Args:
+            frame: pandas.DataFrame (project() 결과 또는 DT6 전체, 형식 변환된 DataFrame도 가능)
+
+        Returns:
+            pandas.DataFrame (레이아웃 머리글 순서)
+        """
+        import pandas as pd
+
+        from logen_schema import DT6_SCHEMA, format_column
+
+        data = {}
+        for column in self.columns:
+            if column.source is None or column.source not in frame.columns:
+                data[column.header] = None
+                continue
+            # 형식 변환된 DataFrame(typed_frames)의 숫자/날짜/범주형은 원본 문자열로 되돌림
+            series = format_column(frame[column.source], DT6_SCHEMA.get(column.source))
+            if column.transform is not None:
+                series = TRANSFORMS[column.transform](series)
+            data[column.header] = series
+        return pd.DataFrame(data, index=frame.index, columns=self.headers)
+
+    def totals_row(self, frame) -> list:
+        """합계 행 (합계 머리글은 숫자 합계, 나머지는 빈 값)"""
+        import pandas as pd
+
+        row = [None] * len(self.headers)
+        for header in self.totals:
+            total = pd.to_numeric(frame[header], errors='coerce').sum()
+            row[self.headers.index(header)] = str(int(total)) if float(total).is_integer() else str(total)
+        return row
+
+    def to_table(self, frame, name: str):
+        """
+        레이아웃을 적용한 DataFrame을 TableData로 만듭니다. (합계 행 포함)
+
+        Args:
+            frame: apply() 결과
+            name: 테이블 이름
+
+        Returns:
+            TableData
+        """
+        from logen_decryptor import TableData
+        from logen_writers import frame_rows
+
+        rows = list(frame_rows(frame))
+        if self.totals:
+            rows.append(self.totals_row(frame))
+        return TableData(name, list(self.headers), rows)
+
+    def convert(self, table):
+        """TableData → 레이아웃 TableData (투영 → 마스킹 → 합계 행)"""
+        return self.to_table(self.apply(self.project(table)), table.name)
+
+    def convert_frame(self, frame, name: str):
+        """DT6 DataFrame(증분 동기화 결과 등) → 레이아웃 TableData"""
+        return self.to_table(self.apply(frame[[c for c in self.source_columns if c in frame.columns]]), name)
+
+
+# 고객용 송장 파일 (sample_output.csv)
+CLIENT_LAYOUT = ExportLayout(
+    'client',
+    [
+        (' ', None),
+        ('차수', 'ORD_SEQ'),
+        ('순번', 'SEQ'),
+        ('운송장번호', 'SLIP_NO'),
+        ('합포장번호', 'PACK_NO'),
+        ('관내물품', 'BRAN_SHARE_NM'),
+        ('수하인명', 'RCV_CUST_NM'),
+        ('우편번호', 'RCV_ZIP_CD'),
+        ('수하인주소1', 'RCV_CUST_ADDR1'),
+        ('수하인주소2', 'RCV_CUST_ADDR2', 'redact'),
+        ('수하인전화', 'RCV_TEL_NO', 'phone'),
+        ('수하인휴대폰', 'RCV_HAND_NO', 'phone'),
+        ('수량', 'QTY'),
+        ('택배운임', 'PRICE_AMT'),
+        ('선착불', 'FREIGHT_TYPE_NM'),
+        ('물품명', 'ITEM_NM'),
+        ('물품옵션', 'ITEM_OPTION'),
+        ('추가옵션', 'ADD_OPTION'),
+        ('배송메세지', 'SND_MSG'),
+        ('주문번호', 'FIX_TAKE_NO'),
+        ('집하영업소', 'PICK_SALES_CD'),
+        ('집하지점', 'BRAN_CD'),
+        ('배송지점', 'RCV_BRAN_CD'),
+        ('분류코드', 'DIV_BRAN_CD'),
+        ('송하인명', 'SND_CUST_NM'),
+        ('송하인주소1', 'SND_CUST_ADDR1'),
+        ('송하인주소2', 'SND_CUST_ADDR2', 'redact'),
+        ('송하인전화', 'SND_TEL_NO', 'phone'),
+        ('송하인휴대폰', 'SND_HAND_NO', 'phone'),
+        ('주의사항', 'ETC_MSG'),
+        ('제주선착불', 'AIR_AMT_TYPE_NM'),
+        ('물품중량(kg)', 'WT', 'trim_decimal'),
+        ('제주운임', 'AIR_AMT'),
+        ('연륙도서', 'SHIP_AREA_MARK'),
+        ('산간지역', 'SAN_AREA_MARK'),
+        ('물품코드', 'ITEM_CD'),
+        ('할증운임', 'EXTRA_AMT'),
+        ('물품가액', 'GOODS_AMT'),
+        ('내품수량', 'IN_QTY'),
+        ('원송장번호', 'ORG_SLIP_NO'),
+        ('주관고객', 'MGMT_FIX_CUST_NM'),
+        ('파일명', 'FILE_NM'),
+        ('프린터', 'PRINT_KIND_NM'),
+        ('출력송장', 'PRINT_LABEL_NM'),
+        ('발행횟수', 'PRINT_COUNT'),
+        ('출력시간', 'PRINT_TIME'),
+    ],
+    totals=['수량', '택배운임', '할증운임', '물품가액', '내품수량'],
+)
+
+LAYOUTS = {
+    CLIENT_LAYOUT.name: CLIENT_LAYOUT,
+}
+
+
+def load_layouts(config: dict) -> Dict[str, ExportLayout]:
+    """기본 레이아웃과 config의 export.layouts를 합친 레이아웃 목록"""
+    layouts = dict(LAYOUTS)
+    for name, spec in config.get('export', {}).get('layouts', {}).items():
+        layouts[name] = ExportLayout(name, [tuple(column) for column in spec['columns']],
+                                     spec.get('totals'))
+    return layouts
+
+
+def get_layout(config: dict, name: Optional[str] = None) -> Optional[ExportLayout]:
+    """
+    내보내기 레이아웃을 찾습니다.
+
+    Args:
+        config: config.json 내용
+        name: 레이아웃 이름 (기본값: export.column_layout)
+
+    Returns:
+        ExportLayout, "raw"면 None
+
+    Raises:
+        ValueError: 등록되지 않은 레이아웃인 경우
+    """
+    if name is None:
+        name = config.get('export', {}).get('column_layout', RAW_LAYOUT)
+    if not name or name == RAW_LAYOUT:
+        return None
+    layouts = load_layouts(config)
+    if name not in layouts:
+        raise ValueError(f"알 수 없는 레이아웃: {name} (가능: {', '.join([RAW_LAYOUT, *layouts])})")
+    return layouts[name]
@@ -0,0 +1,196 @@
+"""
+로젠택배 로깅 설정 모듈 (모든 실행 경로 공용)
+- 로그 호출은 큐에 넣기만 하고, 파일/콘솔 쓰기는 백그라운드 스레드(QueueListener)가 처리
+  (네트워크 공유 폴더에 쓰는 동안 조회/복호화가 멈추지 않음)
+- 날짜별 파일(logen_YYYYMMDD.log), 크기를 넘으면 logen_YYYYMMDD_1.log ... 로 이어서 기록
+  (파일 이름을 바꾸지 않으므로 다른 프로세스가 같은 파일을 열고 있어도 안전)
+- 보관 기간(retention_days)이 지난 로그 파일 자동 삭제
+
+config.json 예:
+    "logging": {
+        "level": "INFO",
+        "console": true,
+        "max_bytes": 10485760,
+        "retention_days": 30
+    }
+
+응답 본문처럼 큰 값을 남기는 디버그 로그는 f-string 대신 %-형식을 사용합니다.
+(예: logger.debug("응답: %.200s", response_xml) - DEBUG가 꺼져 있으면 문자열을 만들지 않음)
+"""
+
+import atexit
+import logging
+import re
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+LOG_FORMAT = '%(asctime)s [%(levelname)s] %(message)s'
+
+DEFAULT_LOGGING = {
+    'level': 'INFO',
+    'console': True,
+    'prefix': 'logen',
+    'max_bytes': 10 * 1024 * 1024,
+    'retention_days': 30,
+}
+
+_setup_lock = threading.Lock()
+_listener = None
+_log_folder = None
+
+
+class DailyRotatingFileHandler(logging.FileHandler):
+    """
+    날짜별 로그 파일 핸들러 (크기 제한, 보관 기간)
+
+    파일 이름을 바꾸는(rename) 방식 대신 새 파일을 열어 이어서 기록합니다.
+    QueueListener 스레드 하나에서만 사용하므로 별도 잠금이 없습니다.
+
+    Args:
+        folder: 로그 폴더
+        prefix: 파일 이름 앞부분 (기본값: "logen")
+        max_bytes: 파일 하나의 최대 크기 (0이면 제한 없음)
+        retention_days: 보관 기간(일, 0이면 삭제하지 않음)
+    """
+
+    def __init__(self, folder, prefix: str = 'logen', max_bytes: int = 0,
+                 retention_days: int = 0, encoding: str = 'utf-8'):
+        self.folder = Path(folder)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.retention_days = retention_days
+        self._pattern = re.compile(rf'^{re.escape(prefix)}_(\d{{8}})(?:_\d+)?\.log$')
+        self._day = date.today()
+        self._part = 0
+
+        # 이미 가득 찬 오늘 파일이 있으면 다음 번호부터 사용
+        while self.max_bytes and self._path().exists() and self._path().stat().st_size >= self.max_bytes:
+            self._part += 1
+        super().__init__(self._path(), encoding=encoding, delay=True)
+        self.remove_expired()
+
+    def _path(self) -> Path:
+        suffix = f"_{self._part}" if self._part else ""
+        return self.folder / f"{self.prefix}_{self._day:%Y%m%d}{suffix}.log"
+
+    def _should_roll(self, record) -> bool:
+        if datetime.fromtimestamp(record.created).date() != self._day:
+            return True
+        return bool(self.max_bytes and self.stream is not None
+                    and self.stream.tell() >= self.max_bytes)
+
+    def _roll(self, record):
+        day = datetime.fromtimestamp(record.created).date()
+        if day != self._day:
+            self._day = day
+            self._part = 0
+        else:
+            self._part += 1
+        self.close()
+        self.baseFilename = str(self._path().absolute())
+        self.remove_expired()
+
+    def emit(self, record):
+        try:
+            if self._should_roll(record):
+                self._roll(record)
+        except Exception:
+            self.handleError(record)
+            return
+        super().emit(record)
+
+    def remove_expired(self) -> int:
+        """보관 기간이 지난 로그 파일을 삭제합니다."""
+        if not self.retention_days:
+            return 0
+        cutoff = f"{self._day - timedelta(days=self.retention_days):%Y%m%d}"
+        removed = 0
+        for path in self.folder.glob(f"{self.prefix}_*.log"):
+            match = self._pattern.match(path.name)
+            if match and match.group(1) < cutoff:
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError:
+                    # 다른 프로세스가 열고 있는 파일은 다음 기회에 삭제
+                    pass
+        return removed
+
+
+def logging_options(config: dict) -> dict:
+    """config의 logging 항목에 기본값을 채웁니다."""
+    return {**DEFAULT_LOGGING, **config.get('logging', {})}
+
+
+def setup_logging(config: dict, name: Optional[str] = None) -> logging.Logger:
+    """
+    프로세스 로깅을 설정하고 로거를 반환합니다.
+
+    처음 호출할 때만 루트 로거에 큐 핸들러를 붙이고 백그라운드 기록 스레드를
+    시작합니다. 이후 호출(여러 계정, 상주 실행 등)은 같은 설정을 그대로 씁니다.
+    큐에 남은 로그는 프로세스 종료 시 모두 기록됩니다.
+
+    Args:
+        config: config.json 내용 (paths.log_folder, logging 항목 사용)
+        name: 로거 이름
+
+    Returns:
+        logging.Logger
+    """
+    global _listener, _log_folder
+
+    with _setup_lock:
+        if _listener is None:
+            import queue
+            from logging.handlers import QueueHandler, QueueListener
+
+            options = logging_options(config)
+            level = options['level']
+            if isinstance(level, str):
+                level = logging.getLevelName(level.upper())
+
+            formatter = logging.Formatter(LOG_FORMAT)
+            _log_folder = Path(config['paths']['log_folder'])
+            file_handler = DailyRotatingFileHandler(
+                _log_folder,
+                prefix=options['prefix'],
+                max_bytes=options['max_bytes'],
+                retention_days=options['retention_days'],
+            )
+            handlers = [file_handler]
+            if options['console']:
+                handlers.append(logging.StreamHandler())
+            for handler in handlers:
+                handler.setFormatter(formatter)
+
+            log_queue = queue.SimpleQueue()
+            root = logging.getLogger()
+            root.setLevel(level)
+            # basicConfig 등으로 먼저 붙은 핸들러는 큐로 대체
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            root.addHandler(QueueHandler(log_queue))
+
+            _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            _listener.start()
+            atexit.register(shutdown_logging)
+        elif Path(config['paths']['log_folder']) != _log_folder:
+            logging.getLogger(__name__).warning(
+                f"로그 폴더가 이미 {_log_folder}로 설정되어 있어 "
+                f"{config['paths']['log_folder']} 설정은 무시합니다"
+            )
+
+    return logging.getLogger(name)
+
+
+def shutdown_logging():
+    """큐에 남은 로그를 모두 기록하고 기록 스레드를 멈춥니다."""
+    global _listener
+    with _setup_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
@@ -0,0 +1,315 @@
+"""
+로젠택배 운송장번호 조회 서버
+- 송장 저장소(SQLite)를 메모리 해시 인덱스로 적재 (주문번호 / 운송장번호 / 전화번호 뒷자리)
+- 다운로더가 저장소를 갱신하면 새 인덱스를 만들어 통째로 교체 (조회 중단 없음)
+- 한 번의 요청으로 수백 건 일괄 조회 (POST /lookup)
+
+사용법:
+    python logen_invoice_downloader.py serve [--host 127.0.0.1] [--port 8765]
+
+    GET  /health
+    GET  /lookup?order=3992012914897108
+    POST /lookup  {"orders": ["...", ...], "slips": [...], "phones": ["8325", ...]}
+"""
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from logen_store import InvoiceStore, SUMMARY_COLUMNS, normalize_phone
+
+# 전화번호 인덱스 키 길이 (뒷자리 4자리)
+PHONE_SUFFIX_LEN = 4
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_RELOAD_INTERVAL = 5.0
+DEFAULT_MAX_BATCH = 1000
+
+
+class LookupIndex:
+    """
+    조회용 메모리 인덱스 (읽기 전용)
+
+    한 번 만든 인덱스는 바꾸지 않습니다. 데이터가 갱신되면 새 인덱스를 만들어
+    LookupService가 참조를 교체하므로, 조회 스레드는 잠금 없이 읽습니다.
+
+    Args:
+        rows: 송장 목록 (SUMMARY_COLUMNS 딕셔너리)
+    """
+
+    def __init__(self, rows):
+        self.by_order: Dict[str, List[dict]] = {}
+        self.by_slip: Dict[str, dict] = {}
+        self.by_phone: Dict[str, List[dict]] = {}
+
+        for row in rows:
+            slip_no = row.get('SLIP_NO')
+            if slip_no:
+                self.by_slip[slip_no] = row
+            order_no = row.get('FIX_TAKE_NO')
+            if order_no:
+                self.by_order.setdefault(order_no, []).append(row)
+
+            suffixes = set()
+            for column in ('RCV_HAND_NO', 'RCV_TEL_NO'):
+                digits = normalize_phone(row.get(column))
+                if digits and len(digits) >= PHONE_SUFFIX_LEN:
+                    suffixes.add(digits[-PHONE_SUFFIX_LEN:])
+            for suffix in suffixes:
+                self.by_phone.setdefault(suffix, []).append(row)
+
+        self.loaded_at = datetime.now().isoformat(timespec='seconds')
+
+    def __len__(self):
+        return len(self.by_slip)
+
+    def order(self, order_no: str) -> List[dict]:
+        """주문번호(FIX_TAKE_NO)로 조회"""
+        return self.by_order.get(order_no, [])
+
+    def slip(self, slip_no: str) -> List[dict]:
+        """운송장번호(SLIP_NO)로 조회"""
+        row = self.by_slip.get(slip_no)
+        return [row] if row else []
+
+    def phone(self, phone: str) -> List[dict]:
+        """
+        수하인 전화번호로 조회 (전체 번호 또는 4자리 이상 뒷자리)
+
+        뒷자리 4자리로 후보를 찾은 뒤 나머지 자리를 비교합니다.
+        """
+        digits = normalize_phone(phone)
+        if not digits or len(digits) < PHONE_SUFFIX_LEN:
+            return []
+        candidates = self.by_phone.get(digits[-PHONE_SUFFIX_LEN:], [])
+        if len(digits) == PHONE_SUFFIX_LEN:
+            return candidates
+        return [
+            row for row in candidates
+            if any((normalize_phone(row.get(column)) or '').endswith(digits)
+                   for column in ('RCV_HAND_NO', 'RCV_TEL_NO'))
+        ]
+
+
+class LookupService:
+    """
+    인덱스 적재/교체와 일괄 조회
+
+    저장소의 SQLite data_version을 주기적으로 확인하여 다른 프로세스(다운로더)가
+    저장소를 갱신했으면 새 인덱스를 만들어 교체합니다.
+
+    Args:
+        db_path: 송장 저장소 DB 경로
+        reload_interval: 갱신 확인 주기(초), 0이면 자동 갱신 안 함
+        max_batch: 한 요청에서 조회할 수 있는 최대 키 수
+        logger: 로거
+    """
+
+    def __init__(self, db_path, reload_interval: float = DEFAULT_RELOAD_INTERVAL,
+                 max_batch: int = DEFAULT_MAX_BATCH, logger: Optional[logging.Logger] = None):
+        self.db_path = db_path
+        self.reload_interval = reload_interval
+        self.max_batch = max_batch
+        self.logger = logger or logging.getLogger(__name__)
+        self.store = InvoiceStore(db_path)
+        self.index = LookupIndex([])
+        self.reloads = 0
+        self._data_version = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+
+    def reload(self) -> bool:
+        """저장소에서 새 인덱스를 만들어 교체합니다."""
+        with self._reload_lock:
+            try:
+                version = self.store.data_version()
+                started = time.perf_counter()
+                index = LookupIndex(self.store.iter_all(SUMMARY_COLUMNS))
+                self.index = index
+                self._data_version = version
+                self.reloads += 1
+                self.logger.info(
+                    f"✓ 조회 인덱스 적재: {len(index)}건 ({time.perf_counter() - started:.2f}초)"
+                )
+                return True
+            except Exception as e:
+                # 적재 실패 시 기존 인덱스로 계속 응답
+                self.logger.error(f"✗ 조회 인덱스 적재 실패: {e}")
+                return False
+
+    def _watch(self):
+        while not self._stop.wait(self.reload_interval):
+            try:
+                if self.store.data_version() != self._data_version:
+                    self.logger.info("송장 저장소 변경 감지 - 인덱스 다시 적재")
+                    self.reload()
+            except Exception as e:
+                self.logger.warning(f"송장 저장소 변경 확인 실패: {e}")
+
+    def start(self):
+        """인덱스를 적재하고 변경 감시 스레드를 시작합니다."""
+        self.reload()
+        if self.reload_interval and self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, name='lookup-reload', daemon=True)
+            self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+        self.store.close()
+
+    def lookup(self, request: dict) -> dict:
+        """
+        일괄 조회
+
+        Args:
+            request: {"orders": [...], "slips": [...], "phones": [...]}
+
+        Returns:
+            dict: 키 종류별 {키: [송장, ...]} (인덱스 하나로 조회하므로 교체 중에도 일관됨)
+        """
+        index = self.index
+        keys = {
+            'orders': request.get('orders') or [],
+            'slips': request.get('slips') or [],
+            'phones': request.get('phones') or [],
+        }
+        if not all(isinstance(values, list) for values in keys.values()):
+            raise ValueError("orders / slips / phones는 목록이어야 합니다")
+        total = sum(len(values) for values in keys.values())
+        if total > self.max_batch:
+            raise ValueError(f"한 번에 조회할 수 있는 키는 {self.max_batch}개까지입니다 (요청 {total}개)")
+
+        return {
+            'orders': {str(key): index.order(str(key)) for key in keys['orders']},
+            'slips': {str(key): index.slip(str(key)) for key in keys['slips']},
+            'phones': {str(key): index.phone(str(key)) for key in keys['phones']},
+        }
+
+    def health(self) -> dict:
+        index = self.index
+        return {
+            'status': 'ok',
+            'invoices': len(index),
+            'orders': len(index.by_order),
+            'loaded_at': index.loaded_at,
+            'reloads': self.reloads,
+        }
+
+
+class LookupRequestHandler(BaseHTTPRequestHandler):
+    """조회 서버 HTTP 핸들러 (keep-alive 지원)"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'LogenLookup/1.0'
+
+    # 헤더와 본문을 따로 쓰므로 Nagle 알고리즘 + 지연 ACK로 인한 ~40ms 지연 방지
+    disable_nagle_algorithm = True
+
+    # 최대 요청 본문 크기 (1 MB)
+    max_body = 1024 * 1024
+
+    @property
+    def service(self) -> LookupService:
+        return self.server.service
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/health':
+            self._send_json(200, self.service.health())
+        elif url.path == '/lookup':
+            query = parse_qs(url.query)
+            request = {
+                'orders': query.get('order', []),
+                'slips': query.get('slip', []),
+                'phones': query.get('phone', []),
+            }
+            self._lookup(request)
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/lookup':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        # 본문을 읽지 않고 응답하는 경우 남은 본문이 다음 요청으로 읽히지 않도록 연결을 닫음
+        header = self.headers.get('Content-Length')
+        if header is None:
+            self.close_connection = True
+            self._send_json(411, {'error': 'Content-Length required'})
+            return
+        try:
+            length = int(header)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send_json(400, {'error': 'invalid Content-Length'})
+            return
+        if length > self.max_body:
+            self.close_connection = True
+            self._send_json(413, {'error': 'request too large'})
+            return
+
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(request, dict):
+                raise ValueError("요청 본문은 JSON 객체여야 합니다")
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        self._lookup(request)
+
+    def _lookup(self, request: dict):
+        try:
+            self._send_json(200, self.service.lookup(request))
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+
+    def log_message(self, format, *args):
+        # 요청마다 파일 로그를 남기지 않음 (디버그 레벨로만)
+        self.service.logger.debug("%s - " + format, self.address_string(), *args)
+
+
+def create_server(service: LookupService, host: str = DEFAULT_HOST,
+                  port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """조회 서버를 생성합니다. (serve_forever()로 실행)"""
+    server = ThreadingHTTPServer((host, port), LookupRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def serve(db_path, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+          reload_interval: float = DEFAULT_RELOAD_INTERVAL, max_batch: int = DEFAULT_MAX_BATCH,
+          logger: Optional[logging.Logger] = None):
+    """조회 서버를 실행합니다. (Ctrl+C로 종료)"""
+    service = LookupService(db_path, reload_interval, max_batch, logger)
+    service.start()
+    server = create_server(service, host, port)
+    service.logger.info(f"✓ 운송장번호 조회 서버 시작: http://{host}:{server.server_port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        service.logger.info("조회 서버 종료")
+    finally:
+        server.server_close()
+        service.stop()
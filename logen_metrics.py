@@ -0,0 +1,376 @@
+"""
+로젠택배 실행 성능 기록 모듈
+- 실행(run)의 단계(로그인, 조회, 추출, 복호화, DataFrame 변환, 저장)별 소요 시간,
+  주고받은 바이트 수, 행/열 수를 기록
+- 실행마다 JSON 한 줄을 metrics.jsonl에 추가 (몇 주 단위 추세 분석용)
+- Prometheus textfile(node_exporter textfile collector 형식)에 마지막 실행 값과 누적 실행 횟수 기록
+
+config.json 예:
+    "metrics": {
+        "enabled": true,
+        "jsonl": "logs/metrics.jsonl",
+        "prometheus_textfile": "logs/logen_metrics.prom"
+    }
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 단계 이름 (표시 순서)
+STAGES = ('login', 'query', 'extract', 'decrypt', 'store', 'frame', 'delta', 'write')
+
+STAGE_LABELS = {
+    'login': '로그인',
+    'query': '조회',
+    'extract': '추출',
+    'decrypt': '복호화',
+    'store': '저장소',
+    'frame': '변환',
+    'delta': '증분',
+    'write': '저장',
+}
+
+# Prometheus 지표: 이름 → (형식, 설명)
+PROMETHEUS_METRICS = {
+    'logen_run_duration_seconds': ('gauge', 'Duration of the last run'),
+    'logen_run_success': ('gauge', 'Whether the last run succeeded (1/0)'),
+    'logen_run_rows': ('gauge', 'Rows exported by the last run'),
+    'logen_run_timestamp_seconds': ('gauge', 'Unix time the last run finished'),
+    'logen_runs_total': ('counter', 'Runs by outcome'),
+    'logen_stage_duration_seconds': ('gauge', 'Stage duration in the last run'),
+    'logen_stage_bytes_in': ('gauge', 'Bytes read by the stage in the last run'),
+    'logen_stage_bytes_out': ('gauge', 'Bytes written by the stage in the last run'),
+    'logen_stage_rows': ('gauge', 'Rows handled by the stage in the last run'),
+}
+
+
+class Span:
+    """
+    단계 하나의 측정 값
+
+    Attributes:
+        name: 단계 이름 (STAGES)
+        duration: 소요 시간(초)
+        bytes_in / bytes_out: 읽은/쓴 바이트 수 (요청 단계는 받은/보낸 바이트)
+        rows / columns: 처리한 행/열 수
+        status: 'ok' / 'failed' / 'error'
+        extra: 그 밖의 값 (예: 세션 재사용 여부)
+    """
+
+    __slots__ = ('name', 'duration', 'bytes_in', 'bytes_out', 'rows', 'columns',
+                 'status', 'extra', '_started')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.duration = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.rows = None
+        self.columns = None
+        self.status = 'ok'
+        self.extra = {}
+        self._started = time.perf_counter()
+
+    def add(self, bytes_in: int = 0, bytes_out: int = 0, **extra):
+        """바이트 수를 더하고 그 밖의 값을 기록합니다."""
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.extra.update(extra)
+
+    def shape(self, rows: int, columns: Optional[int] = None):
+        """처리한 행/열 수를 기록합니다."""
+        self.rows = rows
+        self.columns = columns
+
+    def fail(self):
+        """단계가 실패했음을 기록합니다. (예외 없이 None을 반환한 경우)"""
+        self.status = 'failed'
+
+    def to_dict(self) -> dict:
+        result = {
+            'stage': self.name,
+            'duration': round(self.duration, 4),
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'rows': self.rows,
+            'columns': self.columns,
+            'status': self.status,
+        }
+        result.update(self.extra)
+        return result
+
+
+class _NullSpan(Span):
+    """실행 중이 아닐 때 쓰는 기록하지 않는 단계"""
+
+    __slots__ = ()
+
+    def add(self, bytes_in: int = 0, bytes_out: int = 0, **extra):
+        pass
+
+    def shape(self, rows: int, columns: Optional[int] = None):
+        pass
+
+    def fail(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan('none')
+
+
+class RunMetrics:
+    """
+    실행 한 번의 단계별 측정
+
+    Args:
+        account: 업체 아이디
+        labels: 기록에 함께 남길 값 (예: {"incremental": True})
+    """
+
+    def __init__(self, account: str, labels: Optional[dict] = None):
+        self.run_id = os.urandom(6).hex()
+        self.account = account
+        self.labels = labels or {}
+        self.started_at = datetime.now()
+        self.spans: List[Span] = []
+        self.success = None
+        self.outcome = None
+        self.rows = 0
+        self.file = None
+        self.duration = 0.0
+        self._started = time.perf_counter()
+        self._open: List[Span] = []
+
+    def span(self, name: str) -> '_SpanContext':
+        """
+        단계 측정 (with 문)
+
+        예:
+            with metrics.span('decrypt') as span:
+                tables = ...
+                span.shape(len(table), len(table.columns))
+        """
+        return _SpanContext(self, name)
+
+    @property
+    def current(self) -> Span:
+        """진행 중인 가장 안쪽 단계 (없으면 기록하지 않는 단계)"""
+        return self._open[-1] if self._open else NULL_SPAN
+
+    def finish(self, success: bool, outcome: str, rows: int = 0, file: Optional[str] = None):
+        """
+        실행 결과를 기록합니다.
+
+        Args:
+            success: 성공 여부
+            outcome: 'exported' / 'no_delta' / 'unchanged' / 'failed'
+            rows: 내보낸 행 수
+            file: 저장한 파일 경로
+        """
+        self.duration = time.perf_counter() - self._started
+        self.success = success
+        self.outcome = outcome
+        self.rows = rows
+        self.file = file
+
+    def stage(self, name: str) -> Optional[Span]:
+        """이름으로 단계 찾기 (같은 단계가 여러 번이면 마지막)"""
+        return next((s for s in reversed(self.spans) if s.name == name), None)
+
+    def to_dict(self) -> dict:
+        return {
+            'run_id': self.run_id,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'account': self.account,
+            **self.labels,
+            'success': self.success,
+            'outcome': self.outcome,
+            'duration': round(self.duration, 4),
+            'rows': self.rows,
+            'file': self.file,
+            'spans': [span.to_dict() for span in self.spans],
+        }
+
+
+class _SpanContext:
+    __slots__ = ('metrics', 'span')
+
+    def __init__(self, metrics: RunMetrics, name: str):
+        self.metrics = metrics
+        self.span = Span(name)
+
+    def __enter__(self) -> Span:
+        self.metrics._open.append(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self.span
+        span.duration = time.perf_counter() - span._started
+        if exc_type is not None:
+            span.status = 'error'
+        self.metrics._open.remove(span)
+        self.metrics.spans.append(span)
+        return False
+
+
+def format_run_metrics(metrics: RunMetrics) -> str:
+    """단계별 소요 시간을 한 줄로 표시합니다."""
+    parts = []
+    for span in metrics.spans:
+        text = f"{STAGE_LABELS.get(span.name, span.name)} {span.duration:.2f}초"
+        size = span.bytes_in or span.bytes_out
+        if size:
+            text += f" ({_format_size(size)})"
+        if span.status != 'ok':
+            text += " ✗"
+        parts.append(text)
+    return f"단계별 소요 시간 (총 {metrics.duration:.2f}초): " + " / ".join(parts)
+
+
+def _format_size(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:,.0f} KB"
+    return f"{size / 1024 / 1024:,.1f} MB"
+
+
+def _format_value(value) -> str:
+    """Prometheus 샘플 값 (정수는 정수로, 실수는 정밀도를 잃지 않게)"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _escape_label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return '{' + ','.join(f'{key}="{_escape_label(value)}"' for key, value in sorted(labels.items())) + '}'
+
+
+class MetricsRecorder:
+    """
+    실행 측정 값 저장 (JSON lines + Prometheus textfile)
+
+    Prometheus 파일은 기존 파일의 값(다른 계정의 마지막 실행, 누적 실행 횟수)을
+    읽어 갱신한 뒤 임시 파일에 쓰고 교체하므로, 배치 파일 실행마다 프로세스가
+    바뀌어도 누적 값이 이어지고 수집기가 쓰다 만 파일을 읽지 않습니다.
+
+    Args:
+        jsonl_path: JSON lines 파일 경로 (None이면 기록 안 함)
+        prometheus_path: Prometheus textfile 경로 (None이면 기록 안 함)
+    """
+
+    def __init__(self, jsonl_path=None, prometheus_path=None):
+        self.jsonl_path = Path(jsonl_path) if jsonl_path else None
+        self.prometheus_path = Path(prometheus_path) if prometheus_path else None
+        self._lock = threading.Lock()
+        self._samples: Dict[tuple, float] = {}
+
+    def record(self, metrics: RunMetrics):
+        """실행 측정 값을 기록합니다."""
+        with self._lock:
+            if self.jsonl_path:
+                self.jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(metrics.to_dict(), ensure_ascii=False) + '\n')
+            if self.prometheus_path:
+                self._update_samples(metrics)
+                self._write_prometheus()
+
+    def _load_samples(self) -> Dict[tuple, float]:
+        samples = {}
+        try:
+            with open(self.prometheus_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    series, _, value = line.rpartition(' ')
+                    name = series.split('{', 1)[0]
+                    if name in PROMETHEUS_METRICS:
+                        samples[(name, series[len(name):])] = float(value)
+        except (OSError, ValueError):
+            pass
+        return samples
+
+    def _update_samples(self, metrics: RunMetrics):
+        # 다른 프로세스(배치 파일 실행)가 쓴 값도 이어받도록 매번 다시 읽음
+        samples = self._samples = self._load_samples()
+        account = metrics.account
+
+        run = _labels(account=account)
+        samples[('logen_run_duration_seconds', run)] = round(metrics.duration, 4)
+        samples[('logen_run_success', run)] = 1 if metrics.success else 0
+        samples[('logen_run_rows', run)] = metrics.rows
+        samples[('logen_run_timestamp_seconds', run)] = round(time.time(), 3)
+
+        total = ('logen_runs_total', _labels(account=account, outcome=metrics.outcome))
+        samples[total] = samples.get(total, 0) + 1
+
+        # 이번 실행에 없는 단계(예: 변경 없음으로 생략)는 지난 값을 지움
+        for key in [k for k in samples if k[0].startswith('logen_stage_') and f'account="{_escape_label(account)}"' in k[1]]:
+            del samples[key]
+        for span in metrics.spans:
+            stage = _labels(account=account, stage=span.name)
+            samples[('logen_stage_duration_seconds', stage)] = round(span.duration, 4)
+            samples[('logen_stage_bytes_in', stage)] = span.bytes_in
+            samples[('logen_stage_bytes_out', stage)] = span.bytes_out
+            if span.rows is not None:
+                samples[('logen_stage_rows', stage)] = span.rows
+
+    def _write_prometheus(self):
+        lines = []
+        for name, (kind, help_text) in PROMETHEUS_METRICS.items():
+            series = sorted((labels, value) for (metric, labels), value in self._samples.items()
+                            if metric == name)
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{labels} {_format_value(value)}" for labels, value in series)
+
+        self.prometheus_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.prometheus_path.with_name(f".{self.prometheus_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(temp_path, self.prometheus_path)
+
+
+_shared_recorders: Dict[tuple, MetricsRecorder] = {}
+_shared_lock = threading.Lock()
+
+
+def get_metrics_recorder(config: dict) -> Optional[MetricsRecorder]:
+    """
+    config의 metrics 설정에 맞는 기록기를 반환합니다. (같은 경로면 프로세스에서 공유)
+
+    Returns:
+        MetricsRecorder 또는 None (metrics.enabled가 false인 경우)
+    """
+    section = config.get('metrics', {})
+    if not section.get('enabled', True):
+        return None
+
+    log_folder = Path(config['paths']['log_folder'])
+    jsonl_path = section.get('jsonl', log_folder / 'metrics.jsonl')
+    prometheus_path = section.get('prometheus_textfile', log_folder / 'logen_metrics.prom')
+    key = (str(jsonl_path) if jsonl_path else None, str(prometheus_path) if prometheus_path else None)
+    with _shared_lock:
+        recorder = _shared_recorders.get(key)
+        if recorder is None:
+            recorder = _shared_recorders[key] = MetricsRecorder(jsonl_path, prometheus_path)
+        return recorder
@@ -0,0 +1,129 @@
+"""
+로젠택배 여러 계정 동시 다운로드 모듈
+- 계정별로 독립된 세션(쿠키)과 비밀번호 파일 사용
+- 계정별 실패는 다른 계정에 영향 없음
+- 전체 실행 결과 요약
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import List, Optional
+
+from logen_backfill import QueryParamStore
+from logen_decryptor import get_shared_decryptor
+from logen_session import format_session_stats, get_session_cache
+
+
+class MultiAccountRunner:
+    """
+    여러 계정의 송장 다운로드를 동시에 실행합니다.
+
+    계정마다 LogenInvoiceDownloader(자체 requests.Session)를 만들고,
+    복호화 풀은 모든 계정이 공유합니다. 전체 소요 시간은 계정별 소요
+    시간의 합이 아니라 가장 느린 계정에 가깝습니다.
+
+    Args:
+        config: 로드된 config.json 내용
+        config_path: config.json 경로
+        accounts: 계정 목록 (config의 accounts 항목 형식)
+        max_workers: 동시에 실행할 계정 수 (기본값: 계정 수)
+        incremental: True면 계정별로 새 송장/재출력 송장만 저장
+    """
+
+    def __init__(self, config: dict, config_path, accounts: List[dict],
+                 max_workers: Optional[int] = None, incremental: bool = False):
+        self.config = config
+        self.config_path = config_path
+        self.accounts = accounts
+        self.max_workers = max_workers or max(len(accounts), 1)
+        self.incremental = incremental
+        self.decryptor = get_shared_decryptor(config)
+
+        params_file = config['paths'].get(
+            'query_params_file', str(config_path.parent / 'query_params.json')
+        )
+        self.param_store = QueryParamStore(params_file)
+
+    def _run_account(self, account: dict, day: date) -> dict:
+        """계정 하나 실행 (예외는 결과로 변환)"""
+        from logen_invoice_downloader import LogenInvoiceDownloader
+
+        user_id = str(account['user_id'])
+        started = time.perf_counter()
+        result = {'user_id': user_id, 'success': False, 'rows': 0, 'file': None, 'error': None}
+
+        try:
+            credentials = {k: v for k, v in account.items() if k != 'query_param'}
+            downloader = LogenInvoiceDownloader(
+                self.config_path, decryptor=self.decryptor, credentials=credentials
+            )
+
+            encrypted_param = account.get('query_param') or self.param_store.get(day, user_id)
+            if not encrypted_param:
+                raise LookupError(f"{day} 조회 파라미터가 없습니다")
+
+            if downloader.run(encrypted_param, incremental=self.incremental):
+                result['success'] = True
+                result.update(downloader.last_result or {})
+            else:
+                result['error'] = "실행 실패 (로그 참고)"
+
+        except Exception as e:
+            result['error'] = str(e)
+
+        result['elapsed'] = round(time.perf_counter() - started, 2)
+        return result
+
+    def run(self, day: Optional[date] = None) -> dict:
+        """
+        모든 계정을 동시에 실행합니다.
+
+        Args:
+            day: 조회 날짜 (기본값: 오늘, query_params.json 조회에 사용)
+
+        Returns:
+            dict: 전체 요약 (계정별 결과, 성공/실패 수, 전체 소요 시간)
+        """
+        from logen_transport import transport_stats
+
+        day = day or date.today()
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(lambda account: self._run_account(account, day), self.accounts))
+
+        return {
+            'results': results,
+            'succeeded': sum(1 for r in results if r['success']),
+            'failed': sum(1 for r in results if not r['success']),
+            'rows': sum(r['rows'] for r in results),
+            'elapsed': round(time.perf_counter() - started, 2),
+            'slowest': max((r['elapsed'] for r in results), default=0),
+            'sessions': get_session_cache().stats(),
+            'transport': transport_stats(),
+        }
+
+
+def format_summary(summary: dict) -> str:
+    """실행 요약을 표 형태의 문자열로 만듭니다."""
+    lines = [
+        f"{'업체아이디':<14}{'결과':<6}{'건수':>6}{'소요(초)':>10}  파일/오류",
+        "-" * 60,
+    ]
+    for r in summary['results']:
+        status = "✓" if r['success'] else "✗"
+        detail = r['file'] if r['success'] else r['error']
+        lines.append(f"{r['user_id']:<14}{status:<6}{r['rows']:>6}{r['elapsed']:>10.2f}  {detail}")
+    lines.append("-" * 60)
+    lines.append(
+        f"성공 {summary['succeeded']}개 / 실패 {summary['failed']}개, 총 {summary['rows']}건, "
+        f"전체 {summary['elapsed']:.2f}초 (가장 느린 계정 {summary['slowest']:.2f}초)"
+    )
+    if summary.get('sessions'):
+        lines.append(format_session_stats(summary['sessions']))
+    if summary.get('transport'):
+        from logen_transport import format_transport_stats
+
+        lines.append(format_transport_stats(summary['transport']))
+    return "\n".join(lines)
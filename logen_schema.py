@@ -0,0 +1,217 @@
+"""
+로젠택배 DT6 컬럼 형식(스키마) 모듈
+- 수량/순번은 정수, 운임/물품가액은 금액(정수), 중량은 실수, 날짜는 날짜 형식으로 변환
+- 지점/영업소/송하인/출력 설정처럼 같은 값이 반복되는 컬럼은 범주형(category)으로 저장
+  (행마다 문자열을 두지 않고 값 목록 + 번호로 저장하므로 메모리가 크게 줄어듦)
+- 운송장번호, 주문번호, 우편번호, 전화번호, 고객 코드 등 앞자리 0이 의미 있는 값은 문자열 유지
+
+TableData.to_frame(typed=True) 또는 typed_frame(table)로 사용합니다.
+"""
+
+from typing import Dict, Optional
+
+# 컬럼 형식
+TEXT = 'text'
+INTEGER = 'integer'
+AMOUNT = 'amount'
+DECIMAL = 'decimal'
+DATE = 'date'
+DATETIME = 'datetime'
+CATEGORY = 'category'
+
+KINDS = (TEXT, INTEGER, AMOUNT, DECIMAL, DATE, DATETIME, CATEGORY)
+
+DT6_SCHEMA = {
+    # 수량 / 순번
+    'ORD_SEQ': INTEGER,
+    'SEQ': INTEGER,
+    'SLIP_PRT_SEQ': INTEGER,
+    'QTY': INTEGER,
+    'IN_QTY': INTEGER,
+    'PRINT_COUNT': INTEGER,
+    'TOTAL_SEQ': INTEGER,
+    'TOT_QTY': INTEGER,
+    'QTY_SEQ': INTEGER,
+
+    # 금액 (원)
+    'PRICE_AMT': AMOUNT,
+    'EXTRA_AMT': AMOUNT,
+    'COD_AMT': AMOUNT,
+    'GOODS_AMT': AMOUNT,
+    'AIR_AMT': AMOUNT,
+    'SHIP_AMT': AMOUNT,
+
+    # 중량 (kg)
+    'WT': DECIMAL,
+
+    # 날짜 (YYYYMMDD / YYYYMMDDHHMMSS)
+    'TAKE_DT': DATE,
+    'PICK_REQ_DT': DATE,
+    'SND_EXP_DT': DATE,
+    'SEARCH_TIME': DATETIME,
+
+    # 반복되는 값 (업체/지점/영업소/송하인/출력 설정/구분 코드)
+    'CENT_YN': CATEGORY,
+    'FIX_CUST_CD': CATEGORY,
+    'MGMT_FIX_CUST': CATEGORY,
+    'MGMT_FIX_CUST_NM': CATEGORY,
+    'TAKE_METHOD': CATEGORY,
+    'TAKE_TYPE': CATEGORY,
+    'FILE_TYPE_CD': CATEGORY,
+    'FILE_NM': CATEGORY,
+    'BRAN_CD': CATEGORY,
+    'BRAN_NM': CATEGORY,
+    'PICK_SALES_CD': CATEGORY,
+    'PICK_SALES_NM': CATEGORY,
+    'PICK_SALES_HAND_NO': CATEGORY,
+    'RCV_BRAN_CD': CATEGORY,
+    'RCV_BRAN_NM': CATEGORY,
+    'DIV_BRAN_CD': CATEGORY,
+    'SND_SALES_CD': CATEGORY,
+    'DELV_SALES_NM': CATEGORY,
+    'TM_NM': CATEGORY,
+    'SND_CUST_CD': CATEGORY,
+    'SND_CUST_NM': CATEGORY,
+    'SND_ZIP_CD': CATEGORY,
+    'SND_ZIP_SEQ': CATEGORY,
+    'SND_CUST_ADDR1': CATEGORY,
+    'SND_CUST_ADDR2': CATEGORY,
+    'SND_NEW_ADDR3': CATEGORY,
+    'SND_TEL_NO': CATEGORY,
+    'SND_HAND_NO': CATEGORY,
+    'RCV_ZIP_SEQ': CATEGORY,
+    'FREIGHT_TYPE': CATEGORY,
+    'FREIGHT_TYPE_NM': CATEGORY,
+    'AIR_AMT_TYPE': CATEGORY,
+    'AIR_AMT_TYPE_NM': CATEGORY,
+    'SHIP_AMT_TYPE': CATEGORY,
+    'ITEM_CD': CATEGORY,
+    'ITEM_NM': CATEGORY,
+    'ITEM_OPTION': CATEGORY,
+    'UPD_EMP_ID': CATEGORY,
+    'REG_EMP_ID': CATEGORY,
+    'PRINT_KIND': CATEGORY,
+    'PRINT_KIND_NM': CATEGORY,
+    'PRINT_LABEL': CATEGORY,
+    'PRINT_LABEL_NM': CATEGORY,
+    'PRINT_TIME': CATEGORY,
+    'SHIP_AREA_MARK': CATEGORY,
+    'SHIP_AREA_YN': CATEGORY,
+    'SAN_AREA_MARK': CATEGORY,
+    'AIR_REG_YN': CATEGORY,
+    'COD_YN': CATEGORY,
+    'DEAL_KIND_CD': CATEGORY,
+    'BRAN_SHARE': CATEGORY,
+    'BRAN_SHARE_NM': CATEGORY,
+    'CUST_PRINT_YN': CATEGORY,
+}
+
+SCHEMAS = {
+    'DT6': DT6_SCHEMA,
+}
+
+_DATE_FORMATS = {
+    DATE: '%Y%m%d',
+    DATETIME: '%Y%m%d%H%M%S',
+}
+
+
+def convert_column(values, kind: Optional[str]):
+    """
+    컬럼 값(문자열, 빈 값은 None)을 형식에 맞는 pandas Series로 변환합니다.
+    변환할 수 없는 값은 빈 값(NA)이 됩니다.
+
+    Args:
+        values: 값 목록 또는 Series
+        kind: 컬럼 형식 (KINDS, None이면 문자열)
+
+    Returns:
+        pandas.Series
+    """
+    import pandas as pd
+
+    if kind == CATEGORY:
+        return pd.Series(pd.Categorical(values))
+
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if kind in (INTEGER, AMOUNT):
+        numbers = pd.to_numeric(series, errors='coerce')
+        if (numbers.dropna() % 1 != 0).any():
+            # 소수가 섞여 있으면 정수로 바꾸지 않음
+            return numbers.astype('Float64')
+        return numbers.astype('Int32' if kind == INTEGER else 'Int64')
+    if kind == DECIMAL:
+        return pd.to_numeric(series, errors='coerce').astype('Float32')
+    if kind in _DATE_FORMATS:
+        return pd.to_datetime(series, format=_DATE_FORMATS[kind], errors='coerce')
+    return series
+
+
+def format_column(series, kind: Optional[str] = None):
+    """
+    convert_column()으로 변환한 Series를 원본 문자열로 되돌립니다.
+    (레이아웃처럼 형식 변환 여부와 관계없이 같은 값을 내보내야 하는 곳에서 사용)
+
+    Args:
+        series: pandas.Series
+        kind: 컬럼 형식 (날짜 형식 결정, 기본값: 날짜는 YYYYMMDD)
+
+    Returns:
+        pandas.Series (문자열, 빈 값은 None), 문자열 컬럼은 그대로
+    """
+    import pandas as pd
+
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        values = series.astype(object)
+    elif pd.api.types.is_datetime64_any_dtype(dtype):
+        values = series.dt.strftime(_DATE_FORMATS.get(kind, _DATE_FORMATS[DATE]))
+    elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+        values = series.astype('string')
+        if kind in (INTEGER, AMOUNT) and pd.api.types.is_float_dtype(dtype):
+            # 소수가 섞여 Float64가 된 정수 컬럼은 정수 값을 "100"으로 표시
+            values = values.str.replace(r'\.0$', '', regex=True)
+    else:
+        return series
+    return values.astype(object).where(values.notna(), None)
+
+
+def typed_frame(table, schema: Optional[Dict[str, str]] = None):
+    """
+    TableData를 컬럼 형식에 맞는 DataFrame으로 변환합니다.
+    (문자열 DataFrame을 먼저 만들지 않고 컬럼별로 바로 변환)
+
+    Args:
+        table: TableData
+        schema: 컬럼명 → 형식 (기본값: 테이블 이름으로 SCHEMAS에서 찾음, 없으면 모두 문자열)
+
+    Returns:
+        pandas.DataFrame
+    """
+    import pandas as pd
+
+    if schema is None:
+        schema = SCHEMAS.get(table.name, {})
+    if table.rows:
+        columns = zip(*table.rows)
+    else:
+        columns = ([] for _ in table.columns)
+    data = {name: convert_column(values, schema.get(name))
+            for name, values in zip(table.columns, columns)}
+    return pd.DataFrame(data, columns=table.columns)
+
+
+def apply_schema(frame, schema: Dict[str, str] = DT6_SCHEMA):
+    """문자열 DataFrame의 컬럼을 형식에 맞게 변환한 새 DataFrame을 반환합니다."""
+    import pandas as pd
+
+    return pd.DataFrame(
+        {name: convert_column(frame[name].reset_index(drop=True), schema.get(name))
+         for name in frame.columns},
+        columns=frame.columns,
+    ).set_axis(frame.index)
+
+
+def frame_memory(frame) -> int:
+    """DataFrame 메모리 사용량 (문자열 내용 포함, 바이트)"""
+    return int(frame.memory_usage(index=True, deep=True).sum())
@@ -0,0 +1,167 @@
+"""
+로젠택배 로그인 세션 캐시
+- 계정별 requests.Session과 로그인 상태를 프로세스 전체에서 공유
+- 유효 시간(TTL)이 지났거나 서버가 호출을 거부했을 때만 다시 로그인
+- 복호화한 비밀번호 캐시 (매 로그인마다 .key/.password 파일을 읽지 않음)
+- 재사용/로그인 횟수 통계
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+# 기본 세션 유효 시간 (초)
+DEFAULT_SESSION_TTL = 1800
+
+# 세션 거부로 보는 SOAP Fault 문구
+# 서버의 세션 만료 응답은 아직 캡처되지 않았으므로 로그인/인증 관련 문구를 모두 포함
+REJECTION_MARKERS = ('로그인', '세션', '인증', 'login', 'session', 'auth')
+
+
+def is_rejection(status_code: int = None, fault=None) -> bool:
+    """
+    서버가 세션을 거부한 응답인지 판단합니다.
+
+    Args:
+        status_code: HTTP 상태 코드
+        fault: SoapFault (있으면)
+    """
+    if status_code in (401, 403):
+        return True
+    if fault is not None:
+        text = f"{fault.faultcode} {fault.faultstring}".lower()
+        return any(marker in text for marker in REJECTION_MARKERS)
+    return False
+
+
+class SessionEntry:
+    """계정 하나의 세션 상태"""
+
+    __slots__ = ('session', 'lock', 'expires_at', 'password')
+
+    def __init__(self):
+        import requests
+
+        self.session = requests.Session()
+        self.lock = threading.Lock()
+        self.expires_at = 0.0
+        self.password = None
+
+
+class SessionCache:
+    """
+    로그인 세션 캐시
+
+    같은 계정(서버 주소 + 업체 아이디)의 다운로더/클라이언트는 하나의
+    requests.Session(쿠키)을 함께 쓰고, 로그인은 세션이 없거나 만료되었을 때만
+    수행합니다. 여러 스레드가 동시에 만료된 세션을 만나도 로그인은 한 번만 합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], SessionEntry] = {}
+        self._stats = {'hits': 0, 'logins': 0, 'failed': 0, 'expired': 0, 'rejected': 0}
+
+    def _entry(self, key) -> SessionEntry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = SessionEntry()
+            return entry
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def session(self, key):
+        """계정의 공유 requests.Session"""
+        return self._entry(key).session
+
+    def is_valid(self, key) -> bool:
+        """로그인 세션이 유효한지 확인합니다."""
+        return self._entry(key).expires_at > time.monotonic()
+
+    def ensure(self, key, login: Callable[[], bool], ttl: float = DEFAULT_SESSION_TTL) -> bool:
+        """
+        유효한 로그인 세션을 보장합니다.
+
+        Args:
+            key: 계정 키
+            login: 실제 로그인 함수 (성공 시 True)
+            ttl: 세션 유효 시간(초), 0이면 매번 로그인
+
+        Returns:
+            bool: 로그인 세션 사용 가능 여부
+        """
+        entry = self._entry(key)
+        with entry.lock:
+            now = time.monotonic()
+            if entry.expires_at > now:
+                self._count('hits')
+                return True
+            if entry.expires_at:
+                self._count('expired')
+
+            if not login():
+                entry.expires_at = 0.0
+                # 비밀번호가 바뀌었을 수 있으므로 다음 로그인 때 다시 읽음
+                entry.password = None
+                self._count('failed')
+                return False
+
+            entry.expires_at = time.monotonic() + ttl if ttl else 0.0
+            self._count('logins')
+            return True
+
+    def invalidate(self, key):
+        """서버가 세션을 거부했을 때 호출합니다. (다음 ensure에서 다시 로그인)"""
+        entry = self._entry(key)
+        if entry.expires_at:
+            entry.expires_at = 0.0
+            self._count('rejected')
+
+    def password(self, key, loader: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        복호화한 비밀번호 (처음 한 번만 loader로 읽음)
+
+        Args:
+            key: 계정 키
+            loader: 비밀번호 로드 함수 (PasswordManager.load_password)
+        """
+        entry = self._entry(key)
+        if entry.password is None:
+            entry.password = loader()
+        return entry.password
+
+    def stats(self) -> dict:
+        """
+        캐시 통계
+
+        Returns:
+            dict: hits(재사용 = 절약한 로그인 수), logins, failed, expired, rejected,
+                hit_rate, active(유효한 세션 수)
+        """
+        now = time.monotonic()
+        with self._lock:
+            stats = dict(self._stats)
+            stats['active'] = sum(1 for entry in self._entries.values() if entry.expires_at > now)
+        requests_total = stats['hits'] + stats['logins'] + stats['failed']
+        stats['hit_rate'] = round(stats['hits'] / requests_total, 3) if requests_total else 0.0
+        return stats
+
+
+def format_session_stats(stats: dict) -> str:
+    """세션 캐시 통계를 한 줄로 만듭니다."""
+    return (
+        f"세션 캐시: 재사용 {stats['hits']}회 / 로그인 {stats['logins']}회 / "
+        f"실패 {stats['failed']}회 / 만료 {stats['expired']}회 / 거부 {stats['rejected']}회 "
+        f"(적중률 {stats['hit_rate'] * 100:.0f}%)"
+    )
+
+
+_session_cache = SessionCache()
+
+
+def get_session_cache() -> SessionCache:
+    """프로세스 공유 세션 캐시"""
+    return _session_cache
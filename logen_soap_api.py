@@ -5,12 +5,15 @@ Fiddler로 분석한 SOAP API를 사용하여 송장 데이터를 자동으로 
 
 import os
 import json
-import logging
-from datetime import datetime
 from pathlib import Path
 import requests
 from typing import Optional, Dict, Any
 
+from logen_logging import setup_logging
+from logen_session import DEFAULT_SESSION_TTL, get_session_cache, is_rejection
+from logen_soap_codec import LOGIN_ENCRYPT, SELECT_ENC
+from logen_transport import SoapTransport
+
 
 class LogenSOAPClient:
     """로젠택배 SOAP API 클라이언트"""
@@ -27,10 +30,17 @@ class LogenSOAPClient:
 
         self.config_path = Path(config_path)
         self.config = self._load_config()
-        self.session = requests.Session()
+
+        # 로그인 세션은 같은 계정의 클라이언트/다운로더와 프로세스 안에서 공유
+        self.sessions = get_session_cache()
+        self.session_key = (self.config['api_endpoints']['base_url'],
+                            str(self.config['logen_credentials']['user_id']))
+        self.session_ttl = self.config['settings'].get('session_ttl', DEFAULT_SESSION_TTL)
+        self.session = self.sessions.session(self.session_key)
 
         # 로깅 설정
         self._setup_logging()
+        self.transport = SoapTransport(self.session, self.config, self.logger)
 
     def _load_config(self) -> Dict[str, Any]:
         """config.json 파일을 로드합니다."""
@@ -52,60 +62,35 @@ class LogenSOAPClient:
             raise ValueError(f"JSON 파싱 오류: {e}")
 
     def _setup_logging(self):
-        """로깅을 설정합니다."""
-        log_folder = Path(self.config['paths']['log_folder'])
-        log_file = log_folder / f"logen_{datetime.now():%Y%m%d}.log"
-
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s [%(levelname)s] %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
-
-    def _soap_request(self, url: str, soap_action: str, soap_body: str) -> Optional[str]:
+        """로깅을 설정합니다. (파일/콘솔 쓰기는 백그라운드 스레드에서 처리)"""
+        self.logger = setup_logging(self.config, __name__)
+
+    def _soap_request(self, operation, *args) -> Optional[str]:
         """
         SOAP 요청을 보냅니다.
 
         Args:
-            url: SOAP 서비스 URL
-            soap_action: SOAPAction 헤더 값
-            soap_body: SOAP Body XML
+            operation: logen_soap_codec의 SOAP 메서드 선언
+            *args: 메서드 파라미터 값
 
         Returns:
             str: 응답 XML 또는 None
         """
-        soap_envelope = f'''<?xml version="1.0" encoding="utf-8"?>
-<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"
-               xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-               xmlns:xsd="http://www.w3.org/2001/XMLSchema">
-    <soap:Body>
-        {soap_body}
-    </soap:Body>
-</soap:Envelope>'''
-
-        headers = {
-            'Content-Type': 'text/xml; charset=utf-8',
-            'SOAPAction': f'"{soap_action}"',
-            'User-Agent': 'Mozilla/4.0 (compatible; MSIE 6.0; MS Web Services Client Protocol 2.0.50727.9179)'
-        }
-
         try:
-            response = self.session.post(
-                url,
-                data=soap_envelope.encode('utf-8'),
-                headers=headers,
-                timeout=self.config['settings']['timeout']
+            response = self.transport.post(
+                operation.url(self.config),
+                data=operation.encode(*args),
+                headers=operation.headers,
+                idempotent=operation.idempotent
             )
 
             if response.status_code == 200:
                 return response.text
             else:
                 self.logger.error(f"SOAP 요청 실패: {response.status_code}")
-                self.logger.error(f"응답 내용: {response.text}")
+                self.logger.error("응답 내용: %.500s", response.text)
+                if is_rejection(response.status_code):
+                    self.sessions.invalidate(self.session_key)
                 return None
 
         except requests.exceptions.RequestException as e:
@@ -116,33 +101,34 @@ class LogenSOAPClient:
         """
         로젠택배 SOAP API에 로그인합니다.
 
+        같은 계정의 로그인 세션이 유효하면 다시 로그인하지 않습니다. (세션 캐시)
+
         Returns:
             bool: 로그인 성공 여부
         """
+        reused = self.sessions.is_valid(self.session_key)
+        success = self.sessions.ensure(self.session_key, self._login, self.session_ttl)
+        if success and reused:
+            self.logger.info("✓ 로그인 세션 재사용")
+        return success
+
+    def _login(self) -> bool:
+        """로그인 요청"""
         try:
             credentials = self.config['logen_credentials']
-            api_config = self.config['api_endpoints']
 
-            login_url = f"{api_config['base_url']}{api_config['login_soap']}"
-            soap_action = "http://ilogen.ilogen.com/iLOGEN.COMM.WebService/W_COMM_NTx_LoginEncrypt"
+            self.logger.info(f"로그인 시도: {LOGIN_ENCRYPT.url(self.config)}")
 
-            self.logger.info(f"로그인 시도: {login_url}")
-
-            # SOAP Body 생성
-            soap_body = f'''<W_COMM_NTx_LoginEncrypt xmlns="http://ilogen.ilogen.com/iLOGEN.COMM.WebService/">
-            <arrParam>
-                <string>{credentials['user_id']}</string>
-                <string>{credentials['encrypted_password']}</string>
-                <string>{credentials['ip_address']}</string>
-                <string>{credentials['mac_address']}</string>
-            </arrParam>
-        </W_COMM_NTx_LoginEncrypt>'''
-
-            response_xml = self._soap_request(login_url, soap_action, soap_body)
+            response_xml = self._soap_request(LOGIN_ENCRYPT, [
+                credentials['user_id'],
+                credentials['encrypted_password'],
+                credentials['ip_address'],
+                credentials['mac_address'],
+            ])
 
             if response_xml:
                 self.logger.info("✓ 로그인 성공")
-                self.logger.debug(f"응답: {response_xml[:200]}...")
+                self.logger.debug("응답: %.200s...", response_xml)
                 return True
             else:
                 self.logger.error("✗ 로그인 실패")
@@ -163,10 +149,6 @@ class LogenSOAPClient:
             str: 응답 XML 또는 None
         """
         try:
-            api_config = self.config['api_endpoints']
-            data_url = f"{api_config['base_url']}{api_config['data_soap']}"
-            soap_action = "http://ilogen.ilogen.com/iLOGEN.FC.WebService/W_FC0073T_NTx_SelectEnc"
-
             self.logger.info("송장 데이터 조회 중...")
 
             # TODO: encrypted_param을 생성하는 방법을 찾아야 함
@@ -175,11 +157,12 @@ class LogenSOAPClient:
                 self.logger.warning("암호화된 파라미터가 필요합니다")
                 return None
 
-            soap_body = f'''<W_FC0073T_NTx_SelectEnc xmlns="http://ilogen.ilogen.com/iLOGEN.FC.WebService/">
-            <bytDataParam>{encrypted_param}</bytDataParam>
-        </W_FC0073T_NTx_SelectEnc>'''
-
-            response_xml = self._soap_request(data_url, soap_action, soap_body)
+            was_valid = self.sessions.is_valid(self.session_key)
+            response_xml = self._soap_request(SELECT_ENC, encrypted_param)
+            if response_xml is None and was_valid and not self.sessions.is_valid(self.session_key):
+                self.logger.warning("서버가 로그인 세션을 거부했습니다 - 다시 로그인 후 재시도")
+                if self.login():
+                    response_xml = self._soap_request(SELECT_ENC, encrypted_param)
 
             if response_xml:
                 self.logger.info("✓ 송장 데이터 조회 성공")
@@ -0,0 +1,293 @@
+"""
+로젠택배 SOAP 코덱
+- 사용하는 SOAP 메서드를 선언으로 정의 (Fiddler 캡처에서 이름/네임스페이스/파라미터만 옮기면 됨)
+- 요청 본문은 미리 만들어 둔 바이트 조각을 이어 붙여 생성, 값은 XML 이스케이프
+- 응답은 결과 형식(Base64 / DataSet / 텍스트)에 맞는 타입 객체로 변환
+
+새 메서드 추가 예:
+    W_FC_NTx_Something = declare(
+        'W_FC_NTx_Something', NS_FC, 'data_soap',
+        params=[Param('arrParam', STRING_ARRAY)],
+        result=RESULT_DATASET,
+    )
+"""
+
+import base64
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional
+
+from logen_dataset import parse_dataset_result
+from logen_decryptor import TableData
+from logen_soap_stream import SoapResultReader, read_soap_result
+
+NS_COMM = "http://ilogen.ilogen.com/iLOGEN.COMM.WebService/"
+NS_FC = "http://ilogen.ilogen.com/iLOGEN.FC.WebService/"
+
+USER_AGENT = 'Mozilla/4.0 (compatible; MSIE 6.0; MS Web Services Client Protocol 2.0.50727.9179)'
+
+# 파라미터 형식
+STRING = 'string'               # <name>값</name>
+STRING_ARRAY = 'string[]'       # <name><string>값</string>...</name>
+BASE64 = 'base64'               # <name>Base64</name> (bytes는 인코딩, str은 Base64 문자열로 간주)
+
+# 결과 형식
+RESULT_TEXT = 'text'            # 결과 요소의 텍스트
+RESULT_BASE64 = 'base64'        # Base64 → 바이트 (스트리밍 디코딩 가능)
+RESULT_DATASET = 'dataset'      # DataSet XML (xs:schema + diffgram) → TableData 목록
+
+# 로젠 클라이언트(.NET 2.0)가 보내는 것과 같은 형태의 Envelope (공백 없음)
+_ENVELOPE_HEAD = (
+    b'<?xml version="1.0" encoding="utf-8"?>'
+    b'<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/" '
+    b'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+    b'xmlns:xsd="http://www.w3.org/2001/XMLSchema"><soap:Body>'
+)
+_ENVELOPE_TAIL = b'</soap:Body></soap:Envelope>'
+
+# 멱등 SOAP 메서드 (조회/로그인) - 전송 계층이 재시도해도 되는 요청
+_IDEMPOTENT_ACTION = re.compile(r'_(Select\w*|Login\w*)$')
+
+_XML_SPECIAL = re.compile(r'[&<>]')
+_XML_INVALID = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+_XML_ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;'}
+
+
+def is_idempotent(soap_action: str) -> bool:
+    """SOAPAction이 다시 보내도 되는 요청(조회/로그인)인지 확인합니다."""
+    return bool(_IDEMPOTENT_ACTION.search(soap_action.strip('"')))
+
+
+def xml_escape(value) -> bytes:
+    """
+    요소 텍스트로 넣을 값을 이스케이프하여 UTF-8 바이트로 반환합니다.
+
+    Raises:
+        ValueError: XML 1.0에서 쓸 수 없는 제어 문자가 있는 경우
+    """
+    text = '' if value is None else str(value)
+    # 대부분의 값(아이디, IP, Base64)은 이스케이프할 것이 없으므로 검사만 하고 바로 인코딩
+    if text.isprintable() and '&' not in text and '<' not in text and '>' not in text:
+        return text.encode('utf-8')
+    if _XML_INVALID.search(text):
+        raise ValueError(f"XML에 넣을 수 없는 문자가 포함되어 있습니다: {text!r}")
+    if _XML_SPECIAL.search(text):
+        text = _XML_SPECIAL.sub(lambda m: _XML_ESCAPES[m.group()], text)
+    return text.encode('utf-8')
+
+
+class Param:
+    """
+    SOAP 파라미터 선언
+
+    Args:
+        name: 요소 이름 (예: "arrParam", "bytDataParam")
+        kind: STRING / STRING_ARRAY / BASE64
+    """
+
+    __slots__ = ('name', 'kind', 'open', 'close')
+
+    def __init__(self, name: str, kind: str = STRING):
+        if kind not in (STRING, STRING_ARRAY, BASE64):
+            raise ValueError(f"알 수 없는 파라미터 형식: {kind}")
+        self.name = name
+        self.kind = kind
+        self.open = f'<{name}>'.encode('ascii')
+        self.close = f'</{name}>'.encode('ascii')
+
+    def encode(self, value, parts: List[bytes]):
+        parts.append(self.open)
+        if self.kind == STRING_ARRAY:
+            for item in value:
+                parts.append(b'<string>')
+                parts.append(xml_escape(item))
+                parts.append(b'</string>')
+        elif self.kind == BASE64 and isinstance(value, (bytes, bytearray, memoryview)):
+            parts.append(base64.b64encode(value))
+        else:
+            parts.append(xml_escape(value))
+        parts.append(self.close)
+
+
+class TextResult:
+    """결과 요소의 텍스트 (예: 로그인 결과)"""
+
+    __slots__ = ('text',)
+
+    def __init__(self, text: Optional[str]):
+        self.text = text
+
+    def __repr__(self):
+        return f"TextResult({self.text!r})"
+
+
+class EncryptedResult:
+    """Base64 결과를 디코딩한 바이트 (예: 암호화된 송장 데이터)"""
+
+    __slots__ = ('payload',)
+
+    def __init__(self, payload: bytearray):
+        self.payload = payload
+
+    def __len__(self):
+        return len(self.payload)
+
+    def __repr__(self):
+        return f"EncryptedResult({len(self.payload)} bytes)"
+
+
+class DataSetResult:
+    """DataSet 결과 (테이블 목록)"""
+
+    __slots__ = ('tables',)
+
+    def __init__(self, tables: List[TableData]):
+        self.tables = tables
+
+    def table(self, name: str) -> Optional[TableData]:
+        """이름으로 테이블 찾기"""
+        return next((t for t in self.tables if t.name == name), None)
+
+    def __repr__(self):
+        return f"DataSetResult({self.tables!r})"
+
+
+class SoapOperation:
+    """
+    SOAP 메서드 선언과 요청/응답 변환
+
+    Args:
+        name: 메서드 이름 (예: "W_FC0073T_NTx_SelectEnc")
+        namespace: 서비스 네임스페이스 (NS_COMM / NS_FC)
+        service: 서비스 주소의 config api_endpoints 키 ("login_soap" / "data_soap")
+        params: Param 목록 (요청 인자 순서)
+        result: RESULT_TEXT / RESULT_BASE64 / RESULT_DATASET
+        idempotent: 재시도해도 되는 요청인지 (기본값: 이름이 _Select*, _Login*이면 True)
+    """
+
+    def __init__(self, name: str, namespace: str, service: str, params: List[Param],
+                 result: str = RESULT_TEXT, idempotent: Optional[bool] = None):
+        self.name = name
+        self.namespace = namespace
+        self.service = service
+        self.params = params
+        self.result = result
+        self.action = f"{namespace}{name}"
+        self.result_tag = f"{name}Result"
+        self.idempotent = is_idempotent(self.action) if idempotent is None else idempotent
+        self.headers = {
+            'Content-Type': 'text/xml; charset=utf-8',
+            'SOAPAction': f'"{self.action}"',
+            'User-Agent': USER_AGENT,
+        }
+
+        # 요청 본문의 고정 부분은 미리 바이트로 만들어 둠
+        self._head = _ENVELOPE_HEAD + f'<{name} xmlns="{namespace}">'.encode('ascii')
+        self._tail = f'</{name}>'.encode('ascii') + _ENVELOPE_TAIL
+
+    def __repr__(self):
+        return f"SoapOperation({self.name})"
+
+    def url(self, config: dict) -> str:
+        """config의 서비스 주소"""
+        api_config = config['api_endpoints']
+        return f"{api_config['base_url']}{api_config[self.service]}"
+
+    def encode(self, *args) -> bytes:
+        """
+        요청 본문(Envelope)을 만듭니다.
+
+        Args:
+            *args: 파라미터 값 (params 순서, STRING_ARRAY는 값 목록)
+        """
+        if len(args) != len(self.params):
+            raise TypeError(f"{self.name}: 인자 {len(self.params)}개가 필요합니다 ({len(args)}개 전달)")
+        parts = [self._head]
+        for param, value in zip(self.params, args):
+            param.encode(value, parts)
+        parts.append(self._tail)
+        return b''.join(parts)
+
+    def reader(self, size_hint: Optional[int] = None) -> SoapResultReader:
+        """Base64 결과를 점진적으로 디코딩하는 리더 (RESULT_BASE64 전용)"""
+        return SoapResultReader(self.result_tag, size_hint)
+
+    def decode_stream(self, chunks, size_hint: Optional[int] = None) -> EncryptedResult:
+        """응답 본문 청크에서 Base64 결과를 디코딩합니다. (RESULT_BASE64 전용)"""
+        return EncryptedResult(read_soap_result(chunks, self.result_tag, size_hint))
+
+    def decode(self, body):
+        """
+        응답 본문을 결과 객체로 변환합니다.
+
+        Args:
+            body: 응답 본문 (bytes 또는 str)
+
+        Returns:
+            TextResult / EncryptedResult / DataSetResult
+
+        Raises:
+            SoapFault: 응답이 SOAP Fault인 경우
+            ValueError: 결과 요소가 없는 경우
+        """
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+
+        if self.result == RESULT_BASE64:
+            return self.decode_stream((body,), len(body))
+
+        if b'Fault>' in body:
+            # Fault 판별은 스트리밍 리더와 같은 규칙 사용
+            self.reader().feed(body)
+
+        if self.result == RESULT_DATASET:
+            return DataSetResult([TableData(name, columns, rows) for name, columns, rows
+                                  in parse_dataset_result(body, self.result_tag)])
+
+        root = ET.fromstring(body)
+        for element in root.iter():
+            if element.tag == self.result_tag or element.tag.endswith('}' + self.result_tag):
+                return TextResult(''.join(element.itertext()) or None)
+        raise ValueError(f"응답에서 <{self.result_tag}> 요소를 찾을 수 없습니다")
+
+
+OPERATIONS: Dict[str, SoapOperation] = {}
+
+
+def declare(name: str, namespace: str, service: str, params: List[Param],
+            result: str = RESULT_TEXT, idempotent: Optional[bool] = None) -> SoapOperation:
+    """SOAP 메서드를 선언하고 OPERATIONS에 등록합니다."""
+    operation = SoapOperation(name, namespace, service, params, result, idempotent)
+    OPERATIONS[name] = operation
+    return operation
+
+
+def operation(name: str) -> SoapOperation:
+    """이름으로 선언된 SOAP 메서드를 찾습니다."""
+    try:
+        return OPERATIONS[name]
+    except KeyError:
+        raise KeyError(f"선언되지 않은 SOAP 메서드: {name}") from None
+
+
+# 로그인: arrParam = [업체아이디, 비밀번호, IP, MAC]
+LOGIN_ENCRYPT = declare(
+    'W_COMM_NTx_LoginEncrypt', NS_COMM, 'login_soap',
+    params=[Param('arrParam', STRING_ARRAY)],
+    result=RESULT_TEXT,
+)
+
+# 공지/메시지, 서버 시각, 클라이언트 모듈 버전: arrParam = [업체아이디] (test2.txt)
+MESSAGE_SELECT = declare(
+    'W_COMM_NTx_Message_Select', NS_COMM, 'login_soap',
+    params=[Param('arrParam', STRING_ARRAY)],
+    result=RESULT_DATASET,
+)
+
+# 송장 조회: bytDataParam = 암호화된 조회 파라미터 (test.txt / response.txt)
+SELECT_ENC = declare(
+    'W_FC0073T_NTx_SelectEnc', NS_FC, 'data_soap',
+    params=[Param('bytDataParam', BASE64)],
+    result=RESULT_BASE64,
+)
+
@@ -0,0 +1,154 @@
+"""
+로젠택배 SOAP 응답 스트리밍 처리 모듈
+- 응답 본문을 청크 단위로 읽으면서 점진적(XML) 파싱
+- 결과 요소의 Base64 텍스트를 미리 할당한 버퍼 하나에 바로 디코딩
+- SOAP Fault 감지
+"""
+
+import binascii
+from typing import Optional
+from xml.parsers import expat
+
+
+SOAP11_NS = "http://schemas.xmlsoap.org/soap/envelope/"
+SOAP12_NS = "http://www.w3.org/2003/05/soap-envelope"
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class SoapFault(Exception):
+    """서버가 SOAP Fault를 반환한 경우"""
+
+    def __init__(self, faultcode: str, faultstring: str, detail: str = None):
+        self.faultcode = faultcode
+        self.faultstring = faultstring
+        self.detail = detail
+        super().__init__(f"{faultcode}: {faultstring}")
+
+
+class SoapResultReader:
+    """
+    SOAP 응답에서 Base64 결과 요소 하나를 점진적으로 추출합니다.
+
+    `feed()`로 받은 바이트 청크를 expat 파서에 넘기고, 결과 요소 안의
+    문자 데이터는 4글자 단위로 잘라 곧바로 버퍼에 디코딩합니다.
+    응답 전체 문자열이나 Base64 문자열 전체를 메모리에 들고 있지 않습니다.
+
+    Args:
+        result_tag: 결과 요소 이름 (예: "W_FC0073T_NTx_SelectEncResult")
+        size_hint: 응답 본문 크기 (Content-Length). 지정하면 디코딩 결과의
+            최대 크기만큼 버퍼를 미리 할당합니다.
+    """
+
+    def __init__(self, result_tag: str, size_hint: Optional[int] = None):
+        self.result_tag = result_tag
+        self.buffer = bytearray((size_hint * 3) // 4 if size_hint else 0)
+        self.size = 0
+        self.found = False
+
+        self._pending = ''
+        self._in_result = False
+        self._fault_depth = 0
+        self._fault_field = None
+        self._fault = {}
+
+        self._parser = expat.ParserCreate(namespace_separator=' ')
+        self._parser.buffer_text = True
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._parser.CharacterDataHandler = self._data
+
+    @staticmethod
+    def _split(name: str):
+        """expat 이름("ns local")을 (ns, local)로 나눕니다."""
+        ns, _, local = name.rpartition(' ')
+        return ns, local
+
+    def _start(self, name, attrs):
+        ns, local = self._split(name)
+        if self._fault_depth:
+            self._fault_depth += 1
+            self._fault_field = local
+        elif local == 'Fault' and ns in (SOAP11_NS, SOAP12_NS):
+            self._fault_depth = 1
+        elif local == self.result_tag:
+            self._in_result = True
+            self.found = True
+
+    def _end(self, name):
+        if self._fault_depth:
+            self._fault_depth -= 1
+            self._fault_field = None
+            if not self._fault_depth:
+                raise SoapFault(
+                    self._fault.get('faultcode') or self._fault.get('Value', ''),
+                    self._fault.get('faultstring') or self._fault.get('Text', ''),
+                    self._fault.get('detail'),
+                )
+        elif self._in_result and self._split(name)[1] == self.result_tag:
+            self._flush(final=True)
+            self._in_result = False
+
+    def _data(self, text):
+        if self._in_result:
+            self._pending += text
+            if len(self._pending) >= DEFAULT_CHUNK_SIZE:
+                self._flush()
+        elif self._fault_field:
+            self._fault[self._fault_field] = self._fault.get(self._fault_field, '') + text
+
+    def _flush(self, final: bool = False):
+        """보류 중인 Base64 문자를 4글자 단위로 디코딩하여 버퍼에 씁니다."""
+        text = ''.join(self._pending.split())
+
+        usable = len(text) if final else len(text) - len(text) % 4
+        self._pending = text[usable:]
+        if not usable:
+            return
+
+        decoded = binascii.a2b_base64(text[:usable])
+        end = self.size + len(decoded)
+        if end > len(self.buffer):
+            self.buffer.extend(bytes(end - len(self.buffer)))
+        self.buffer[self.size:end] = decoded
+        self.size = end
+
+    def feed(self, chunk: bytes):
+        """응답 본문 청크를 파서에 넘깁니다. SOAP Fault면 SoapFault를 발생시킵니다."""
+        self._parser.Parse(chunk, False)
+
+    def close(self) -> bytearray:
+        """
+        파싱을 마치고 디코딩된 결과를 반환합니다.
+
+        Returns:
+            bytearray: 디코딩된 결과 (버퍼를 실제 크기로 줄여서 반환)
+
+        Raises:
+            SoapFault: 응답이 SOAP Fault인 경우
+            ValueError: 결과 요소가 없는 경우
+        """
+        self._parser.Parse(b'', True)
+        if not self.found:
+            raise ValueError(f"응답에서 <{self.result_tag}> 요소를 찾을 수 없습니다")
+        del self.buffer[self.size:]
+        return self.buffer
+
+
+def read_soap_result(chunks, result_tag: str, size_hint: Optional[int] = None) -> bytearray:
+    """
+    바이트 청크 반복자에서 Base64 결과 요소를 디코딩하여 반환합니다.
+
+    Args:
+        chunks: 응답 본문 청크 반복자 (예: response.iter_content())
+        result_tag: 결과 요소 이름
+        size_hint: 응답 본문 크기 (Content-Length)
+
+    Returns:
+        bytearray: 디코딩된 결과
+    """
+    reader = SoapResultReader(result_tag, size_hint)
+    for chunk in chunks:
+        if chunk:
+            reader.feed(chunk)
+    return reader.close()
@@ -0,0 +1,322 @@
+"""
+로젠택배 단계 체크포인트 캐시
+- 조회 결과(암호화된 바이트)와 복호화 결과(테이블)를 조회별로 디스크에 보관
+- 엑셀 저장 등 내보내기가 실패하면 다음 실행은 로그인/조회/복호화 없이 마지막 단계부터 재개
+- 같은 결과를 다른 형식으로 다시 내보낼 때(--from-cache) 네트워크를 사용하지 않음
+- 파일은 내용의 해시로 저장 (같은 결과는 한 번만 저장), 유효 시간(TTL)과 전체 크기 제한으로 정리
+
+조회 키 = 업체 아이디 + 조회 파라미터 + 날짜
+내보내기에 성공한 조회는 exported로 표시되어, 다음 정기 실행은 캐시를 쓰지 않고 새로 조회합니다.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Optional
+
+from logen_decryptor import TableData
+
+DEFAULT_STAGE_CACHE = {
+    'enabled': True,
+    'ttl_seconds': 3600,
+    'max_bytes': 512 * 1024 * 1024,
+}
+
+STAGE_PAYLOAD = 'payload'
+STAGE_TABLES = 'tables'
+
+
+def encode_tables(tables: List[TableData]) -> bytes:
+    """테이블 목록을 캐시 파일 내용으로 변환합니다. (zlib + JSON)"""
+    body = json.dumps(
+        [[t.name, t.columns, t.rows] for t in tables],
+        ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+    return zlib.compress(body, 1)
+
+
+def decode_tables(data: bytes) -> List[TableData]:
+    """encode_tables의 역변환"""
+    return [TableData(name, columns, rows)
+            for name, columns, rows in json.loads(zlib.decompress(data).decode('utf-8'))]
+
+
+class Checkpoint:
+    """조회 하나의 캐시 항목"""
+
+    __slots__ = ('key', 'payload', 'tables', 'created_at', 'exported')
+
+    def __init__(self, key: str, payload: Optional[str], tables: Optional[str],
+                 created_at: float, exported: bool):
+        self.key = key
+        self.payload = payload
+        self.tables = tables
+        self.created_at = created_at
+        self.exported = exported
+
+    @property
+    def stage(self) -> Optional[str]:
+        """마지막으로 완료된 단계"""
+        if self.tables:
+            return STAGE_TABLES
+        if self.payload:
+            return STAGE_PAYLOAD
+        return None
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+
+class StageCache:
+    """
+    단계 체크포인트 캐시
+
+    folder/index.db에 조회 키별 항목을, folder/objects/에 내용 해시 이름의 파일을 둡니다.
+
+    Args:
+        folder: 캐시 폴더
+        ttl_seconds: 항목 유효 시간(초)
+        max_bytes: 캐시 파일 전체 크기 제한 (넘으면 오래 쓰지 않은 항목부터 삭제)
+        logger: 로거
+    """
+
+    def __init__(self, folder, ttl_seconds: float = DEFAULT_STAGE_CACHE['ttl_seconds'],
+                 max_bytes: int = DEFAULT_STAGE_CACHE['max_bytes'], logger=None):
+        self.folder = Path(folder)
+        self.objects = self.folder / 'objects'
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.folder / 'index.db'), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS checkpoints (
+                   cache_key      TEXT PRIMARY KEY,
+                   payload        TEXT,
+                   tables         TEXT,
+                   created_at     REAL NOT NULL,
+                   accessed_at    REAL NOT NULL,
+                   exported       INTEGER NOT NULL DEFAULT 0
+               )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS objects (
+                   digest  TEXT PRIMARY KEY,
+                   size    INTEGER NOT NULL
+               )"""
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def key(account: str, query_param: str, day: Optional[date] = None) -> str:
+        """조회 키 (업체 아이디 + 조회 파라미터 + 날짜)"""
+        day = day or date.today()
+        return hashlib.blake2b(
+            f"{account}\n{query_param}\n{day:%Y-%m-%d}".encode('utf-8'), digest_size=16
+        ).hexdigest()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest
+
+    def _write_object(self, data: bytes) -> str:
+        """내용 해시 이름으로 파일을 씁니다. (같은 내용이 있으면 그대로 사용)"""
+        digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            temp_path = path.with_name(f".{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        return digest
+
+    def _read_object(self, digest: Optional[str]) -> Optional[bytes]:
+        if not digest:
+            return None
+        try:
+            return self._object_path(digest).read_bytes()
+        except OSError:
+            return None
+
+    def checkpoint(self, cache_key: str, include_exported: bool = False) -> Optional[Checkpoint]:
+        """
+        유효한 캐시 항목을 조회합니다.
+
+        Args:
+            cache_key: 조회 키
+            include_exported: True면 이미 내보낸 조회도 반환 (다시 내보내기용)
+
+        Returns:
+            Checkpoint 또는 None (없거나, 만료되었거나, 이미 내보낸 경우)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, tables, created_at, exported FROM checkpoints WHERE cache_key = ?",
+                (cache_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        checkpoint = Checkpoint(cache_key, row[0], row[1], row[2], bool(row[3]))
+        if checkpoint.age > self.ttl_seconds or (checkpoint.exported and not include_exported):
+            return None
+        return checkpoint
+
+    def load_payload(self, checkpoint: Checkpoint) -> Optional[bytes]:
+        """캐시된 조회 결과 (파일이 없으면 None)"""
+        data = self._read_object(checkpoint.payload)
+        if data is not None:
+            self._touch(checkpoint.key)
+        return data
+
+    def load_tables(self, checkpoint: Checkpoint) -> Optional[List[TableData]]:
+        """캐시된 복호화 결과 (파일이 없거나 손상되었으면 None)"""
+        data = self._read_object(checkpoint.tables)
+        if data is None:
+            return None
+        try:
+            tables = decode_tables(data)
+        except (zlib.error, ValueError) as e:
+            self.logger.warning(f"캐시된 복호화 결과를 읽을 수 없습니다: {e}")
+            return None
+        self._touch(checkpoint.key)
+        return tables
+
+    def _touch(self, cache_key: str):
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE checkpoints SET accessed_at = ? WHERE cache_key = ?", (time.time(), cache_key)
+                )
+
+    def save_payload(self, cache_key: str, payload) -> str:
+        """
+        조회 결과를 저장합니다. 새 조회이므로 이전 복호화 결과와 내보내기 표시는 지웁니다.
+
+        Returns:
+            str: 저장한 파일의 해시
+        """
+        payload = bytes(payload)
+        digest = self._write_object(payload)
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO objects (digest, size) VALUES (?, ?)", (digest, len(payload))
+                )
+                self._conn.execute(
+                    """INSERT INTO checkpoints (cache_key, payload, tables, created_at, accessed_at, exported)
+                       VALUES (?, ?, NULL, ?, ?, 0)
+                       ON CONFLICT(cache_key) DO UPDATE SET
+                           payload = excluded.payload,
+                           tables = NULL,
+                           created_at = excluded.created_at,
+                           accessed_at = excluded.accessed_at,
+                           exported = 0""",
+                    (cache_key, digest, now, now)
+                )
+        self.evict()
+        return digest
+
+    def save_tables(self, cache_key: str, tables: List[TableData]) -> str:
+        """복호화 결과를 저장합니다. (save_payload 다음에 호출)"""
+        data = encode_tables(tables)
+        digest = self._write_object(data)
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO objects (digest, size) VALUES (?, ?)", (digest, len(data))
+                )
+                self._conn.execute(
+                    "UPDATE checkpoints SET tables = ?, accessed_at = ? WHERE cache_key = ?",
+                    (digest, time.time(), cache_key)
+                )
+        self.evict()
+        return digest
+
+    def mark_exported(self, cache_key: str):
+        """내보내기에 성공했음을 기록합니다. (다음 정기 실행은 새로 조회)"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("UPDATE checkpoints SET exported = 1 WHERE cache_key = ?", (cache_key,))
+
+    def evict(self) -> int:
+        """
+        만료된 항목과 크기 제한을 넘는 항목(오래 쓰지 않은 순)을 지우고,
+        어느 항목도 가리키지 않는 파일을 삭제합니다.
+
+        Returns:
+            int: 삭제한 파일 수
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM checkpoints WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+                )
+                total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+                if total > self.max_bytes:
+                    entries = self._conn.execute(
+                        """SELECT c.cache_key, COALESCE(p.size, 0) + COALESCE(t.size, 0)
+                           FROM checkpoints c
+                           LEFT JOIN objects p ON p.digest = c.payload
+                           LEFT JOIN objects t ON t.digest = c.tables
+                           ORDER BY c.accessed_at"""
+                    ).fetchall()
+                    for cache_key, size in entries:
+                        if total <= self.max_bytes:
+                            break
+                        self._conn.execute("DELETE FROM checkpoints WHERE cache_key = ?", (cache_key,))
+                        total -= size
+                orphans = [digest for (digest,) in self._conn.execute(
+                    """SELECT digest FROM objects WHERE digest NOT IN (
+                           SELECT payload FROM checkpoints WHERE payload IS NOT NULL
+                           UNION SELECT tables FROM checkpoints WHERE tables IS NOT NULL)"""
+                )]
+                self._conn.executemany("DELETE FROM objects WHERE digest = ?", ((d,) for d in orphans))
+
+        for digest in orphans:
+            try:
+                self._object_path(digest).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning(f"캐시 파일 삭제 실패: {e}")
+        return len(orphans)
+
+    def stats(self) -> dict:
+        """캐시 항목 수와 전체 크기"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+            objects, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects"
+            ).fetchone()
+        return {'entries': entries, 'objects': objects, 'bytes': size}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def stage_cache_options(config: dict) -> dict:
+    """config의 stage_cache 항목에 기본값을 채웁니다."""
+    options = {**DEFAULT_STAGE_CACHE, **config.get('stage_cache', {})}
+    options.setdefault('folder', str(Path(config['paths']['download_folder']) / '.stage_cache'))
+    return options
+
+
+def describe_checkpoint(checkpoint: Checkpoint) -> str:
+    """캐시 항목을 한 줄로 표시합니다."""
+    created = datetime.fromtimestamp(checkpoint.created_at).strftime('%H:%M:%S')
+    stage = '복호화 결과' if checkpoint.stage == STAGE_TABLES else '조회 결과'
+    return f"{stage} ({created} 조회, {checkpoint.age / 60:.0f}분 전)"
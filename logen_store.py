@@ -0,0 +1,212 @@
+"""
+로젠택배 송장 저장소 모듈
+- 복호화된 DT6 데이터를 로컬 SQLite에 누적 저장 (운송장번호 기준 upsert)
+- 주문번호 / 운송장번호 / 접수일자 / 수하인 전화번호 인덱스
+- 주문번호 → 운송장번호 조회
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Optional
+
+_NON_DIGIT = re.compile(r'\D')
+
+# 결과로 돌려주는 기본 컬럼
+SUMMARY_COLUMNS = [
+    'SLIP_NO', 'FIX_TAKE_NO', 'TAKE_DT', 'RCV_CUST_NM', 'RCV_HAND_NO', 'RCV_TEL_NO',
+    'RCV_CUST_ADDR1', 'ITEM_NM', 'PRINT_TIME',
+]
+
+
+def normalize_phone(value: Optional[str]) -> Optional[str]:
+    """전화번호에서 숫자만 남깁니다. (예: "010-7187-8325" → "01071878325")"""
+    if not value:
+        return None
+    digits = _NON_DIGIT.sub('', value)
+    return digits or None
+
+
+class InvoiceStore:
+    """
+    송장 저장소 (SQLite, WAL 모드)
+
+    행 전체는 JSON으로 저장하고, 조회에 쓰는 값만 인덱스 컬럼으로 둡니다.
+    전화번호는 휴대폰/일반 전화를 숫자만 남겨 저장하고, 뒤집은 값을 인덱싱하여
+    전체 번호와 뒷자리 조회를 같은 인덱스 범위 검색으로 처리합니다.
+
+    Args:
+        path: DB 파일 경로
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS invoices (
+                       slip_no       TEXT PRIMARY KEY,
+                       fix_take_no   TEXT,
+                       take_dt       TEXT,
+                       rcv_cust_nm   TEXT,
+                       rcv_phone     TEXT,
+                       rcv_phone_rev TEXT,
+                       rcv_tel       TEXT,
+                       rcv_tel_rev   TEXT,
+                       account       TEXT,
+                       updated_at    TEXT NOT NULL,
+                       data          TEXT NOT NULL
+                   )"""
+            )
+            for name, column in (
+                ('idx_invoices_order', 'fix_take_no'),
+                ('idx_invoices_take_dt', 'take_dt'),
+                ('idx_invoices_name', 'rcv_cust_nm'),
+                ('idx_invoices_phone_rev', 'rcv_phone_rev'),
+                ('idx_invoices_tel_rev', 'rcv_tel_rev'),
+            ):
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON invoices({column})")
+
+    def upsert_rows(self, columns: List[str], rows, account: str = None) -> int:
+        """
+        DT6 행을 저장합니다. 같은 운송장번호는 최신 값으로 덮어씁니다.
+
+        Args:
+            columns: 컬럼명 목록
+            rows: 행 목록 (columns 순서)
+            account: 업체 아이디
+
+        Returns:
+            int: 저장한 행 수 (운송장번호가 없는 행은 제외)
+        """
+        index = {name: i for i, name in enumerate(columns)}
+        slip_i = index.get('SLIP_NO')
+        if slip_i is None:
+            return 0
+
+        def value(row, name):
+            i = index.get(name)
+            return row[i] if i is not None else None
+
+        updated_at = datetime.now().isoformat(timespec='seconds')
+        records = []
+        for row in rows:
+            slip_no = row[slip_i]
+            if not slip_no:
+                continue
+            phone = normalize_phone(value(row, 'RCV_HAND_NO'))
+            tel = normalize_phone(value(row, 'RCV_TEL_NO'))
+            records.append((
+                slip_no,
+                value(row, 'FIX_TAKE_NO'),
+                value(row, 'TAKE_DT'),
+                value(row, 'RCV_CUST_NM'),
+                phone, phone[::-1] if phone else None,
+                tel, tel[::-1] if tel else None,
+                account,
+                updated_at,
+                json.dumps(dict(zip(columns, row)), ensure_ascii=False),
+            ))
+
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    """INSERT INTO invoices
+                           (slip_no, fix_take_no, take_dt, rcv_cust_nm, rcv_phone, rcv_phone_rev,
+                            rcv_tel, rcv_tel_rev, account, updated_at, data)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(slip_no) DO UPDATE SET
+                           fix_take_no   = excluded.fix_take_no,
+                           take_dt       = excluded.take_dt,
+                           rcv_cust_nm   = excluded.rcv_cust_nm,
+                           rcv_phone     = excluded.rcv_phone,
+                           rcv_phone_rev = excluded.rcv_phone_rev,
+                           rcv_tel       = excluded.rcv_tel,
+                           rcv_tel_rev   = excluded.rcv_tel_rev,
+                           account       = excluded.account,
+                           updated_at    = excluded.updated_at,
+                           data          = excluded.data""",
+                    records
+                )
+        return len(records)
+
+    def upsert_table(self, table, account: str = None) -> int:
+        """TableData(DT6)를 저장합니다."""
+        return self.upsert_rows(table.columns, table.rows, account)
+
+    def _select(self, where: str, params: tuple, limit: int) -> List[dict]:
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT data FROM invoices WHERE {where} ORDER BY take_dt DESC, slip_no LIMIT ?",
+                params + (limit,)
+            )
+            return [json.loads(row['data']) for row in cursor]
+
+    def by_order(self, order_no: str, limit: int = 100) -> List[dict]:
+        """주문번호(FIX_TAKE_NO)로 조회"""
+        return self._select("fix_take_no = ?", (order_no,), limit)
+
+    def by_slip(self, slip_no: str, limit: int = 100) -> List[dict]:
+        """운송장번호(SLIP_NO)로 조회"""
+        return self._select("slip_no = ?", (slip_no,), limit)
+
+    def by_phone(self, phone: str, limit: int = 100) -> List[dict]:
+        """
+        수하인 전화번호로 조회 (휴대폰/일반 전화)
+
+        전체 번호 또는 뒷자리(예: "8325")로 조회할 수 있습니다.
+        """
+        digits = normalize_phone(phone)
+        if not digits:
+            return []
+        reverse = digits[::-1]
+        upper = reverse + '\uffff'
+        return self._select(
+            "(rcv_phone_rev >= ? AND rcv_phone_rev < ?) OR (rcv_tel_rev >= ? AND rcv_tel_rev < ?)",
+            (reverse, upper, reverse, upper), limit
+        )
+
+    def by_name(self, name: str, take_dt: str = None, limit: int = 100) -> List[dict]:
+        """수하인명으로 조회 (접수일자 YYYYMMDD로 좁힐 수 있음)"""
+        if take_dt:
+            return self._select("rcv_cust_nm = ? AND take_dt = ?", (name, take_dt), limit)
+        return self._select("rcv_cust_nm = ?", (name,), limit)
+
+    def by_date(self, take_dt: str, limit: int = 100000) -> List[dict]:
+        """접수일자(YYYYMMDD)로 조회"""
+        return self._select("take_dt = ?", (take_dt,), limit)
+
+    def iter_all(self, columns: List[str] = None):
+        """저장된 모든 송장을 반환합니다. (columns를 주면 해당 컬럼만)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM invoices").fetchall()
+        for row in rows:
+            data = json.loads(row['data'])
+            yield {c: data.get(c) for c in columns} if columns else data
+
+    def count(self) -> int:
+        """저장된 송장 수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM invoices").fetchone()[0]
+
+    def data_version(self) -> int:
+        """
+        다른 연결(다른 프로세스)이 저장소를 갱신했는지 확인하는 값
+
+        이 연결이 아닌 곳에서 커밋이 일어나면 값이 바뀝니다.
+        """
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,219 @@
+"""
+로젠택배 증분 동기화 모듈
+- 이미 내보낸 송장(SLIP_NO / FIX_TAKE_NO)을 로컬 SQLite에 기록
+- 새 송장과 재출력된 송장(PRINT_COUNT / PRINT_TIME 변경)만 골라냄
+- 기록/내보내기 비용이 하루 전체 건수가 아니라 변경분에 비례
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+# SQLite 한 쿼리당 바인딩 변수 수 제한(999)보다 작게
+_QUERY_CHUNK = 500
+
+
+class SyncStateStore:
+    """
+    내보낸 송장 상태 저장소 (SQLite)
+
+    Args:
+        path: 상태 DB 파일 경로
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS exported (
+                   slip_key     TEXT PRIMARY KEY,
+                   slip_no      TEXT,
+                   fix_take_no  TEXT,
+                   take_dt      TEXT,
+                   print_count  TEXT,
+                   print_time   TEXT,
+                   exported_at  TEXT NOT NULL
+               )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS watch (
+                   watch_key        TEXT PRIMARY KEY,
+                   payload_hash     TEXT,
+                   batch_signature  TEXT,
+                   skipped          INTEGER NOT NULL DEFAULT 0,
+                   updated_at       TEXT NOT NULL
+               )"""
+        )
+        self._conn.commit()
+
+    def known(self, keys: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+        """
+        이미 내보낸 송장의 (PRINT_COUNT, PRINT_TIME)을 조회합니다.
+
+        Args:
+            keys: 송장 키 목록
+
+        Returns:
+            dict: 송장 키 → (PRINT_COUNT, PRINT_TIME), 내보낸 적 없는 키는 제외
+        """
+        keys = list(keys)
+        result = {}
+        with self._lock:
+            for start in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[start:start + _QUERY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                cursor = self._conn.execute(
+                    f"SELECT slip_key, print_count, print_time FROM exported "
+                    f"WHERE slip_key IN ({placeholders})",
+                    chunk
+                )
+                for slip_key, print_count, print_time in cursor:
+                    result[slip_key] = (print_count, print_time)
+        return result
+
+    def record(self, rows: Iterable[tuple]):
+        """
+        내보낸 송장을 기록합니다.
+
+        Args:
+            rows: (slip_key, slip_no, fix_take_no, take_dt, print_count, print_time) 목록
+        """
+        exported_at = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    """INSERT INTO exported
+                           (slip_key, slip_no, fix_take_no, take_dt, print_count, print_time, exported_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(slip_key) DO UPDATE SET
+                           print_count = excluded.print_count,
+                           print_time  = excluded.print_time,
+                           exported_at = excluded.exported_at""",
+                    (row + (exported_at,) for row in rows)
+                )
+
+    def watch_state(self, watch_key: str) -> Optional[Tuple[str, str, int]]:
+        """
+        마지막으로 내보낸 조회 결과의 변경 감지 값을 조회합니다.
+
+        Returns:
+            tuple: (payload_hash, batch_signature, 누적 건너뜀 수) 또는 None
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT payload_hash, batch_signature, skipped FROM watch WHERE watch_key = ?",
+                (watch_key,)
+            ).fetchone()
+
+    def record_watch(self, watch_key: str, payload_hash: str, batch_signature: str):
+        """내보낸 조회 결과의 변경 감지 값을 기록합니다."""
+        updated_at = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    """INSERT INTO watch (watch_key, payload_hash, batch_signature, updated_at)
+                       VALUES (?, ?, ?, ?)
+                       ON CONFLICT(watch_key) DO UPDATE SET
+                           payload_hash    = excluded.payload_hash,
+                           batch_signature = excluded.batch_signature,
+                           updated_at      = excluded.updated_at""",
+                    (watch_key, payload_hash, batch_signature, updated_at)
+                )
+
+    def record_watch_skip(self, watch_key: str):
+        """변경이 없어 건너뛴 조회 수를 누적합니다."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE watch SET skipped = skipped + 1 WHERE watch_key = ?", (watch_key,)
+                )
+
+    def count(self) -> int:
+        """기록된 송장 수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM exported").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class IncrementalSync:
+    """
+    DT6 데이터에서 새 송장/재출력 송장만 골라냅니다.
+
+    송장 키는 SLIP_NO(운송장번호)이며, 없으면 FIX_TAKE_NO(주문번호)를 사용합니다.
+    이미 내보낸 송장이라도 PRINT_COUNT나 PRINT_TIME이 바뀌었으면
+    재출력된 것으로 보고 다시 내보냅니다.
+
+    Args:
+        store: SyncStateStore
+    """
+
+    def __init__(self, store: SyncStateStore):
+        self.store = store
+
+    @staticmethod
+    def _column(df, name):
+        """
+        컬럼 값을 원본 문자열 목록으로
+        (형식 변환된 DataFrame의 숫자/날짜/범주형도 문자열 DataFrame과 같은 값으로 저장/비교)
+        """
+        from logen_schema import DT6_SCHEMA, format_column
+
+        if name in df.columns:
+            column = format_column(df[name], DT6_SCHEMA.get(name))
+            return [str(value) if present else None
+                    for value, present in zip(column.tolist(), column.notna().tolist())]
+        return [None] * len(df)
+
+    def _keys(self, df):
+        slip_nos = self._column(df, 'SLIP_NO')
+        fix_take_nos = self._column(df, 'FIX_TAKE_NO')
+        return [
+            f"S:{slip}" if slip else (f"O:{order}" if order else None)
+            for slip, order in zip(slip_nos, fix_take_nos)
+        ]
+
+    def delta(self, df):
+        """
+        새 송장/재출력 송장만 남긴 DataFrame과 통계를 반환합니다.
+
+        Returns:
+            tuple: (변경분 DataFrame, {'total', 'new', 'reprinted', 'unchanged'})
+        """
+        keys = self._keys(df)
+        print_counts = self._column(df, 'PRINT_COUNT')
+        print_times = self._column(df, 'PRINT_TIME')
+        known = self.store.known(k for k in keys if k)
+
+        stats = {'total': len(df), 'new': 0, 'reprinted': 0, 'unchanged': 0}
+        mask = []
+        for key, print_count, print_time in zip(keys, print_counts, print_times):
+            previous = known.get(key) if key else None
+            if previous is None:
+                stats['new'] += 1
+                mask.append(True)
+            elif previous != (print_count, print_time):
+                stats['reprinted'] += 1
+                mask.append(True)
+            else:
+                stats['unchanged'] += 1
+                mask.append(False)
+
+        return df[mask], stats
+
+    def commit(self, delta_df):
+        """내보낸 변경분을 상태 저장소에 기록합니다. (내보내기 성공 후 호출)"""
+        keys = self._keys(delta_df)
+        columns = [self._column(delta_df, name)
+                   for name in ('SLIP_NO', 'FIX_TAKE_NO', 'TAKE_DT', 'PRINT_COUNT', 'PRINT_TIME')]
+        self.store.record(
+            (key, *values)
+            for key, *values in zip(keys, *columns)
+            if key
+        )
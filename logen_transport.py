@@ -0,0 +1,319 @@
+"""
+로젠택배 SOAP 전송 계층
+- 호스트별 keep-alive 연결 풀 크기 설정
+- 멱등 요청(조회/로그인)만 재시도, 지터를 준 지수 백오프
+- 프로세스 전체 재시도 예산 (장애 시 재시도가 요청량을 몇 배로 늘리지 않도록)
+- 호스트별 서킷 브레이커 (서버 장애 중에는 타임아웃을 기다리지 않고 바로 실패)
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+# 재시도할 HTTP 상태 코드 (500은 SOAP Fault이므로 재시도하지 않음)
+RETRY_STATUS = (502, 503, 504)
+
+DEFAULT_TRANSPORT = {
+    'pool_connections': 4,
+    'pool_maxsize': 10,
+    'connect_timeout': 5,
+    'max_attempts': 3,
+    'backoff_base': 0.5,
+    'backoff_max': 8.0,
+    'retry_budget_ratio': 0.2,
+    'retry_budget_min': 3,
+    'retry_budget_window': 10.0,
+    'breaker_failures': 5,
+    'breaker_reset': 30.0,
+}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """서킷 브레이커가 열려 있어 요청을 보내지 않음"""
+
+
+def _not_sent(error: requests.exceptions.RequestException) -> bool:
+    """요청이 서버에 전달되기 전의 연결 단계 실패인지 확인합니다."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        return isinstance(getattr(error.args[0], 'reason', None), NewConnectionError)
+    return False
+
+
+class RetryBudget:
+    """
+    재시도 예산
+
+    최근 window초 동안의 재시도 수를 요청 수의 ratio 배(최소 minimum회)로
+    제한합니다. 서버 장애 시 모든 스레드가 재시도하여 부하를 키우는 것을 막습니다.
+
+    Args:
+        ratio: 요청 대비 허용 재시도 비율
+        minimum: 요청 수와 관계없이 허용하는 재시도 수
+        window: 집계 구간(초)
+    """
+
+    def __init__(self, ratio: float = 0.2, minimum: int = 3, window: float = 10.0):
+        self.ratio = ratio
+        self.minimum = minimum
+        self.window = window
+        self._lock = threading.Lock()
+        self._requests = deque()
+        self._retries = deque()
+        self.exhausted = 0
+
+    def _trim(self, now: float):
+        for events in (self._requests, self._retries):
+            while events and events[0] < now - self.window:
+                events.popleft()
+
+    def record_request(self):
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            self._requests.append(now)
+
+    def try_retry(self) -> bool:
+        """재시도 가능하면 예산을 사용하고 True를 반환합니다."""
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            if len(self._retries) >= max(self.minimum, self.ratio * len(self._requests)):
+                self.exhausted += 1
+                return False
+            self._retries.append(now)
+            return True
+
+
+class CircuitBreaker:
+    """
+    서킷 브레이커
+
+    연속 failures회 실패하면 열림(open) 상태가 되어 reset초 동안 요청을 바로
+    거부합니다. 그 뒤 요청 하나만 시험 삼아 보내고(half-open), 성공하면 닫힙니다.
+
+    Args:
+        host: 대상 호스트 (로그 표시용)
+        failures: 열림 상태로 바뀌는 연속 실패 수
+        reset: 열림 상태 유지 시간(초)
+        logger: 로거
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, host: str, failures: int = 5, reset: float = 30.0,
+                 logger: Optional[logging.Logger] = None):
+        self.host = host
+        self.failures = failures
+        self.reset = reset
+        self.logger = logger or logging.getLogger(__name__)
+        self.state = self.CLOSED
+        self._lock = threading.Lock()
+        self._consecutive = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.rejected = 0
+
+    def allow(self):
+        """요청을 보내도 되는지 확인합니다. 안 되면 CircuitOpenError"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.rejected += 1
+            remaining = max(0.0, self.reset - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(
+            f"{self.host} 서버 응답 없음 - 서킷 브레이커 열림 ({remaining:.0f}초 후 재시도)"
+        )
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                self.logger.info(f"✓ {self.host} 연결 복구 - 서킷 브레이커 닫힘")
+            self.state = self.CLOSED
+            self._consecutive = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive += 1
+            if self.state == self.HALF_OPEN or (
+                    self.state == self.CLOSED and self._consecutive >= self.failures):
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+                self.logger.error(
+                    f"✗ {self.host} 연속 {self._consecutive}회 실패 - "
+                    f"{self.reset:.0f}초 동안 요청 차단"
+                )
+
+
+_registry_lock = threading.Lock()
+_breakers: Dict[str, CircuitBreaker] = {}
+_budget: Optional[RetryBudget] = None
+
+
+def get_circuit_breaker(host: str, options: dict, logger=None) -> CircuitBreaker:
+    """호스트별 프로세스 공유 서킷 브레이커"""
+    with _registry_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(
+                host, options['breaker_failures'], options['breaker_reset'], logger
+            )
+        return breaker
+
+
+def get_retry_budget(options: dict) -> RetryBudget:
+    """프로세스 공유 재시도 예산"""
+    global _budget
+    with _registry_lock:
+        if _budget is None:
+            _budget = RetryBudget(
+                options['retry_budget_ratio'], options['retry_budget_min'],
+                options['retry_budget_window']
+            )
+        return _budget
+
+
+def transport_options(config: dict) -> dict:
+    """config의 transport 항목에 기본값을 채웁니다."""
+    options = {**DEFAULT_TRANSPORT, **config.get('transport', {})}
+    options.setdefault('read_timeout', config['settings']['timeout'])
+    # 기간 조회의 동시 요청 수보다 풀이 작으면 연결을 매번 새로 맺게 됨
+    in_flight = config.get('backfill', {}).get('max_in_flight', 0)
+    options['pool_maxsize'] = max(options['pool_maxsize'], in_flight)
+    return options
+
+
+class SoapTransport:
+    """
+    SOAP 요청 전송 (연결 풀 + 재시도 + 서킷 브레이커)
+
+    Args:
+        session: 요청에 사용할 requests.Session (세션 캐시의 공유 세션)
+        config: 로드된 config.json 내용
+        logger: 로거
+    """
+
+    def __init__(self, session: requests.Session, config: dict, logger=None):
+        self.session = session
+        self.options = transport_options(config)
+        self.logger = logger or logging.getLogger(__name__)
+        self.timeout = (self.options['connect_timeout'], self.options['read_timeout'])
+        self.budget = get_retry_budget(self.options)
+        self._mount()
+
+    def _mount(self):
+        """세션에 풀 크기를 지정한 어댑터 연결 (이미 연결되어 있으면 그대로 사용)"""
+        if getattr(self.session, '_logen_transport', False):
+            return
+        adapter = HTTPAdapter(
+            pool_connections=self.options['pool_connections'],
+            pool_maxsize=self.options['pool_maxsize'],
+            max_retries=0,
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session._logen_transport = True
+
+    def _backoff(self, attempt: int) -> float:
+        """지터를 준 지수 백오프 (full jitter)"""
+        ceiling = min(self.options['backoff_max'], self.options['backoff_base'] * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def post(self, url: str, data: bytes, headers: dict, idempotent: bool = False,
+             stream: bool = False) -> requests.Response:
+        """
+        POST 요청
+
+        멱등 요청은 연결 오류, 타임아웃, 502/503/504 응답에서 재시도합니다.
+        멱등이 아닌 요청은 요청이 서버에 도달하지 않은 연결 실패에서만 재시도합니다.
+
+        Raises:
+            CircuitOpenError: 서킷 브레이커가 열려 있음
+            requests.exceptions.RequestException: 재시도 후에도 실패
+        """
+        host = urlparse(url).netloc
+        breaker = get_circuit_breaker(host, self.options, self.logger)
+        max_attempts = max(1, self.options['max_attempts'])
+
+        for attempt in range(max_attempts):
+            breaker.allow()
+            self.budget.record_request()
+            # 어떤 예외가 나도 결과를 기록해야 half-open 시험 요청이 끝남
+            response = error = None
+            failed = True
+            try:
+                response = self.session.post(
+                    url, data=data, headers=headers, timeout=self.timeout, stream=stream
+                )
+                failed = response.status_code in RETRY_STATUS
+            except requests.exceptions.RequestException as e:
+                error = e
+            finally:
+                if failed:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+
+            if error is not None:
+                # 연결 단계 실패는 요청이 전송되지 않았으므로 멱등이 아니어도 재시도 가능
+                if not self._should_retry(attempt, max_attempts, idempotent or _not_sent(error)):
+                    raise error
+                self._sleep(attempt, f"{type(error).__name__}: {error}")
+                continue
+
+            if failed and self._should_retry(attempt, max_attempts, idempotent):
+                response.close()
+                self._sleep(attempt, f"HTTP {response.status_code}")
+                continue
+            return response
+
+    def _should_retry(self, attempt: int, max_attempts: int, retryable: bool) -> bool:
+        if not retryable or attempt + 1 >= max_attempts:
+            return False
+        if not self.budget.try_retry():
+            self.logger.warning("재시도 예산 소진 - 재시도하지 않음")
+            return False
+        return True
+
+    def _sleep(self, attempt: int, reason: str):
+        delay = self._backoff(attempt)
+        self.logger.warning(f"요청 실패 ({reason}) - {delay:.1f}초 후 재시도 ({attempt + 2}회차)")
+        time.sleep(delay)
+
+
+def transport_stats() -> dict:
+    """서킷 브레이커 상태와 재시도 예산 통계"""
+    with _registry_lock:
+        return {
+            'breakers': {host: {'state': b.state, 'rejected': b.rejected}
+                         for host, b in _breakers.items()},
+            'retry_budget_exhausted': _budget.exhausted if _budget else 0,
+        }
+
+
+def format_transport_stats(stats: dict) -> str:
+    """서킷 브레이커 상태와 재시도 예산 통계를 한 줄로 만듭니다."""
+    breakers = ", ".join(
+        f"{host} {breaker['state']} (차단 {breaker['rejected']}회)"
+        for host, breaker in stats['breakers'].items()
+    ) or "요청 없음"
+    return f"전송: 서킷 브레이커 {breakers} / 재시도 예산 소진 {stats['retry_budget_exhausted']}회"
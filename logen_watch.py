@@ -0,0 +1,170 @@
+"""
+로젠택배 송장 변경 감지 모듈
+- 조회 결과(암호화된 바이트)의 해시가 지난번과 같으면 복호화/저장/내보내기 생략
+- 해시가 달라도 차수(ORD_SEQ)별 건수/출력 횟수/마지막 출력 시각이 같으면 저장/내보내기 생략
+- 감지 값은 증분 동기화 상태 DB에 저장되어 배치 파일 실행 간에도 유지
+
+W_COMM_NTx_Message_Select 응답(test2.txt)은 공지, 서버 시각, 모듈 버전만 담고 있어
+송장 출력 여부를 알 수 없으므로 변경 신호로 쓰지 않습니다.
+"""
+
+import hashlib
+import logging
+import threading
+from typing import Optional
+
+from logen_decryptor import TableData
+from logen_sync import SyncStateStore
+
+# 차수 서명에 쓰는 컬럼 (DT6)
+BATCH_COLUMNS = ('TAKE_DT', 'ORD_SEQ', 'PRINT_COUNT', 'PRINT_TIME')
+
+
+def payload_digest(payload) -> str:
+    """암호화된 조회 결과의 해시 (BLAKE2b 128비트)"""
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def print_batches(table: Optional[TableData]) -> dict:
+    """
+    차수별 요약을 만듭니다.
+
+    Returns:
+        dict: (TAKE_DT, ORD_SEQ) → [건수, 출력 횟수 합계, 마지막 출력 시각]
+    """
+    batches = {}
+    if table is None:
+        return batches
+
+    positions = [table.columns.index(c) if c in table.columns else None for c in BATCH_COLUMNS]
+    take_dt, ord_seq, print_count, print_time = positions
+
+    def value(row, position):
+        return row[position] if position is not None else None
+
+    for row in table.rows:
+        key = (value(row, take_dt) or '', value(row, ord_seq) or '')
+        summary = batches.get(key)
+        if summary is None:
+            summary = batches[key] = [0, 0, '']
+        summary[0] += 1
+        count = value(row, print_count)
+        if count and str(count).isdigit():
+            summary[1] += int(count)
+        printed = value(row, print_time) or ''
+        if printed > summary[2]:
+            summary[2] = printed
+    return batches
+
+
+def batch_signature(batches: dict) -> str:
+    """차수별 요약의 해시"""
+    digest = hashlib.blake2b(digest_size=16)
+    for key in sorted(batches):
+        rows, print_count, last_print = batches[key]
+        digest.update(f"{key[0]}\t{key[1]}\t{rows}\t{print_count}\t{last_print}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ChangeDetector:
+    """
+    조회 결과 변경 감지
+
+    같은 조회(계정 + 조회 파라미터)의 마지막 내보내기 결과와 비교합니다.
+    변경 감지 값은 내보내기가 성공한 뒤 commit()으로 기록하므로,
+    내보내기에 실패하면 다음 조회에서 다시 처리됩니다.
+
+    Args:
+        store: 증분 동기화 상태 저장소 (SyncStateStore)
+        query_key: 조회 구분 값 (예: 조회 파라미터)
+        logger: 로거
+    """
+
+    def __init__(self, store: SyncStateStore, query_key: str, logger=None):
+        self.store = store
+        self.watch_key = hashlib.blake2b(query_key.encode('utf-8'), digest_size=8).hexdigest()
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._pending = None
+        self.counters = {'checks': 0, 'full_pulls': 0, 'skipped_payload': 0, 'skipped_batches': 0}
+
+    def _previous(self):
+        return self.store.watch_state(self.watch_key) or (None, None, 0)
+
+    def payload_changed(self, payload) -> bool:
+        """
+        조회 결과의 해시를 지난번과 비교합니다.
+
+        Returns:
+            bool: 바뀌었으면(또는 처음이면) True
+        """
+        digest = payload_digest(payload)
+        previous_hash, _, skipped = self._previous()
+        with self._lock:
+            self.counters['checks'] += 1
+            self._pending = (digest, None)
+        if digest != previous_hash:
+            return True
+
+        self._skip('skipped_payload')
+        self.logger.info(
+            f"조회 결과 변경 없음 (해시 {digest[:12]}) - 복호화/내보내기 생략 "
+            f"(누적 {skipped + 1}회)"
+        )
+        return False
+
+    def batches_changed(self, table: Optional[TableData]) -> bool:
+        """
+        차수별 건수/출력 횟수/마지막 출력 시각을 지난번과 비교합니다.
+        payload_changed() 다음에 호출합니다.
+
+        Returns:
+            bool: 바뀌었으면(또는 처음이면) True
+        """
+        batches = print_batches(table)
+        signature = batch_signature(batches)
+        _, previous_signature, skipped = self._previous()
+        with self._lock:
+            digest = self._pending[0] if self._pending else None
+            self._pending = (digest, signature)
+        if signature != previous_signature:
+            with self._lock:
+                self.counters['full_pulls'] += 1
+            self.logger.info(f"차수 {len(batches)}개, {sum(b[0] for b in batches.values())}건 - 변경 있음")
+            return True
+
+        self._skip('skipped_batches')
+        # 다음 조회에서는 해시 비교만으로 건너뛸 수 있도록 해시 갱신
+        self.store.record_watch(self.watch_key, digest, signature)
+        self.logger.info(f"차수 변경 없음 ({len(batches)}개) - 저장/내보내기 생략 (누적 {skipped + 1}회)")
+        return False
+
+    def _skip(self, counter: str):
+        with self._lock:
+            self.counters[counter] += 1
+            self._pending = None
+        self.store.record_watch_skip(self.watch_key)
+
+    def commit(self):
+        """내보내기에 성공한 조회 결과의 감지 값을 기록합니다."""
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending and pending[1] is not None:
+            self.store.record_watch(self.watch_key, *pending)
+
+    def stats(self) -> dict:
+        """이 프로세스에서의 감지 통계"""
+        with self._lock:
+            stats = dict(self.counters)
+        stats['skipped_total'] = self._previous()[2]
+        return stats
+
+
+def format_watch_stats(stats: dict) -> str:
+    """변경 감지 통계를 한 줄로 표시합니다."""
+    skipped = stats['skipped_payload'] + stats['skipped_batches']
+    return (
+        f"변경 감지: 확인 {stats['checks']}회 / 전체 처리 {stats['full_pulls']}회 / "
+        f"건너뜀 {skipped}회 (해시 {stats['skipped_payload']} / 차수 {stats['skipped_batches']}), "
+        f"누적 건너뜀 {stats['skipped_total']}회"
+    )
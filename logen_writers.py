@@ -0,0 +1,482 @@
+"""
+로젠택배 송장 파일 저장 모듈
+- 행을 일정 개수씩 나누어 바로 파일에 기록 (DataFrame 등 전체 복사본을 만들지 않음)
+- xlsx(openpyxl write-only), CSV, JSON lines, Parquet(pyarrow 설치 시)
+- 데이터를 한 번 순회하면서 여러 형식을 동시에 기록
+- 엑셀 시트 최대 행 수(1,048,576)를 넘으면 파일을 나누어 기록 (_part2, _part3 ...)
+- DataSet의 여러 테이블을 한 엑셀 파일의 시트별로, 또는 테이블별 파일로 동시에 기록
+
+config.json의 settings.download_format에 형식을 지정합니다. (예: "xlsx", "xlsx,csv", ["csv", "parquet"])
+테이블 선택/배치는 export 항목에 지정합니다:
+    "export": {
+        "tables": null,          # 가져올 테이블 이름 목록 (null이면 전체, 선택하지 않은 테이블은 변환하지 않음)
+        "layout": "sheets",      # sheets: 엑셀 파일 하나에 테이블별 시트 / files: 테이블별 파일
+        "include_empty": false,  # 행이 없는 테이블도 저장
+        "workers": 4,            # 동시에 기록하는 파일 수
+        "column_layout": "raw",  # 송장 테이블 컬럼 구성 (logen_layouts.py, 예: "client")
+        "typed_frames": false    # 증분 동기화 DataFrame을 숫자/날짜/범주형으로 변환 (logen_schema.py)
+    }
+"""
+
+import csv
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+FORMATS = ('xlsx', 'csv', 'jsonl', 'parquet')
+
+# 엑셀 시트 최대 행 수 (머리글 포함)
+EXCEL_MAX_ROWS = 1_048_576
+
+# 한 번에 기록하는 행 수
+DEFAULT_BATCH_SIZE = 5000
+
+# Parquet 행 그룹 크기 (이만큼 모아서 기록)
+PARQUET_ROW_GROUP = 50_000
+
+LAYOUTS = ('sheets', 'files')
+
+DEFAULT_EXPORT = {
+    'tables': None,
+    'layout': 'sheets',
+    'include_empty': False,
+    'workers': 4,
+    'column_layout': 'raw',
+    'typed_frames': False,
+}
+
+# 엑셀 시트 이름에 쓸 수 없는 문자
+_SHEET_INVALID = re.compile(r'[\[\]:*?/\\]')
+
+
+def parse_formats(value) -> List[str]:
+    """
+    download_format 값을 형식 목록으로 변환합니다.
+
+    Raises:
+        ValueError: 지원하지 않는 형식인 경우
+    """
+    if not value:
+        return ['xlsx']
+    if isinstance(value, str):
+        value = value.split(',')
+    formats = []
+    for item in value:
+        fmt = item.strip().lower().lstrip('.')
+        if fmt == 'xls':
+            fmt = 'xlsx'
+        elif fmt == 'json':
+            fmt = 'jsonl'
+        if fmt not in FORMATS:
+            raise ValueError(f"지원하지 않는 저장 형식: {item} (가능: {', '.join(FORMATS)})")
+        if fmt not in formats:
+            formats.append(fmt)
+    return formats
+
+
+def export_options(config: dict) -> dict:
+    """
+    config의 export 항목에 기본값을 채웁니다.
+
+    Raises:
+        ValueError: layout 값이 올바르지 않은 경우
+    """
+    options = {**DEFAULT_EXPORT, **config.get('export', {})}
+    if options['layout'] not in LAYOUTS:
+        raise ValueError(f"알 수 없는 테이블 배치 방식: {options['layout']} (가능: {', '.join(LAYOUTS)})")
+    if isinstance(options['tables'], str):
+        options['tables'] = [name.strip() for name in options['tables'].split(',') if name.strip()]
+    return options
+
+
+def sheet_title(name: str) -> str:
+    """테이블 이름을 엑셀 시트 이름으로 바꿉니다. (금지 문자 제거, 31자 제한)"""
+    return _SHEET_INVALID.sub('_', str(name))[:31] or 'Sheet'
+
+
+def parquet_available() -> bool:
+    """pyarrow 설치 여부"""
+    import importlib.util
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def available_formats(formats: Sequence[str], logger=None) -> List[str]:
+    """설치되지 않은 라이브러리가 필요한 형식을 경고와 함께 제외합니다."""
+    if 'parquet' in formats and not parquet_available():
+        (logger or logging.getLogger(__name__)).warning(
+            "pyarrow가 설치되어 있지 않아 Parquet 저장을 건너뜁니다 (pip install pyarrow)"
+        )
+        formats = [fmt for fmt in formats if fmt != 'parquet']
+    return list(formats)
+
+
+class TableWriter:
+    """
+    형식별 기록기 (행을 받는 즉시 기록)
+
+    Args:
+        path: 저장 경로 (확장자 포함)
+        columns: 컬럼명 목록
+        sheet_name: 시트 이름 (xlsx)
+    """
+
+    extension = ''
+
+    def __init__(self, path: Path, columns: List[str], sheet_name: str = 'Sheet'):
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.sheet_name = sheet_name
+        self.rows = 0
+        self.paths = [str(self.path)]
+
+    def write(self, rows: List[Sequence]):
+        raise NotImplementedError
+
+    def close(self) -> List[str]:
+        """기록을 마치고 저장한 파일 경로 목록을 반환합니다."""
+        return self.paths
+
+
+class CsvWriter(TableWriter):
+    """CSV (엑셀에서 한글이 깨지지 않도록 UTF-8 BOM)"""
+
+    extension = 'csv'
+
+    def __init__(self, path, columns, sheet_name='Sheet'):
+        super().__init__(path, columns, sheet_name)
+        self._file = open(self.path, 'w', encoding='utf-8-sig', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+        self.rows += len(rows)
+
+    def close(self):
+        self._file.close()
+        return self.paths
+
+
+class JsonLinesWriter(TableWriter):
+    """JSON lines (행마다 {컬럼: 값} 한 줄)"""
+
+    extension = 'jsonl'
+
+    def __init__(self, path, columns, sheet_name='Sheet'):
+        super().__init__(path, columns, sheet_name)
+        self._file = open(self.path, 'w', encoding='utf-8', newline='\n')
+        self._dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'),
+                                       default=_json_default).encode
+
+    def write(self, rows):
+        columns = self.columns
+        dumps = self._dumps
+        self._file.write(''.join(dumps(dict(zip(columns, row))) + '\n' for row in rows))
+        self.rows += len(rows)
+
+    def close(self):
+        self._file.close()
+        return self.paths
+
+
+class XlsxWriter(TableWriter):
+    """
+    xlsx (openpyxl write-only 모드, 행을 임시 파일로 바로 기록)
+
+    시트 최대 행 수를 넘으면 다음 파일(이름_part2.xlsx ...)에 이어서 기록합니다.
+    new_sheet()로 같은 파일에 여러 테이블을 시트별로 기록할 수 있습니다.
+
+    Args:
+        max_rows: 시트 하나의 최대 행 수 (머리글 포함)
+    """
+
+    extension = 'xlsx'
+
+    def __init__(self, path, columns, sheet_name='Sheet', max_rows: int = EXCEL_MAX_ROWS):
+        super().__init__(path, columns, sheet_name)
+        self.max_rows = max_rows
+        self.paths = []
+        self._part = 0
+        self._workbook = None
+        self._sheet = None
+        self._sheet_rows = 0
+        self._open_part()
+
+    def _part_path(self) -> Path:
+        if self._part == 1:
+            return self.path
+        return self.path.with_name(f"{self.path.stem}_part{self._part}{self.path.suffix}")
+
+    def _open_part(self):
+        from openpyxl import Workbook
+
+        self._part += 1
+        self._workbook = Workbook(write_only=True)
+        self.new_sheet(self.sheet_name, self.columns)
+
+    def new_sheet(self, sheet_name: str, columns: List[str]):
+        """같은 파일에 새 시트를 시작합니다. (이후 write는 이 시트에 기록)"""
+        self.sheet_name = sheet_name
+        self.columns = list(columns)
+        self._sheet = self._workbook.create_sheet(self.sheet_name[:31])
+        self._sheet.append(self.columns)
+        self._sheet_rows = 1
+
+    def _save_part(self):
+        path = self._part_path()
+        self._workbook.save(path)
+        self.paths.append(str(path))
+        self._workbook = self._sheet = None
+
+    def write(self, rows):
+        start = 0
+        while start < len(rows):
+            room = self.max_rows - self._sheet_rows
+            if room <= 0:
+                self._save_part()
+                self._open_part()
+                continue
+            append = self._sheet.append
+            for row in rows[start:start + room]:
+                append(row)
+            taken = min(room, len(rows) - start)
+            self._sheet_rows += taken
+            self.rows += taken
+            start += taken
+
+    def close(self):
+        if self._workbook is not None:
+            self._save_part()
+        return self.paths
+
+
+class ParquetWriter(TableWriter):
+    """Parquet (모든 컬럼 문자열, 행 그룹 단위로 기록)"""
+
+    extension = 'parquet'
+
+    def __init__(self, path, columns, sheet_name='Sheet'):
+        super().__init__(path, columns, sheet_name)
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema([(column, pa.string()) for column in self.columns])
+        self._writer = pq.ParquetWriter(str(self.path), self._schema)
+        self._pending = []
+
+    def write(self, rows):
+        self._pending.extend(rows)
+        self.rows += len(rows)
+        if len(self._pending) >= PARQUET_ROW_GROUP:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        values = list(zip(*self._pending))
+        # 형식 변환된 DataFrame(typed_frames)의 숫자/날짜는 CSV와 같이 str()로 기록
+        arrays = [self._pa.array([value if value is None or isinstance(value, str) else str(value)
+                                  for value in column], type=self._pa.string())
+                  for column in values]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+        self._pending = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+        return self.paths
+
+
+WRITERS = {
+    XlsxWriter.extension: XlsxWriter,
+    CsvWriter.extension: CsvWriter,
+    JsonLinesWriter.extension: JsonLinesWriter,
+    ParquetWriter.extension: ParquetWriter,
+}
+
+
+def open_writer(fmt: str, base_path: Path, columns: List[str], sheet_name: str = 'Sheet',
+                max_rows: int = EXCEL_MAX_ROWS) -> TableWriter:
+    """형식에 맞는 기록기를 엽니다. (base_path에 확장자를 붙여 저장)"""
+    path = Path(f"{base_path}.{fmt}")
+    if fmt == 'xlsx':
+        return XlsxWriter(path, columns, sheet_name, max_rows)
+    return WRITERS[fmt](path, columns, sheet_name)
+
+
+def export_rows(base_path, columns: List[str], rows: Iterable[Sequence], formats: Sequence[str],
+                sheet_name: str = 'Sheet', max_rows: int = EXCEL_MAX_ROWS,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> Tuple[int, Dict[str, List[str]]]:
+    """
+    행을 한 번 순회하면서 여러 형식의 파일로 저장합니다.
+
+    Args:
+        base_path: 확장자를 뺀 저장 경로 (예: downloads/logen_invoices_20251031_090000)
+        columns: 컬럼명 목록
+        rows: 행 (리스트/튜플, 빈 값은 None) - 제너레이터도 가능
+        formats: 저장 형식 목록 (FORMATS)
+        sheet_name: 시트 이름 (xlsx)
+        max_rows: 시트 하나의 최대 행 수 (넘으면 파일을 나눔)
+        batch_size: 한 번에 기록하는 행 수
+
+    Returns:
+        tuple: (기록한 행 수, 형식 → 저장한 파일 경로 목록)
+    """
+    writers = []
+    count = 0
+    try:
+        for fmt in formats:
+            writers.append(open_writer(fmt, base_path, columns, sheet_name, max_rows))
+
+        for batch in _batches(rows, batch_size):
+            count += len(batch)
+            for writer in writers:
+                writer.write(batch)
+    except BaseException:
+        # 기록 중 실패하면 열린 파일을 닫고 예외를 그대로 전달
+        _close_quietly(writers)
+        raise
+
+    return count, {writer.extension: writer.close() for writer in writers}
+
+
+def _batches(rows: Iterable[Sequence], size: int):
+    """행을 size개씩 리스트로 묶어 반환합니다."""
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _close_quietly(writers):
+    for writer in writers:
+        try:
+            writer.close()
+        except Exception:
+            pass
+
+
+def export_workbook(path, tables, max_rows: int = EXCEL_MAX_ROWS,
+                    batch_size: int = DEFAULT_BATCH_SIZE) -> Tuple[Dict[str, int], List[str]]:
+    """
+    여러 테이블을 엑셀 파일 하나에 테이블별 시트로 저장합니다.
+
+    Args:
+        path: 저장 경로 (.xlsx)
+        tables: name/columns/rows 속성을 가진 테이블 목록 (TableData)
+
+    Returns:
+        tuple: (counts, paths)
+            counts: 테이블 이름 → 기록한 행 수
+            paths: 저장한 파일 경로 목록 (행 수 제한으로 나뉘면 여러 개, 테이블이 없으면 빈 목록)
+    """
+    writer = None
+    counts = {}
+    try:
+        for table in tables:
+            if writer is None:
+                writer = XlsxWriter(path, table.columns, sheet_title(table.name), max_rows)
+            else:
+                writer.new_sheet(sheet_title(table.name), table.columns)
+            start = writer.rows
+            for batch in _batches(table.rows, batch_size):
+                writer.write(batch)
+            counts[table.name] = writer.rows - start
+    except BaseException:
+        if writer is not None:
+            _close_quietly([writer])
+        raise
+    return counts, (writer.close() if writer is not None else [])
+
+
+def table_base_path(base_path, table, index: int) -> Path:
+    """테이블별 파일 경로 (첫 번째 테이블은 base_path 그대로, 나머지는 _테이블이름)"""
+    if index == 0:
+        return Path(base_path)
+    return Path(f"{base_path}_{sheet_title(table.name)}")
+
+
+def export_tables(base_path, tables, formats: Sequence[str], layout: str = 'sheets',
+                  max_rows: int = EXCEL_MAX_ROWS, workers: int = DEFAULT_EXPORT['workers'],
+                  batch_size: int = DEFAULT_BATCH_SIZE) -> Tuple[Dict[str, int], Dict[str, Dict[str, List[str]]]]:
+    """
+    여러 테이블을 동시에 저장합니다.
+
+    - layout="sheets": 엑셀은 파일 하나에 테이블별 시트, 시트가 없는 형식(CSV 등)은 테이블별 파일
+    - layout="files": 모든 형식을 테이블별 파일로 저장
+    첫 번째 테이블은 base_path 이름 그대로, 나머지 테이블은 이름 뒤에 _테이블이름을 붙입니다.
+
+    Args:
+        base_path: 확장자를 뺀 저장 경로
+        tables: name/columns/rows 속성을 가진 테이블 목록 (TableData)
+        formats: 저장 형식 목록 (FORMATS)
+        layout: 테이블 배치 방식 (LAYOUTS)
+        max_rows: 시트 하나의 최대 행 수
+        workers: 동시에 기록하는 파일(작업) 수
+
+    Returns:
+        tuple: (테이블 이름 → 기록한 행 수, 테이블 이름 → {형식 → 저장한 파일 경로 목록})
+    """
+    tables = list(tables)
+    counts = {}
+    result = {table.name: {} for table in tables}
+    per_table = list(formats)
+    tasks = []
+
+    if layout == 'sheets' and 'xlsx' in per_table and len(tables) > 1:
+        per_table.remove('xlsx')
+
+        def workbook_task():
+            written, paths = export_workbook(Path(f"{base_path}.xlsx"), tables, max_rows, batch_size)
+            return [(table.name, written[table.name], 'xlsx', paths) for table in tables]
+
+        tasks.append(workbook_task)
+
+    if per_table:
+        for index, table in enumerate(tables):
+            def table_task(table=table, index=index):
+                count, files = export_rows(table_base_path(base_path, table, index), table.columns,
+                                           table.rows, per_table, sheet_title(table.name),
+                                           max_rows, batch_size)
+                return [(table.name, count, fmt, paths) for fmt, paths in files.items()]
+
+            tasks.append(table_task)
+
+    if len(tasks) == 1 or workers <= 1:
+        outputs = [task() for task in tasks]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(tasks)),
+                                thread_name_prefix='logen-writer') as executor:
+            futures = [executor.submit(task) for task in tasks]
+            outputs = [future.result() for future in futures]
+
+    for output in outputs:
+        for name, count, fmt, paths in output:
+            counts[name] = count
+            result[name][fmt] = paths
+    return counts, result
+
+
+def frame_rows(df):
+    """DataFrame의 행을 (결측값은 None으로) 하나씩 반환합니다. (형식 변환된 DataFrame도 가능)"""
+    import pandas as pd
+
+    na = pd.NA
+    for row in df.itertuples(index=False, name=None):
+        yield [None if value is None or value is na or value != value else value for value in row]
+
+
+def _json_default(value):
+    """JSON으로 바로 쓸 수 없는 값 (날짜, numpy 숫자 등)"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
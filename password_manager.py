@@ -8,22 +8,31 @@ import os
 import base64
 import json
 from pathlib import Path
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2
+
+# cryptography는 암호화/복호화할 때만 로드 (비밀번호 저장 여부 확인 등은 가볍게)
 
 
 class PasswordManager:
     """비밀번호 암호화 및 저장 관리"""
 
-    def __init__(self, config_dir: str = None):
-        """초기화"""
+    def __init__(self, config_dir: str = None, account: str = None):
+        """
+        초기화
+
+        Args:
+            config_dir: 비밀번호/키 파일 폴더 (기본값: 스크립트와 같은 폴더)
+            account: 업체 아이디 (여러 계정 사용 시 계정별 비밀번호 파일 사용)
+        """
         if config_dir is None:
             self.config_dir = Path(__file__).parent.absolute()
         else:
             self.config_dir = Path(config_dir)
 
-        self.password_file = self.config_dir / ".password"
+        self.account = account
+        if account:
+            self.password_file = self.config_dir / f".password_{account}"
+        else:
+            self.password_file = self.config_dir / ".password"
         self.key_file = self.config_dir / ".key"
 
     def _get_machine_salt(self):
@@ -40,8 +49,11 @@ class PasswordManager:
                 return f.read()
         else:
             # 새 키 생성 (머신별 고유)
+            from cryptography.hazmat.primitives import hashes
+            from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
             salt = self._get_machine_salt()
-            kdf = PBKDF2(
+            kdf = PBKDF2HMAC(
                 algorithm=hashes.SHA256(),
                 length=32,
                 salt=salt,
@@ -60,6 +72,7 @@ class PasswordManager:
         try:
             # 암호화 키 가져오기
             key = self._get_or_create_key()
+            from cryptography.fernet import Fernet
             fernet = Fernet(key)
 
             # 비밀번호 암호화
@@ -83,6 +96,7 @@ class PasswordManager:
 
             # 암호화 키 가져오기
             key = self._get_or_create_key()
+            from cryptography.fernet import Fernet
             fernet = Fernet(key)
 
             # 암호화된 비밀번호 읽기
@@ -0,0 +1,13 @@
+@echo off
+chcp 65001 > nul
+echo ============================================================
+echo 로젠택배 송장 상주 실행 (Ctrl+C로 종료)
+echo ============================================================
+echo.
+
+cd /d "%~dp0"
+
+python logen_invoice_downloader.py daemon
+
+echo.
+pause
@@ -2,9 +2,11 @@
 로젠택배 비밀번호 업데이트 프로그램
 - 비밀번호를 입력받아서 암호화하여 저장
 - 비밀번호 변경 시마다 이 프로그램을 실행
+- 여러 계정 사용 시: python update_password.py <업체아이디>
 """
 
 import getpass
+import sys
 from password_manager import PasswordManager
 
 
@@ -15,7 +17,13 @@ def main():
     print("=" * 60)
     print()
 
-    pm = PasswordManager()
+    # 계정별 비밀번호 (인자로 업체 아이디를 주면 해당 계정 파일에 저장)
+    account = sys.argv[1] if len(sys.argv) > 1 else None
+    pm = PasswordManager(account=account)
+
+    if account:
+        print(f"업체 아이디: {account}")
+        print()
 
     # 기존 비밀번호 확인
     if pm.is_password_saved():